@@ -0,0 +1,8 @@
+"""
+BiteBot benchmarks. Each suite is a runnable module and can save its results as JSON:
+
+    python -m benchmarks.startup   first paint and rerun time of app.py
+    python -m benchmarks.load      N simulated sessions driving the UI through AppTest
+    python -m benchmarks.micro     analysis and history/dashboard builds at 10 / 1k / 100k entries
+    python -m benchmarks.compare baseline.json current.json
+"""
@@ -0,0 +1,104 @@
+"""
+Load test for the HTTP API: concurrent keep-alive connections against a running server.
+
+Each connection sends its requests one after another over a single HTTP/1.1
+connection, picking at random between a single-food /analyze, a batch
+/analyze, /nutrition and (with ``--chat``) a non-streaming /chat question.
+Response times are recorded per endpoint.
+
+    python -m bitebot.api.server --port 8000 &
+    python -m benchmarks.api --url http://127.0.0.1:8000 --connections 64 --requests 200 --output api.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import quote, urlsplit
+
+from benchmarks.results import print_results, summarize, write_results
+
+FOODS = ["pizza", "apple", "grilled salmon", "chiken breast", "nasi lemak", "2x fried rice", "dark chocolate cake",
+         "teh tarik", "veggie wrap", "banana", "burger and fries", "greek yogurt"]
+QUESTIONS = ["how much protein is in chicken?", "is pizza healthy?", "what is a good breakfast?"]
+
+
+def build_request(rng: random.Random, chat: bool):
+    choices = ["analyze", "analyze_batch", "nutrition"] + (["chat"] if chat else [])
+    kind = rng.choice(choices)
+    if kind == "analyze":
+        return kind, "GET", f"/analyze?food={quote(rng.choice(FOODS))}", b""
+    if kind == "nutrition":
+        return kind, "GET", f"/nutrition?food={quote(rng.choice(FOODS))}", b""
+    if kind == "analyze_batch":
+        body = {"foods": rng.sample(FOODS, 5)}
+        return kind, "POST", "/analyze", json.dumps(body).encode()
+    return kind, "POST", "/chat", json.dumps({"message": rng.choice(QUESTIONS)}).encode()
+
+
+async def read_response(reader: asyncio.StreamReader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = {k.strip().lower(): v.strip() for k, v in (line.split(":", 1) for line in lines[1:] if ":" in line)}
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    return status
+
+
+async def connection(url, requests: int, rng: random.Random, chat: bool, samples, errors):
+    reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+    try:
+        for _ in range(requests):
+            kind, method, path, body = build_request(rng, chat)
+            request = (f"{method} {path} HTTP/1.1\r\nHost: {url.netloc}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+            started = time.perf_counter()
+            writer.write(request)
+            status = await read_response(reader)
+            samples[kind].append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(f"{method} {path}: HTTP {status}")
+    finally:
+        writer.close()
+
+
+async def run(args):
+    url = urlsplit(args.url)
+    samples, errors = defaultdict(list), []
+    rng = random.Random(args.seed)
+    await asyncio.gather(*(connection(url, args.requests, random.Random(rng.random()), args.chat, samples, errors)
+                           for _ in range(args.connections)))
+    return samples, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.api", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--connections", type=int, default=32, help="concurrent keep-alive connections")
+    parser.add_argument("--requests", type=int, default=100, help="requests per connection")
+    parser.add_argument("--chat", action="store_true", help="include /chat questions in the mix")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    samples, errors = asyncio.run(run(args))
+    wall = time.perf_counter() - started
+    results = {name: summarize(values) for name, values in sorted(samples.items())}
+    total = sum(len(v) for v in samples.values())
+
+    print_results(results)
+    print(f"{total} requests over {args.connections} connections in {wall:.1f}s · {total / wall:.0f} req/s · "
+          f"{len(errors)} errors")
+    for error in errors[:5]:
+        print(error, file=sys.stderr)
+    if args.output:
+        params = {k: v for k, v in vars(args).items() if k != "output"}
+        write_results(args.output, "api", results, params, wall_s=round(wall, 3), requests=total, errors=errors)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""
+Compare two result files from the same suite, benchmark by benchmark (p50).
+
+    python -m benchmarks.compare baseline.json current.json [--threshold 0.1]
+
+Exits with status 1 when any benchmark's p50 got slower by more than the
+threshold (a fraction, 0.1 = 10%).
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.results import DEFAULT_THRESHOLD, compare
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare", description=__doc__.split("\n\n")[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as fh:
+        baseline = json.load(fh)
+    with open(args.current) as fh:
+        current = json.load(fh)
+    if baseline.get("suite") != current.get("suite"):
+        parser.error(f"suites differ: {baseline.get('suite')} vs {current.get('suite')}")
+
+    rows = compare(baseline, current)
+    width = max((len(r[0]) for r in rows), default=10)
+    regressions = 0
+    for name, before, now, change in rows:
+        flag = ""
+        if change > args.threshold:
+            flag, regressions = "  REGRESSION", regressions + 1
+        elif change < -args.threshold:
+            flag = "  faster"
+        print(f"{name:<{width}}  {before:>9.3f} -> {now:>9.3f} ms  {change:+7.1%}{flag}")
+    print(f"{len(rows)} benchmarks compared, {regressions} regressed by more than {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
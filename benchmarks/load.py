@@ -0,0 +1,219 @@
+"""
+Load test: N simulated sessions driving the app's UI flows through ``AppTest``.
+
+Each session opens the app, clicks Quick Foods buttons, analyses a typed
+food, opens the Food History tab and exports it, then asks AI quick
+questions on the AI Chat tab and waits for each answer. Every step records
+its response time (as the user would see it, including waiting for other
+sessions) and the script time of the reruns it caused.
+
+    python -m benchmarks.load                                  # 8 sessions in one process
+    python -m benchmarks.load --sessions 32 --processes 4 --gemini-latency 0.5 --output load.json
+
+Gemini is replaced by the offline backend (``--gemini-latency`` sets how
+slowly it answers) and history is kept in memory, unless
+BITEBOT_LLM_BACKEND / BITEBOT_FOOD_LOG_DB are already set. ``AppTest``
+swaps a process-global runtime in and out on every run, so runs within one
+process are serialised; use ``--processes`` for truly parallel reruns.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from collections import defaultdict
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.results import ROOT_DIR, print_results, summarize, write_results
+
+LIVE_TAB, HISTORY_TAB, AI_TAB = "💬 Live Chat", "📊 Food History", "🤖 AI Chat"
+TYPED_FOODS = ["dark chocolate cake", "chiken breast", "nasi lemak", "grilled salmon", "teh tarik", "veggie wrap"]
+
+
+class SessionAppTest(AppTest):
+    lock = threading.Lock()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.tab = LIVE_TAB
+        self.script_seconds = 0.0
+
+    def _run(self, *args, **kwargs):
+        # AppTest does not report the open tab back like a browser does, so select it before every run.
+        with self.lock:
+            self.session_state["active_tab"] = self.tab
+            started = time.perf_counter()
+            try:
+                return super()._run(*args, **kwargs)
+            finally:
+                self.script_seconds += time.perf_counter() - started
+
+
+class Session:
+    def __init__(self, app: str, rng: random.Random, samples, timeout: float, think: float):
+        self.app = app
+        self.rng = rng
+        self.samples = samples
+        self.timeout = timeout
+        self.think = think
+        self.at = None
+
+    def step(self, name: str, action):
+        if self.think:
+            time.sleep(self.rng.uniform(0, self.think))
+        script_before = self.at.script_seconds if self.at is not None else 0.0
+        started = time.perf_counter()
+        action()
+        elapsed = time.perf_counter() - started
+        if self.at.exception:
+            raise RuntimeError(f"{name}: {self.at.exception[0].message}")
+        self.samples[name].append(elapsed)
+        self.samples[f"{name}.script"].append(self.at.script_seconds - script_before)
+
+    def button(self, predicate):
+        matches = [b for b in self.at.button if predicate(b)]
+        if not matches:
+            raise RuntimeError("button not found")
+        return matches[0]
+
+    def open(self):
+        self.at = SessionAppTest(self.app, default_timeout=self.timeout)
+        self.at.run()
+
+    def switch_tab(self, label: str):
+        self.at.tab = label
+        self.at.run()
+
+    def quick_food(self, food: str):
+        self.button(lambda b: b.key == f"quick_{food}").click().run()
+
+    def analyze_text(self, food: str):
+        self.at.text_input(key="food_input").input(food)
+        self.button(lambda b: b.label == "🚀 ANALYZE").click().run()
+
+    def export(self, fmt: str):
+        from bitebot.ui.resources import get_export_cache
+
+        # A download click does not run the deferred export in AppTest, so build (or reuse) the file directly.
+        with open(get_export_cache().get(self.at.session_state.food_log, fmt, None, None), "rb") as fh:
+            fh.read()
+
+    def quick_question(self, label: str):
+        self.button(lambda b: b.label == label).click().run()
+        deadline = time.monotonic() + self.timeout
+        while self.at.session_state["ai_pending"]:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"no answer to {label!r} after {self.timeout}s")
+            time.sleep(0.05)
+            self.at.run()
+
+    def run(self, quick_foods: int, questions: int, export_formats):
+        from bitebot.ui.ai_chat import QUICK_QUESTIONS
+        from bitebot.ui.resources import QUICK_FOODS
+
+        self.step("open", self.open)
+        for _, food in self.rng.sample(QUICK_FOODS, min(quick_foods, len(QUICK_FOODS))):
+            self.step("quick_food", lambda: self.quick_food(food))
+        self.step("analyze_text", lambda: self.analyze_text(self.rng.choice(TYPED_FOODS)))
+        self.step("open_history", lambda: self.switch_tab(HISTORY_TAB))
+        for fmt in export_formats:
+            self.step(f"export.{fmt}", lambda: self.export(fmt))
+        self.step("open_ai_chat", lambda: self.switch_tab(AI_TAB))
+        for label, _ in self.rng.sample(QUICK_QUESTIONS, min(questions, len(QUICK_QUESTIONS))):
+            self.step("quick_question", lambda: self.quick_question(label))
+
+
+def run_sessions(args, sessions: int, seed: int):
+    """Run ``sessions`` concurrent sessions in this process; returns raw samples, errors and cache stats."""
+    from bitebot.ui.resources import get_export_cache, get_gemini_guard, get_response_cache
+
+    samples = defaultdict(list)
+    errors = []
+
+    def worker(i):
+        session = Session(args.app, random.Random(seed + i), samples, args.timeout, args.think)
+        try:
+            session.run(args.quick_foods, args.questions, args.export_formats)
+        except Exception as e:
+            errors.append(f"session {seed + i}: {e}" if isinstance(e, RuntimeError) else traceback.format_exc())
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(sessions)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    export_cache = get_export_cache()
+    return {"samples": dict(samples), "errors": errors,
+            "stats": {"gemini_guard": get_gemini_guard().stats(), "response_cache": get_response_cache().stats(),
+                      "export_cache": {"hits": export_cache.hits, "misses": export_cache.misses}}}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--app", type=lambda p: os.path.abspath(p), default=str(ROOT_DIR / "app.py"))
+    parser.add_argument("--sessions", type=int, default=8, help="simulated sessions in total")
+    parser.add_argument("--processes", type=int, default=1, help="split the sessions over this many processes")
+    parser.add_argument("--quick-foods", type=int, default=5, help="Quick Foods clicks per session")
+    parser.add_argument("--questions", type=int, default=2, help="AI quick questions per session")
+    parser.add_argument("--export-formats", type=lambda s: [f for f in s.split(",") if f], default=["csv"],
+                        help="comma-separated history export formats per session")
+    parser.add_argument("--think", type=float, default=0.0, help="random pause of up to this many seconds per step")
+    parser.add_argument("--gemini-latency", type=float, default=0.2, help="seconds the offline Gemini takes")
+    parser.add_argument("--timeout", type=float, default=60.0, help="per-run and per-answer timeout")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("BITEBOT_LLM_BACKEND", "fake")
+    os.environ.setdefault("BITEBOT_FOOD_LOG_DB", "")
+    os.environ.setdefault("BITEBOT_FAKE_LATENCY", str(args.gemini_latency))
+    os.chdir(os.path.dirname(args.app))
+
+    if args.worker:
+        print(json.dumps(run_sessions(args, args.sessions, args.seed)))
+        return
+
+    started = time.perf_counter()
+    if args.processes <= 1:
+        runs = [run_sessions(args, args.sessions, args.seed)]
+    else:
+        base = [a for a in (argv if argv is not None else sys.argv[1:]) if a != "--worker"]
+        shares = [args.sessions // args.processes + (i < args.sessions % args.processes)
+                  for i in range(args.processes)]
+        procs, seed = [], args.seed
+        for share in shares:
+            cmd = [sys.executable, "-m", "benchmarks.load", *base, "--worker", "--processes", "1",
+                   "--sessions", str(share), "--seed", str(seed)]
+            procs.append(subprocess.Popen(cmd, cwd=ROOT_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                          text=True))
+            seed += share
+        runs = [json.loads(p.communicate()[0].strip().splitlines()[-1]) for p in procs]
+    wall = time.perf_counter() - started
+
+    samples, errors = defaultdict(list), []
+    for run in runs:
+        for name, values in run["samples"].items():
+            samples[name].extend(values)
+        errors.extend(run["errors"])
+    results = {name: summarize(values) for name, values in sorted(samples.items())}
+    actions = sum(len(v) for name, v in samples.items() if not name.endswith(".script"))
+
+    print_results(results)
+    print(f"{args.sessions} sessions in {wall:.1f}s · {actions / wall:.1f} actions/s · {len(errors)} errors")
+    for error in errors[:5]:
+        print(error, file=sys.stderr)
+    if args.output:
+        params = {k: v for k, v in vars(args).items() if k not in ("output", "worker")}
+        write_results(args.output, "load", results, params, wall_s=round(wall, 3), actions=actions,
+                      errors=errors, stats=[run["stats"] for run in runs])
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
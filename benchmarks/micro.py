@@ -0,0 +1,131 @@
+"""
+Micro-benchmarks: food analysis and the history/dashboard builds at several log sizes.
+
+The analysis benchmarks time ``FoodAnalyzer.analyze`` and ``tips`` (what the
+app's ``analyze_food`` / ``get_nutrition_tips`` stages measure) for a
+catalogue food, a typo and a food outside the catalogue, plus a memoised
+lookup. The log benchmarks fill a synthetic history spread over 90 days and
+time, per size, one History page, the full DataFrame, the stats and rollup
+rebuilds and the dashboard figures.
+
+    python -m benchmarks.micro                              # sizes 10, 1000, 100000
+    python -m benchmarks.micro --sizes 10,1000 --output micro.json
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.results import print_results, summarize, write_results
+from bitebot.core.analysis import FoodAnalyzer
+from bitebot.core.analysis_cache import AnalysisCache
+from bitebot.core.catalogue import STATUSES, load_catalogue
+from bitebot.storage.aggregates import FoodLogStats
+from bitebot.storage.food_log import FoodLog
+from bitebot.storage.rollups import TimeRollups
+
+DEFAULT_SIZES = (10, 1_000, 100_000)
+LOG_DAYS = 90
+ANALYSIS_INPUTS = {"catalogue": "pizza", "typo": "chiken breast", "estimated": "dark chocolate cake"}
+
+
+def bench(fn, min_time: float, max_reps: int, setup=None):
+    """Call ``fn`` (after ``setup``, untimed) until ``min_time`` has passed or ``max_reps`` calls were made.
+
+    One untimed call first keeps one-off imports (pandas, plotly) out of the samples.
+    """
+    fn() if setup is None else fn(setup())
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_reps and (len(samples) < 3 or time.perf_counter() < deadline):
+        arg = setup() if setup is not None else None
+        started = time.perf_counter()
+        fn() if setup is None else fn(arg)
+        samples.append(time.perf_counter() - started)
+    return summarize(samples)
+
+
+def synthetic_log(size: int, foods, seed: int = 0) -> FoodLog:
+    rng = random.Random(seed)
+    end = datetime.now()
+    start = end - timedelta(days=LOG_DAYS)
+    offsets = sorted(rng.random() for _ in range(size))
+    log = FoodLog()
+    for offset in offsets:
+        log.append(rng.choice(foods), rng.choice(STATUSES), rng.randint(1, 10), when=start + (end - start) * offset)
+    return log
+
+
+def analysis_benchmarks(analyzer: FoodAnalyzer, min_time: float, max_reps: int):
+    results = {}
+    for name, food in ANALYSIS_INPUTS.items():
+        analyzer.analyze_with_tips(food)  # load whatever this path needs before timing it
+        status = analyzer.analyze(food)["status"]
+        results[f"analyze_food.{name}"] = bench(lambda: analyzer.analyze(food), min_time, max_reps)
+        results[f"get_nutrition_tips.{name}"] = bench(lambda: analyzer.tips(food, status), min_time, max_reps)
+    cache = AnalysisCache(analyzer.analyze_with_tips)
+    cache.get(ANALYSIS_INPUTS["estimated"])
+    results["lookup_analysis.hit"] = bench(lambda: cache.get(ANALYSIS_INPUTS["estimated"]), min_time, max_reps)
+    return results
+
+
+def log_benchmarks(size: int, analyzer: FoodAnalyzer, foods, min_time: float, max_reps: int):
+    from bitebot.ui.dashboard import build_dashboard_figures
+    from bitebot.ui.history import page_frame
+
+    macros = {}
+
+    def food_macros(food):
+        if food not in macros:
+            macros[food] = analyzer.analyze_with_tips(food)[1]
+        return macros[food]
+
+    log = synthetic_log(size, foods)
+    stats = FoodLogStats.from_entries(log.entries())
+    rollups = TimeRollups(food_macros)
+    rollups.sync(log)
+
+    def history_page():
+        positions = log.select(None, None, None, "")[::-1]
+        page_frame(log, positions[:25])
+
+    def fresh_rollups():
+        return TimeRollups(food_macros)
+
+    results = {
+        "history_page": bench(history_page, min_time, max_reps),
+        "history_frame_full": bench(log.to_pandas, min_time, max_reps),
+        "stats_rebuild": bench(lambda: FoodLogStats.from_entries(log.entries()), min_time, max_reps),
+        "rollups_sync": bench(lambda r: r.sync(log), min_time, max_reps, setup=fresh_rollups),
+        "rollups_frame.daily": bench(lambda: rollups.frame("daily"), min_time, max_reps),
+        "rollups_frame.weekly": bench(lambda: rollups.frame("weekly"), min_time, max_reps),
+        "dashboard_figures": bench(lambda: build_dashboard_figures(stats, rollups.frame("daily"), "daily"),
+                                   min_time, max_reps),
+    }
+    return {f"{name}.{size}": r for name, r in results.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.micro", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated log sizes (entries)")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to spend on each benchmark")
+    parser.add_argument("--max-reps", type=int, default=2000, help="upper bound on calls per benchmark")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+
+    analyzer = FoodAnalyzer(load_catalogue())
+    foods = list(analyzer.catalogue.names())
+    results = analysis_benchmarks(analyzer, args.min_time, args.max_reps)
+    for size in sizes:
+        results.update(log_benchmarks(size, analyzer, foods, args.min_time, args.max_reps))
+
+    print_results(results)
+    if args.output:
+        write_results(args.output, "micro", results,
+                      {"sizes": sizes, "min_time": args.min_time, "max_reps": args.max_reps})
+
+
+if __name__ == "__main__":
+    main()
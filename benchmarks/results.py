@@ -0,0 +1,66 @@
+"""
+Result files shared by the benchmark suites.
+
+Every suite writes one JSON document:
+
+    {"suite": "micro", "environment": {...}, "params": {...},
+     "results": {"analyze_food.catalogue": {"count": 500, "mean_ms": 0.04, "p50_ms": ..., "p95_ms": ...,
+                                            "p99_ms": ..., "max_ms": ...}, ...}}
+
+``results`` maps a benchmark name to a latency summary, so any two files
+from the same suite can be compared name by name (``benchmarks.compare``).
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bitebot.metrics import Histogram
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_THRESHOLD = 0.10  # a p50 more than 10% slower is a regression
+
+
+def summarize(seconds: Iterable[float]) -> Dict[str, float]:
+    samples = list(seconds)
+    hist = Histogram(samples=max(1, len(samples)))
+    for s in samples:
+        hist.observe(s)
+    return {k: round(v, 4) for k, v in hist.summary().items()}
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": commit, "python": sys.version.split()[0],
+            "platform": platform.platform(), "cpus": os.cpu_count()}
+
+
+def write_results(path, suite: str, results: Dict[str, Dict], params: Optional[Dict] = None, **extra):
+    doc = {"suite": suite, "environment": environment(), "params": params or {}, "results": results, **extra}
+    Path(path).write_text(json.dumps(doc, indent=2))
+
+
+def print_results(results: Dict[str, Dict]):
+    width = max((len(name) for name in results), default=10)
+    print(f"{'benchmark':<{width}}  {'count':>7}  {'p50 ms':>9}  {'p95 ms':>9}  {'max ms':>9}")
+    for name, r in results.items():
+        print(f"{name:<{width}}  {r['count']:>7}  {r['p50_ms']:>9.3f}  {r['p95_ms']:>9.3f}  {r['max_ms']:>9.3f}")
+
+
+def compare(baseline: Dict, current: Dict) -> List[Tuple[str, float, float, float]]:
+    """(name, baseline p50, current p50, relative change) for every benchmark in both result files."""
+    rows = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or not before.get("p50_ms"):
+            continue
+        rows.append((name, before["p50_ms"], now["p50_ms"], now["p50_ms"] / before["p50_ms"] - 1))
+    return rows
@@ -0,0 +1,92 @@
+"""
+Startup benchmark: first paint and per-rerun script time of the Streamlit app.
+
+Each sample runs the app headless (``streamlit.testing.v1.AppTest``) in a
+fresh Python process. The first ``run()`` is the first paint: every import,
+the ``st.cache_resource`` setup and the initial script run. The runs after
+it are plain reruns of a warm process. The report also lists the heavy
+modules the first paint imported.
+
+    python -m benchmarks.startup                        # 5 cold processes, 20 reruns each
+    python -m benchmarks.startup --output startup.json  # also save the results
+
+Gemini is replaced by the offline backend and history is kept in memory,
+unless BITEBOT_LLM_BACKEND / BITEBOT_FOOD_LOG_DB are already set.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.results import ROOT_DIR, print_results, summarize, write_results
+
+HEAVY_MODULES = ("pandas", "plotly", "sklearn", "scipy", "joblib", "google.generativeai", "pyarrow")
+
+
+def measure(app: Path, reruns: int) -> dict:
+    """One cold process: framework import, first paint, then ``reruns`` warm reruns."""
+    started = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    framework = time.perf_counter() - started
+    before = set(sys.modules)
+
+    at = AppTest.from_file(str(app), default_timeout=120)
+    started = time.perf_counter()
+    at.run()
+    first_paint = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(f"app raised on first run: {at.exception}")
+    loaded = sorted(m for m in HEAVY_MODULES if m in sys.modules and m not in before)
+
+    rerun_times = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        at.run()
+        rerun_times.append(time.perf_counter() - started)
+    return {"framework_import_s": framework, "first_paint_s": first_paint, "rerun_s": rerun_times,
+            "heavy_modules": loaded}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--app", default=str(ROOT_DIR / "app.py"))
+    parser.add_argument("--runs", type=int, default=5, help="cold processes to sample")
+    parser.add_argument("--reruns", type=int, default=20, help="warm reruns per process")
+    parser.add_argument("--output", help="write the results (and raw samples) to this JSON file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    app = Path(args.app).resolve()
+    if args.child:
+        os.chdir(app.parent)
+        sys.path.insert(0, str(app.parent))
+        print(json.dumps(measure(app, args.reruns)))
+        return
+
+    env = dict(os.environ)
+    env.setdefault("BITEBOT_LLM_BACKEND", "fake")
+    env.setdefault("BITEBOT_FOOD_LOG_DB", "")
+    samples = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, "-m", "benchmarks.startup", "--child", "--app", str(app),
+                              "--reruns", str(args.reruns)],
+                             cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True)
+        samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    results = {"framework_import": summarize(s["framework_import_s"] for s in samples),
+               "first_paint": summarize(s["first_paint_s"] for s in samples),
+               "rerun": summarize(t for s in samples for t in s["rerun_s"])}
+    heavy = samples[0]["heavy_modules"]
+    print(f"app: {app}")
+    print_results(results)
+    print(f"heavy imports at first paint: {', '.join(heavy) or 'none'}")
+    if args.output:
+        write_results(args.output, "startup", results, {"app": str(app), "runs": args.runs, "reruns": args.reruns},
+                      heavy_modules=heavy, samples=samples)
+
+
+if __name__ == "__main__":
+    main()
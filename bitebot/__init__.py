@@ -0,0 +1 @@
+"""BiteBot AI Nutritionist — analysis, storage and AI building blocks used by app.py."""
@@ -0,0 +1 @@
+"""Generative AI plumbing: model discovery, chat backends and caching."""
@@ -0,0 +1,128 @@
+"""
+Bounded conversation context for AI chat sessions.
+
+Instead of one ever-growing Gemini ``ChatSession``, each turn is sent with a
+history rebuilt from: the system prompt, a rolling summary of older turns,
+and a sliding window of the most recent turns. Whenever the window exceeds
+``max_turns`` or the estimated prompt size exceeds ``token_budget``, the
+oldest turns are folded into the summary, so per-message prompt size (and
+with it latency and cost) stays flat however long the session runs.
+"""
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+DEFAULT_TOKEN_BUDGET = 2048
+DEFAULT_MAX_TURNS = 8
+DEFAULT_SUMMARY_BUDGET = 256
+
+Summarizer = Callable[[str, str, str], str]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap, offline token estimate (~4 characters per token for English)."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+def _first_sentence(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    for stop in (". ", "! ", "? ", "\n"):
+        cut = text.find(stop)
+        if 0 < cut < limit:
+            return text[:cut + 1]
+    return text if len(text) <= limit else text[:limit].rstrip() + "…"
+
+
+def extractive_summary(summary: str, user: str, reply: str) -> str:
+    """Default summarizer: appends one line per folded turn, no extra model call."""
+    line = f"- User asked: {_first_sentence(user, 120)} You advised: {_first_sentence(reply, 160)}"
+    return f"{summary}\n{line}" if summary else line
+
+
+class ChatContext:
+    def __init__(self, system_prompt: str, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                 max_turns: int = DEFAULT_MAX_TURNS, summary_budget: int = DEFAULT_SUMMARY_BUDGET,
+                 summarizer: Optional[Summarizer] = None):
+        self.system_prompt = system_prompt
+        self.token_budget = token_budget
+        self.max_turns = max_turns
+        self.summary_budget = summary_budget
+        self.summarizer = summarizer or extractive_summary
+        self.summary = ""
+        self.turns: Deque[Tuple[str, str]] = deque()
+        self.prompt_tokens: List[int] = []  # estimated prompt size of every turn sent
+        self.compactions = 0
+
+    def _system_part(self) -> str:
+        text = f"SYSTEM:\n{self.system_prompt}"
+        if self.summary:
+            text += f"\n\nSummary of the earlier conversation:\n{self.summary}"
+        return text
+
+    def history(self) -> List[Dict]:
+        """Gemini ``start_chat(history=...)`` contents for the current window."""
+        history = [{"role": "user", "parts": [self._system_part()]}]
+        for user, reply in self.turns:
+            history.append({"role": "user", "parts": [user]})
+            history.append({"role": "model", "parts": [reply]})
+        return history
+
+    def history_tokens(self) -> int:
+        return estimate_tokens(self._system_part()) + sum(
+            estimate_tokens(u) + estimate_tokens(r) for u, r in self.turns)
+
+    def _fold_oldest(self):
+        user, reply = self.turns.popleft()
+        summary = self.summarizer(self.summary, user, reply)
+        lines = summary.split("\n")
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.summary_budget:
+            lines.pop(0)  # the oldest summary lines go first
+        self.summary = "\n".join(lines)
+        self.compactions += 1
+
+    def _compact(self, reserve: int = 0):
+        while self.turns and (len(self.turns) > self.max_turns
+                              or self.history_tokens() + reserve > self.token_budget):
+            self._fold_oldest()
+
+    def begin_turn(self, user_message: str) -> List[Dict]:
+        """Compact to fit the next message, record its prompt size, and return the history to send."""
+        reserve = estimate_tokens(user_message)
+        self._compact(reserve)
+        self.prompt_tokens.append(self.history_tokens() + reserve)
+        return self.history()
+
+    def record(self, user_message: str, reply: str):
+        self.turns.append((user_message, reply))
+        self._compact()
+
+    @property
+    def is_empty(self) -> bool:
+        """No earlier turns or summary, so a reply depends only on the question."""
+        return not self.turns and not self.summary
+
+    def to_dict(self) -> Dict:
+        """Conversation state as JSON-able data; settings and the system prompt are not included."""
+        return {"summary": self.summary, "turns": [list(t) for t in self.turns],
+                "prompt_tokens": self.prompt_tokens, "compactions": self.compactions}
+
+    @classmethod
+    def from_dict(cls, data: Dict, system_prompt: str, **settings) -> "ChatContext":
+        context = cls(system_prompt, **settings)
+        context.summary = data.get("summary", "")
+        context.turns = deque(tuple(t) for t in data.get("turns", ()))
+        context.prompt_tokens = list(data.get("prompt_tokens", ()))
+        context.compactions = data.get("compactions", 0)
+        return context
+
+    def stats(self) -> Dict[str, int]:
+        sent = self.prompt_tokens
+        return {
+            "turns": len(self.turns),
+            "summary_tokens": estimate_tokens(self.summary),
+            "history_tokens": self.history_tokens(),
+            "last_prompt_tokens": sent[-1] if sent else 0,
+            "max_prompt_tokens": max(sent) if sent else 0,
+            "avg_prompt_tokens": round(sum(sent) / len(sent)) if sent else 0,
+            "messages_sent": len(sent),
+            "compactions": self.compactions,
+        }
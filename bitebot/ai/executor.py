@@ -0,0 +1,162 @@
+"""
+Bounded background execution for slow AI calls.
+
+Gemini requests run on a shared thread pool instead of the Streamlit script
+thread. Each submission returns a ``RequestHandle`` the UI polls; handles
+carry a deadline, a cooperative cancel flag and the partial output produced
+so far, so a fragment can keep painting streamed text while the rest of the
+page stays interactive. The pool has a hard cap on running plus queued work
+and reports queue depth and in-flight counts for sizing.
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+DEFAULT_WORKERS = 8
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_TIMEOUT_SECONDS = 60.0
+
+
+class ExecutorBusy(Exception):
+    pass
+
+
+class RequestCancelled(Exception):
+    pass
+
+
+class RequestTimeout(RequestCancelled):
+    pass
+
+
+class RequestHandle:
+    def __init__(self, request_id: int, timeout: float):
+        self.id = request_id
+        self.submitted_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.deadline = self.submitted_at + timeout
+        self.partial = ""  # text published so far by the running task
+        self.future: Optional[Future] = None
+        self._cancel = threading.Event()
+        self._timed_out = False
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def raise_if_cancelled(self):
+        """Called by the task between units of work (e.g. stream chunks)."""
+        if self._timed_out:
+            raise RequestTimeout(f"request {self.id} timed out")
+        if self._cancel.is_set():
+            raise RequestCancelled(f"request {self.id} cancelled")
+
+    def sleep(self, seconds: float):
+        """Cancellable wait (e.g. retry backoff); raises as soon as the request is cancelled or times out."""
+        self._cancel.wait(max(0.0, min(seconds, self.deadline - time.monotonic())))
+        self.check_deadline()
+        self.raise_if_cancelled()
+
+    def check_deadline(self) -> bool:
+        """Cancel the request if it outlived its deadline. Returns True when it timed out."""
+        if not self.done() and time.monotonic() > self.deadline:
+            self._timed_out = True
+            self.cancel()
+        return self._timed_out
+
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    @property
+    def status(self) -> str:
+        if self._timed_out:
+            return "timed_out"
+        if self.future is None or not self.future.done():
+            return "cancelling" if self.cancelled else ("running" if self.started_at else "queued")
+        if self.future.cancelled():
+            return "cancelled"
+        exc = self.future.exception()
+        if exc is None:
+            return "done"
+        return "cancelled" if isinstance(exc, RequestCancelled) else "failed"
+
+    def result(self):
+        """The task's return value; raises its exception, or RequestCancelled."""
+        try:
+            return self.future.result(timeout=0)
+        except CancelledError:
+            raise RequestCancelled(f"request {self.id} cancelled") from None
+
+
+class RequestExecutor:
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, max_queue: int = DEFAULT_MAX_QUEUE,
+                 default_timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.default_timeout = default_timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bitebot-ai")
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {"queued": 0, "in_flight": 0, "submitted": 0, "completed": 0,
+                                          "failed": 0, "cancelled": 0, "timed_out": 0, "rejected": 0}
+
+    def submit(self, fn: Callable, *args, timeout: Optional[float] = None) -> RequestHandle:
+        """Run ``fn(handle, *args)`` on the pool. Raises ExecutorBusy when at capacity."""
+        with self._lock:
+            if self._counters["queued"] + self._counters["in_flight"] >= self.max_workers + self.max_queue:
+                self._counters["rejected"] += 1
+                raise ExecutorBusy("Too many AI requests in progress; try again in a moment.")
+            self._counters["queued"] += 1
+            self._counters["submitted"] += 1
+        handle = RequestHandle(next(self._ids), timeout or self.default_timeout)
+        handle.future = self._pool.submit(self._run, handle, fn, args)
+        handle.future.add_done_callback(self._on_cancelled_before_start)
+        return handle
+
+    def _run(self, handle: RequestHandle, fn: Callable, args):
+        with self._lock:
+            self._counters["queued"] -= 1
+            self._counters["in_flight"] += 1
+        handle.started_at = time.monotonic()
+        outcome = "failed"
+        try:
+            if time.monotonic() > handle.deadline:
+                handle.check_deadline()
+            handle.raise_if_cancelled()
+            result = fn(handle, *args)
+            outcome = "completed"
+            return result
+        except RequestTimeout:
+            outcome = "timed_out"
+            raise
+        except RequestCancelled:
+            outcome = "cancelled"
+            raise
+        finally:
+            handle.finished_at = time.monotonic()
+            with self._lock:
+                self._counters["in_flight"] -= 1
+                self._counters[outcome] += 1
+
+    def _on_cancelled_before_start(self, future: Future):
+        # Futures cancelled while still queued never reach _run, so settle their counters here.
+        if future.cancelled():
+            with self._lock:
+                self._counters["queued"] -= 1
+                self._counters["cancelled"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters, max_workers=self.max_workers, max_queue=self.max_queue)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
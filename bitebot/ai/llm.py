@@ -0,0 +1,227 @@
+"""
+LLM backends and the process-wide model registry.
+
+Discovering a usable Gemini model means ``list_models()`` plus a validation
+"ping" per candidate, which takes seconds. ``ModelRegistry`` does that once
+per process (per API key), hands every session the same ready model, and
+once the TTL lapses keeps serving the current model while a background
+thread re-validates it.
+
+Backends are pluggable: ``GeminiBackend`` talks to ``google.generativeai``
+and ``FakeBackend`` answers locally so the whole path runs offline. Pick one
+with the ``BITEBOT_LLM_BACKEND`` environment variable (``gemini`` or ``fake``);
+``BITEBOT_FAKE_LATENCY`` (seconds) makes the fake model answer as slowly as
+a real one, for load tests.
+"""
+import os
+import re
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+FALLBACK_MODEL_NAMES = ["gemini-pro", "models/gemini-pro", "text-bison-001"]
+DEFAULT_TTL_SECONDS = 30 * 60
+FAILURE_RETRY_SECONDS = 30
+
+
+class GeminiBackend:
+    name = "gemini"
+    requires_api_key = True
+
+    def __init__(self):
+        import google.generativeai as genai  # heavy import, only paid when Gemini is used
+        self._genai = genai
+
+    def configure(self, api_key: str):
+        self._genai.configure(api_key=api_key)
+
+    def candidate_model_names(self) -> List[str]:
+        """
+        Tries to find a model that supports generateContent.
+        Works across different google.generativeai versions (v1beta behaviour).
+        """
+        try:
+            models = self._genai.list_models()
+        except Exception:
+            # fallback list if list_models isn't available / fails
+            return list(FALLBACK_MODEL_NAMES)
+
+        candidates = []
+        for m in models:
+            name = getattr(m, "name", "")  # often "models/gemini-pro"
+            methods = getattr(m, "supported_generation_methods", []) or []
+            if "generateContent" in methods:
+                candidates.append(name)
+
+        # Put most likely text models first
+        preferred = [n for n in candidates if "pro" in n.lower() and "vision" not in n.lower()]
+        preferred += [n for n in candidates if n not in preferred]
+        return preferred or list(FALLBACK_MODEL_NAMES)
+
+    def create_model(self, model_name: str):
+        return self._genai.GenerativeModel(model_name)
+
+    def validate(self, model):
+        model.generate_content("ping")
+
+
+class FakeResponse:
+    def __init__(self, text: str, chunks: Optional[List[str]] = None):
+        self.text = text
+        self._chunks = chunks if chunks is not None else [text]
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            yield FakeResponse(chunk, [chunk])
+
+
+class FakeModel:
+    """Stands in for ``genai.GenerativeModel``; replies are deterministic and instant."""
+
+    def __init__(self, model_name: str, reply: Callable[[str], str], latency: float = 0.0):
+        self.model_name = model_name
+        self._reply = reply
+        self.latency = latency
+        self.calls = 0
+
+    def generate_content(self, contents, stream: bool = False):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        prompt = contents if isinstance(contents, str) else str(contents)
+        text = self._reply(prompt)
+        return FakeResponse(text, re.findall(r"\S+\s*", text) if stream else None)
+
+    def start_chat(self, history=None):
+        return FakeChatSession(self, history)
+
+
+class FakeChatSession:
+    def __init__(self, model: FakeModel, history=None):
+        self.model = model
+        self.history = list(history or [])
+
+    def send_message(self, content, stream: bool = False):
+        self.history.append({"role": "user", "parts": [content]})
+        resp = self.model.generate_content(content, stream=stream)
+        self.history.append({"role": "model", "parts": [resp.text]})
+        return resp
+
+
+def default_fake_reply(prompt: str) -> str:
+    if prompt == "ping":
+        return "pong"
+    return f"🤖 (offline) You asked: {prompt.strip()[:200]}"
+
+
+class FakeBackend:
+    """Offline backend: no network, counts discovery work so caching can be checked."""
+    name = "fake"
+    requires_api_key = False
+
+    def __init__(self, reply: Callable[[str], str] = default_fake_reply, latency: Optional[float] = None,
+                 model_names: Optional[List[str]] = None):
+        self.reply = reply
+        self.latency = float(os.environ.get("BITEBOT_FAKE_LATENCY", 0)) if latency is None else latency
+        self.model_names = model_names or ["models/fake-pro"]
+        self.list_calls = 0
+        self.validate_calls = 0
+
+    def configure(self, api_key: str):
+        pass
+
+    def candidate_model_names(self) -> List[str]:
+        self.list_calls += 1
+        return list(self.model_names)
+
+    def create_model(self, model_name: str):
+        return FakeModel(model_name, self.reply, self.latency)
+
+    def validate(self, model):
+        self.validate_calls += 1
+        model.generate_content("ping")
+
+
+BACKENDS: Dict[str, Callable] = {"gemini": GeminiBackend, "fake": FakeBackend}
+
+
+def make_backend(name: Optional[str] = None):
+    name = (name or os.environ.get("BITEBOT_LLM_BACKEND") or "gemini").lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend {name!r}; choose from {sorted(BACKENDS)}")
+    return BACKENDS[name]()
+
+
+class ModelRegistry:
+    """Discovers and validates a working model once, then shares it until the TTL lapses."""
+
+    def __init__(self, backend, api_key: Optional[str], ttl: float = DEFAULT_TTL_SECONDS,
+                 failure_retry: float = FAILURE_RETRY_SECONDS):
+        self.backend = backend
+        self.api_key = api_key
+        self.ttl = ttl
+        self.failure_retry = failure_retry
+        self.model = None
+        self.model_name: Optional[str] = None
+        self.error: Optional[str] = None
+        self.validated_at = 0.0
+        self.discoveries = 0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def _discover(self):
+        self.discoveries += 1
+        self.backend.configure(self.api_key)
+        last_err = None
+        for model_name in self.backend.candidate_model_names():
+            try:
+                model = self.backend.create_model(model_name)
+                self.backend.validate(model)
+                return model, model_name, None
+            except Exception as e:
+                last_err = e
+        return None, None, f"Gemini model not usable. Last error: {last_err}"
+
+    def _store(self, model, model_name, error):
+        # A failed background refresh keeps serving the model that already works.
+        if model is not None or self.model is None:
+            self.model, self.model_name, self.error = model, model_name, error
+        self.validated_at = time.monotonic()
+
+    def _refresh_in_background(self):
+        try:
+            self._store(*self._discover())
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            self._refreshing = False
+
+    def get_model(self):
+        """A validated model, or None (see ``error``). Never blocks once a model is known."""
+        if self.backend.requires_api_key and not self.api_key:
+            self.error = "No GEMINI_API_KEY found. Add it in Streamlit secrets or paste it below."
+            return None
+        if self.model is not None:
+            if time.monotonic() - self.validated_at > self.ttl and not self._refreshing:
+                with self._lock:
+                    if not self._refreshing:
+                        self._refreshing = True
+                        threading.Thread(target=self._refresh_in_background, daemon=True,
+                                         name="bitebot-model-refresh").start()
+            return self.model
+        with self._lock:
+            # Another session may have finished (or just failed) discovery while we waited.
+            if self.model is None and (not self.validated_at
+                                       or time.monotonic() - self.validated_at > self.failure_retry):
+                try:
+                    self._store(*self._discover())
+                except Exception as e:
+                    self._store(None, None, str(e))
+        return self.model
+
+    def invalidate(self):
+        """Forget the current model so the next ``get_model`` rediscovers."""
+        with self._lock:
+            self.model = None
+            self.model_name = None
+            self.validated_at = 0.0
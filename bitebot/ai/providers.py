@@ -0,0 +1,218 @@
+"""
+Chat providers and question routing.
+
+Every provider answers a question either as a whole (``answer``) or chunk by
+chunk (``stream``). ``GeminiProvider`` sends the turn to a Gemini model with
+the bounded ``ChatContext`` history. ``LocalProvider`` runs offline: it
+finds the catalogue foods a question mentions and answers factual intents
+(calories and macros, "is X healthy", alternatives, tips, X vs Y) from
+templates, and falls back to retrieval over a small set of canned nutrition
+answers. ``ChatRouter`` sends questions the local provider can answer there,
+with no network round trip, and escalates only open-ended ones to Gemini.
+"""
+import re
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from bitebot.ai.context import ChatContext
+from bitebot.ai.response_cache import normalize_prompt
+from bitebot.core.catalogue import FoodCatalogue
+
+# analyze(food) -> (analysis, tips) as shown in the Live Chat, e.g. the app's memoised lookup.
+Analyzer = Callable[[str], Tuple[Dict, Dict]]
+
+SYSTEM_PROMPT = (
+    "You are BiteBot AI Nutritionist, an expert nutritionist and health coach.\n"
+    "Guidelines:\n"
+    "1. Be friendly, supportive, and non-judgmental\n"
+    "2. Provide evidence-based nutrition information\n"
+    "3. Give practical, actionable advice\n"
+    "4. Consider cultural food preferences\n"
+    "5. Use markdown formatting for readability\n"
+    "6. Include emojis where appropriate\n"
+    "7. Be honest about limitations\n"
+)
+
+FAQ = {
+    "Give me some healthy meal ideas for weight loss": "🥗 Try: Greek yogurt + berries, chicken salad, salmon + broccoli. Keep protein high + lots of veggies.",
+    "What are the best protein sources for muscle building?": "💪 Chicken, eggs, Greek yogurt, salmon, tofu, lentils, chickpeas.",
+    "How can I count calories effectively?": "🔥 Track portions, include oils/drinks, be consistent, review weekly trends.",
+    "What are common nutrition myths I should know?": "🍎 Myths: carbs/fats aren’t automatically bad, detox cleanses aren’t needed, total intake matters most.",
+    "How much water should I drink daily and why?": "💧 Often 2–3L/day (more if active/hot). Helps energy, digestion, performance.",
+    "How to create a balanced diet plan?": "📊 Plate method: ½ veg, ¼ protein, ¼ carbs, add healthy fats.",
+}
+OFFLINE_HINT = ("🤖 I'm answering offline right now. Ask me about a specific food, e.g. "
+                "“how many calories in pizza”, “is salmon healthy?”, “alternatives to burger” or “rice vs quinoa”.")
+FAQ_SIMILARITY = 0.5
+
+NUTRIENT_WORDS = {
+    "calories": "calories", "calorie": "calories", "kcal": "calories", "cal": "calories",
+    "protein": "protein", "proteins": "protein",
+    "carbs": "carbs", "carb": "carbs", "carbohydrate": "carbs", "carbohydrates": "carbs",
+    "fat": "fat", "fats": "fat", "sugar": "sugar", "sugars": "sugar",
+}
+UNITS = {"calories": " kcal", "protein": "g", "carbs": "g", "fat": "g", "sugar": "g"}
+_NUTRIENT = re.compile(r"\b(" + "|".join(NUTRIENT_WORDS) + r")\b")
+_NUTRITION = re.compile(r"\b(nutrition|nutrients|macros?|nutritional)\b")
+_HEALTHY = re.compile(r"\b(healthy|unhealthy|good for|bad for|score|rating|should i eat|ok to eat)\b")
+_ALTERNATIVES = re.compile(r"\b(alternatives?|instead|substitutes?|swaps?|replace|healthier)\b")
+_TIPS = re.compile(r"\b(tips?|advice|how (?:should|can|do) i eat)\b")
+_COMPARE = re.compile(r"\b(vs|versus|compare|compared|or|better|healthier than)\b")
+
+
+class GeminiProvider:
+    name = "gemini"
+
+    def __init__(self, model, context: ChatContext):
+        self.model = model
+        self.context = context
+
+    def open_turn(self, question: str):
+        """A fresh ChatSession seeded with the bounded context, ready for ``question``."""
+        return self.turn_factory(question)()
+
+    def turn_factory(self, question: str) -> Callable:
+        """Records the turn once and returns a callable opening a fresh session for it (one per retry)."""
+        history = self.context.begin_turn(question)
+        return lambda: self.model.start_chat(history=history)
+
+    @staticmethod
+    def stream_chunks(chat_session, question: str) -> Iterator[str]:
+        """Text chunks of one streamed reply. Raises on API errors; safe off the script thread."""
+        for chunk in chat_session.send_message(question, stream=True):
+            text = getattr(chunk, "text", "") or ""
+            if text:
+                yield text
+
+    @classmethod
+    def open_and_stream(cls, new_session: Callable, question: str) -> Iterator[str]:
+        """Open a session with ``new_session()`` and stream the reply; one call per (guarded) attempt."""
+        yield from cls.stream_chunks(new_session(), question)
+
+    def stream(self, question: str) -> Iterator[str]:
+        yield from self.stream_chunks(self.open_turn(question), question)
+
+    def answer(self, question: str) -> Optional[str]:
+        resp = self.open_turn(question).send_message(question)
+        return (getattr(resp, "text", "") or "").strip() or None
+
+
+class LocalProvider:
+    name = "local"
+
+    def __init__(self, catalogue: FoodCatalogue, analyze: Analyzer, faq: Optional[Dict[str, str]] = None):
+        self.catalogue = catalogue
+        self.analyze = analyze
+        self.faq = dict(FAQ if faq is None else faq)
+        self._faq_keys = {normalize_prompt(q): a for q, a in self.faq.items()}
+        self._faq_vectorizer = None
+
+    def foods_in(self, question: str) -> List[str]:
+        """Catalogue foods named as whole words in the question, in reading order (typos corrected).
+        A food only inside another word ("apple" in "pineapple") is not one, so such questions go to Gemini."""
+        text = normalize_prompt(question)
+        foods = [m.name for m in self.catalogue.matcher.resolve(text)]
+        if not foods:
+            candidate = self.catalogue.fuzzy.best(text, min_confidence=0.8)
+            if candidate is not None:
+                foods = [candidate.name]
+        return foods
+
+    def answer(self, question: str) -> Optional[str]:
+        """A templated answer for factual questions about catalogue foods; None when open-ended."""
+        text = normalize_prompt(question)
+        foods = self.foods_in(question)
+        if not foods:
+            return None
+        if len(foods) >= 2 and _COMPARE.search(text):
+            return self._compare(foods[0], foods[1])
+        food = foods[0]
+        nutrients = [NUTRIENT_WORDS[w] for w in _NUTRIENT.findall(text)]
+        if nutrients or _NUTRITION.search(text):
+            return self._nutrients(food, list(dict.fromkeys(nutrients)))
+        if _ALTERNATIVES.search(text):
+            return self._alternatives(food)
+        if _TIPS.search(text):
+            return self._tips(food)
+        if _HEALTHY.search(text):
+            return self._verdict(food)
+        return None
+
+    def fallback(self, question: str) -> str:
+        """Best offline reply for anything: templates, then the closest canned answer, then a hint."""
+        return self.answer(question) or self._faq(question) or OFFLINE_HINT
+
+    def stream(self, question: str) -> Iterator[str]:
+        yield self.fallback(question)
+
+    def _faq(self, question: str) -> Optional[str]:
+        key = normalize_prompt(question)
+        if key in self._faq_keys:
+            return self._faq_keys[key]
+        if not self._faq_keys:
+            return None
+        if self._faq_vectorizer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self._faq_vectorizer = TfidfVectorizer(stop_words="english")
+            self._faq_matrix = self._faq_vectorizer.fit_transform(list(self._faq_keys))
+        sims = (self._faq_matrix @ self._faq_vectorizer.transform([key]).T).toarray().ravel()
+        best = int(sims.argmax())
+        return list(self._faq_keys.values())[best] if sims[best] >= FAQ_SIMILARITY else None
+
+    def _macros(self, food: str) -> Dict:
+        row = self.catalogue.find(food)
+        info = self.catalogue.nutrition(row) if row is not None else {}
+        _, tips = self.analyze(food)
+        # Catalogue values where known, else the same estimates the Live Chat shows.
+        return {col: info.get(col) if info.get(col) is not None else tips.get(col) for col in UNITS}
+
+    def _nutrients(self, food: str, wanted: List[str]) -> str:
+        macros = self._macros(food)
+        wanted = wanted or ["calories", "protein", "carbs", "fat"]
+        parts = [f"{macros[c]}{UNITS[c]}" + ("" if c == "calories" else f" {c}")
+                 for c in wanted if macros.get(c) is not None]
+        if not parts:
+            return f"🤷 I don't have {', '.join(wanted)} data for {food}."
+        return f"🔥 A typical serving of {food} has {', '.join(parts)}."
+
+    def _verdict(self, food: str) -> str:
+        analysis, _ = self.analyze(food)
+        return (f"{analysis['icon']} {food.title()} is rated {analysis['status']} "
+                f"({analysis['score']}/10). {analysis['message']}")
+
+    def _alternatives(self, food: str) -> str:
+        _, tips = self.analyze(food)
+        return f"🔄 Healthier alternatives to {food}: " + ", ".join(tips["alternatives"]) + "."
+
+    def _tips(self, food: str) -> str:
+        _, tips = self.analyze(food)
+        return f"💡 Tips for {food}: " + " • ".join(tips["tips"])
+
+    def _compare(self, first: str, second: str) -> str:
+        a, b = self.analyze(first)[0], self.analyze(second)[0]
+        ma, mb = self._macros(first), self._macros(second)
+        better = first if a["score"] >= b["score"] else second
+        return (f"⚖️ {first}: {a['status']} ({a['score']}/10), {ma['calories']} kcal • "
+                f"{second}: {b['status']} ({b['score']}/10), {mb['calories']} kcal. "
+                f"👉 {better.title()} is the better everyday choice.")
+
+
+class ChatRouter:
+    """Local first for cheap factual questions; Gemini for the rest when it is available."""
+
+    def __init__(self, local: LocalProvider, enabled: bool = True):
+        self.local = local
+        self.enabled = enabled
+        self.counts = {"local": 0, "remote": 0, "offline": 0}
+
+    def route(self, question: str, remote_available: bool) -> Tuple[str, Optional[str]]:
+        """(provider name, answer). The answer is None when the question should go to Gemini."""
+        if self.enabled:
+            reply = self.local.answer(question)
+            if reply is not None:
+                self.counts["local"] += 1
+                return self.local.name, reply
+        if remote_available:
+            self.counts["remote"] += 1
+            return GeminiProvider.name, None
+        self.counts["offline"] += 1
+        return self.local.name, self.local.fallback(question)
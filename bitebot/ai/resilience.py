@@ -0,0 +1,264 @@
+"""
+Retries, circuit breaking and rate limiting for Gemini calls.
+
+``ResilientCaller`` wraps one remote call:
+
+* a shared ``TokenBucket`` caps the request rate of the whole process, so
+  a burst of sessions queues briefly instead of collecting 429s;
+* a ``CircuitBreaker`` counts consecutive transient failures and, once open, fails
+  calls immediately (callers serve the offline answer) until a cool-down
+  lets a single trial call through;
+* transient errors (429, 5xx, timeouts, dropped connections) are retried
+  with capped exponential backoff and full jitter.
+
+All three keep counters for the metrics panel.
+"""
+import math
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional
+
+DEFAULT_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 0.5
+DEFAULT_MAX_DELAY = 8.0
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 30.0
+DEFAULT_RATE = 2.0      # requests per second, process-wide
+DEFAULT_BURST = 10
+DEFAULT_ACQUIRE_TIMEOUT = 5.0
+
+TRANSIENT_ERROR_NAMES = ("ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+                         "DeadlineExceeded", "GatewayTimeout", "Aborted", "Timeout", "ConnectionError",
+                         "ConnectionResetError", "RemoteDisconnected")
+TRANSIENT_ERROR_MARKERS = ("429", "500", "502", "503", "504", "rate limit", "quota", "temporarily",
+                           "unavailable", "timed out", "timeout", "overloaded")
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+class RateLimited(Exception):
+    pass
+
+
+def is_transient(exc: BaseException) -> bool:
+    """Errors worth retrying: throttling, server-side failures and network hiccups."""
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    if any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(exc).__mro__):
+        return True
+    text = str(exc).lower()
+    return any(marker in text for marker in TRANSIENT_ERROR_MARKERS)
+
+
+class RetryPolicy:
+    def __init__(self, attempts: int = DEFAULT_ATTEMPTS, base_delay: float = DEFAULT_BASE_DELAY,
+                 max_delay: float = DEFAULT_MAX_DELAY, rng: Optional[random.Random] = None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def delay(self, retry: int) -> float:
+        """Full jitter: uniform in [0, min(max_delay, base * 2**retry)]."""
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry)))
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.opened = 0  # times the breaker tripped
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self._state = "half_open"
+            self._trial_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go out now; half-open lets exactly one trial call through."""
+        with self._lock:
+            state = self._current_state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def release_trial(self):
+        """Give back a half-open trial slot that was never used."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                if self._state != "open":
+                    self.opened += 1
+                self._state = "open"
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self._current_state() != "open":
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+
+class TokenBucket:
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: int = DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token if one is available; otherwise return the seconds until one will be."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float = DEFAULT_ACQUIRE_TIMEOUT, sleep: Callable[[float], None] = time.sleep) -> bool:
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = self.try_acquire()
+            if not wait:
+                return True
+            if time.monotonic() + wait > deadline:
+                return False
+            sleep(wait)
+
+
+class ResilientCaller:
+    def __init__(self, retry: Optional[RetryPolicy] = None, breaker: Optional[CircuitBreaker] = None,
+                 limiter: Optional[TokenBucket] = None, acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT):
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter or TokenBucket()
+        self.acquire_timeout = acquire_timeout
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "successes": 0, "failures": 0, "retries": 0,
+                          "short_circuited": 0, "rate_limited": 0}
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    @property
+    def available(self) -> bool:
+        """False while the breaker is open, so callers can route to an offline answer up front."""
+        return self.breaker.state != "open"
+
+    def _admit(self, sleep: Callable[[float], None]):
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            raise CircuitOpen(f"Gemini paused after repeated errors; retrying in "
+                              f"{math.ceil(self.breaker.retry_after())}s.")
+        try:
+            acquired = self.limiter.acquire(self.acquire_timeout, sleep)
+        except BaseException:
+            # A cancellable ``sleep`` raised while waiting for a token: the trial was never used.
+            self.breaker.release_trial()
+            raise
+        if not acquired:
+            self._count("rate_limited")
+            self.breaker.release_trial()
+            raise RateLimited("Too many AI requests right now; please try again shortly.")
+
+    def _should_retry(self, exc: Exception, attempt: int, started: bool) -> bool:
+        transient = is_transient(exc)
+        if transient:
+            self.breaker.record_failure()
+        else:
+            # A bad request or key says nothing about Gemini's health: don't trip the breaker for everyone,
+            # just give back a half-open trial slot if this call held it.
+            self.breaker.release_trial()
+        if started or attempt == self.retry.attempts - 1 or not transient:
+            self._count("failures")
+            return False
+        self._count("retries")
+        return True
+
+    def _succeeded(self):
+        self.breaker.record_success()
+        self._count("successes")
+
+    def call(self, fn: Callable, *args, sleep: Callable[[float], None] = time.sleep):
+        """``fn(*args)`` with rate limiting, breaker checks and retries of transient errors.
+        ``sleep`` lets the caller make rate-limit and backoff waits cancellable."""
+        self._count("calls")
+        for attempt in range(self.retry.attempts):
+            self._admit(sleep)
+            try:
+                result = fn(*args)
+            except Exception as e:
+                if not self._should_retry(e, attempt, started=False):
+                    raise
+                sleep(self.retry.delay(attempt))
+                continue
+            except BaseException:
+                self.breaker.release_trial()
+                raise
+            self._succeeded()
+            return result
+
+    def stream(self, fn: Callable[..., Iterator], *args, sleep: Callable[[float], None] = time.sleep) -> Iterator:
+        """Like ``call`` for a generator; only retried while no chunk has been yielded yet."""
+        self._count("calls")
+        for attempt in range(self.retry.attempts):
+            self._admit(sleep)
+            started = False
+            try:
+                for chunk in fn(*args):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                if not self._should_retry(e, attempt, started):
+                    raise
+                sleep(self.retry.delay(attempt))
+                continue
+            except BaseException:
+                # Abandoned mid-attempt (the consumer closed the generator, or an interrupt): neither a
+                # success nor a failure, but a half-open trial must be given back or the breaker stays shut.
+                self.breaker.release_trial()
+                raise
+            self._succeeded()
+            return
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counters = dict(self._counters)
+        return dict(counters, breaker_state=self.breaker.state, breaker_opened=self.breaker.opened,
+                    breaker_retry_after=round(self.breaker.retry_after(), 1))
@@ -0,0 +1,241 @@
+"""
+Shared cache of AI chat answers for stateless questions.
+
+Keys are normalised prompt text; when exact lookup misses, an optional
+cosine match over the cached keys catches rephrasings ("good snacks
+for weight loss?" vs "what are good snacks for weight-loss"). A near key is
+only reused when the two questions differ by filler words alone, so "not",
+"after" or "during" always tell questions apart. Entries expire after a
+TTL and the least recently used ones are evicted beyond ``max_entries``.
+Storage is pluggable: ``MemoryBackend`` for one process, ``SQLiteBackend``
+to share answers between worker processes through a local file.
+"""
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_SIMILARITY = 0.5  # cosine only shortlists candidates; _same_question() decides
+
+# Words a rephrasing may add or drop without changing what is asked. Negations,
+# prepositions and qualifiers are deliberately absent.
+_FILLER = frozenset("a an the what which how is are was were be do does did i me my we our you your "
+                    "please tell there some any".split())
+
+_FOLLOW_UP = re.compile(r"\b(it|its|that|this|those|these|them|they|above|again|more|previous|earlier)\b")
+
+
+def normalize_prompt(text: str) -> str:
+    text = re.sub(r"[^\w\s]", " ", (text or "").lower())
+    return " ".join(text.split())
+
+
+def looks_stateless(text: str) -> bool:
+    """True when a question doesn't lean on earlier turns, so any user's answer fits."""
+    return bool(normalize_prompt(text)) and not _FOLLOW_UP.search(normalize_prompt(text))
+
+
+def _same_question(a: str, b: str) -> bool:
+    return (set(a.split()) ^ set(b.split())) <= _FILLER
+
+
+class _SimilarityIndex:
+    """Hashed word uni/bigram rows for the cached keys. Hashing needs no fitted vocabulary, so
+    new keys are appended and removed ones masked out without refitting; the matrix is only
+    rebuilt from the live keys once masked rows outnumber them."""
+
+    def __init__(self):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        self.vectorizer = HashingVectorizer(ngram_range=(1, 2), n_features=2 ** 18, alternate_sign=False)
+        self.clear()
+
+    def clear(self):
+        self.keys: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.alive: List[bool] = []
+        self.size = 0
+        self.matrix = None
+
+    def add(self, keys: List[str]):
+        new = []
+        for key in keys:
+            row = self.rows.get(key)
+            if row is None:
+                self.rows[key] = len(self.keys) + len(new)
+                new.append(key)
+            elif not self.alive[row]:
+                self.alive[row] = True
+                self.size += 1
+        if not new:
+            return
+        from scipy.sparse import vstack
+        rows = self.vectorizer.transform(new)
+        self.matrix = rows if self.matrix is None else vstack([self.matrix, rows], format="csr")
+        self.keys.extend(new)
+        self.alive.extend([True] * len(new))
+        self.size += len(new)
+
+    def remove(self, key: str):
+        row = self.rows.get(key)
+        if row is not None and self.alive[row]:
+            self.alive[row] = False
+            self.size -= 1
+
+    def sync(self, keys: List[str]):
+        """Match the index to the backend's key set, which other processes may change through a shared file."""
+        current = set(keys)
+        for key in [k for k, row in self.rows.items() if self.alive[row] and k not in current]:
+            self.remove(key)
+        if len(self.keys) - self.size > max(self.size, 64):
+            self.clear()
+        self.add(keys)
+
+    def nearest(self, key: str, similarity: float) -> Optional[str]:
+        if not self.size:
+            return None
+        scores = (self.matrix @ self.vectorizer.transform([key]).T).toarray().ravel()
+        for row in scores.argsort()[::-1]:
+            if scores[row] < similarity:
+                break
+            if self.alive[row] and _same_question(key, self.keys[row]):
+                return self.keys[row]
+        return None
+
+
+class MemoryBackend:
+    """In-process LRU store: key -> (response, created_at)."""
+
+    def __init__(self):
+        self._data: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        item = self._data.get(key)
+        if item is not None:
+            self._data.move_to_end(key)
+        return item
+
+    def set(self, key: str, response: str, created_at: float):
+        self._data[key] = (response, created_at)
+        self._data.move_to_end(key)
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def keys(self) -> List[str]:
+        return list(self._data)
+
+    def pop_oldest(self) -> Optional[str]:
+        if not self._data:
+            return None
+        key, _ = self._data.popitem(last=False)
+        return key
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteBackend:
+    """On-disk store shared by every process pointing at the same file."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS responses ("
+                           "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                           "created_at REAL NOT NULL, accessed_at REAL NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at)")
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        row = self._conn.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return row
+
+    def set(self, key: str, response: str, created_at: float):
+        self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                           (key, response, created_at, time.time()))
+
+    def delete(self, key: str):
+        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def keys(self) -> List[str]:
+        return [r[0] for r in self._conn.execute("SELECT key FROM responses")]
+
+    def pop_oldest(self) -> Optional[str]:
+        row = self._conn.execute("SELECT key FROM responses ORDER BY accessed_at LIMIT 1").fetchone()
+        if row is None:
+            return None
+        self.delete(row[0])
+        return row[0]
+
+    def __len__(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class ResponseCache:
+    def __init__(self, backend=None, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 ttl: float = DEFAULT_TTL_SECONDS, similarity: Optional[float] = DEFAULT_SIMILARITY):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity  # None disables similar-question matching
+        self._counters: Dict[str, int] = {"hits": 0, "similar_hits": 0, "misses": 0,
+                                          "expired": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._index: Optional[_SimilarityIndex] = None  # built on the first similar lookup
+
+    def _fresh(self, key: str) -> Optional[str]:
+        item = self.backend.get(key)
+        if item is None:
+            return None
+        response, created_at = item
+        if time.time() - created_at > self.ttl:
+            self.backend.delete(key)
+            self._counters["expired"] += 1
+            return None
+        return response
+
+    def _nearest_key(self, key: str) -> Optional[str]:
+        if self._index is None:
+            self._index = _SimilarityIndex()
+        # Cheap next to the model call a miss leads to: only keys new to the index get vectorised.
+        self._index.sync(self.backend.keys())
+        return self._index.nearest(key, self.similarity)
+
+    def get(self, prompt: str) -> Optional[str]:
+        key = normalize_prompt(prompt)
+        with self._lock:
+            response = self._fresh(key)
+            if response is not None:
+                self._counters["hits"] += 1
+                return response
+            if self.similarity is not None:
+                near = self._nearest_key(key)
+                response = self._fresh(near) if near else None
+                if response is not None:
+                    self._counters["similar_hits"] += 1
+                    return response
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, prompt: str, response: str):
+        key = normalize_prompt(prompt)
+        if not key or not response:
+            return
+        with self._lock:
+            self.backend.set(key, response, time.time())
+            while len(self.backend) > self.max_entries:
+                if self.backend.pop_oldest() is None:
+                    break
+                self._counters["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters, entries=len(self.backend))
+
+    def __len__(self) -> int:
+        return len(self.backend)
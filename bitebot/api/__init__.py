@@ -0,0 +1 @@
+"""Headless HTTP/JSON API: food analysis, nutrition and AI chat without the Streamlit UI."""
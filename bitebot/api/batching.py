@@ -0,0 +1,70 @@
+"""
+Coalescing of concurrent requests into batches.
+
+``MicroBatcher`` collects items submitted from many coroutines for up to
+``max_delay`` seconds (or until ``max_batch`` are waiting), removes
+duplicates and hands the batch to a blocking ``fn(items) -> results`` on a
+worker thread. The event loop never runs the computation itself, and a
+burst of requests for the same new food computes it once.
+"""
+import asyncio
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_DELAY = 0.002
+
+
+class MicroBatcher:
+    def __init__(self, fn: Callable[[Sequence[Hashable]], Sequence[Any]], max_batch: int = DEFAULT_MAX_BATCH,
+                 max_delay: float = DEFAULT_MAX_DELAY, executor: Optional[Executor] = None):
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.executor = executor
+        self._pending: List[Tuple[Hashable, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._counters = {"batches": 0, "items": 0, "unique_items": 0, "largest_batch": 0}
+
+    async def submit(self, item: Hashable):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    async def submit_many(self, items: Sequence[Hashable]) -> List[Any]:
+        return list(await asyncio.gather(*(self.submit(item) for item in items)))
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Hashable, asyncio.Future]]):
+        unique = list(dict.fromkeys(item for item, _ in batch))
+        c = self._counters
+        c["batches"] += 1
+        c["items"] += len(batch)
+        c["unique_items"] += len(unique)
+        c["largest_batch"] = max(c["largest_batch"], len(batch))
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, self.fn, unique)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        by_item = dict(zip(unique, results))
+        for item, future in batch:
+            if not future.done():
+                future.set_result(by_item[item])
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._counters, pending=len(self._pending))
@@ -0,0 +1,331 @@
+"""
+Async HTTP/JSON service over the same analysis and chat code as the Streamlit app.
+
+    python -m bitebot.api.server --port 8000 --workers 4
+
+    GET  /analyze?food=pizza        POST /analyze    {"food": "pizza"} or {"foods": ["pizza", "2x salad"]}
+    GET  /nutrition?food=pizza      POST /nutrition  (same body)
+    POST /chat  {"message": "...", "session_id": "optional", "stream": false}
+    GET  /health                    GET  /metrics    (Prometheus text)
+
+Each worker process builds its catalogue, analysis cache, chat router and
+Gemini guard with ``bitebot.services``, so the API reads the same
+``BITEBOT_*`` settings as the app. Cached analyses are answered on the event
+loop; misses from concurrent requests are batched onto a worker thread
+(``MicroBatcher``). Chat questions are routed like in the app: factual ones
+are answered offline, repeated stateless ones come from the response cache,
+and the rest go to Gemini behind the shared rate limit and circuit breaker.
+With ``"stream": true`` the reply comes back as NDJSON lines while Gemini
+writes it. A ``session_id`` keeps the conversation context between calls in
+the session store. HTTP/1.1 connections stay open between requests
+(``--keep-alive`` seconds). Every endpoint's latency is recorded under
+``api_<endpoint>`` in the metrics registry.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.exceptions import HTTPException
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from bitebot import metrics
+from bitebot.ai.providers import GeminiProvider
+from bitebot.ai.response_cache import looks_stateless
+from bitebot.api.batching import MicroBatcher
+from bitebot.core.analysis import FoodAnalyzer
+from bitebot.core.batch import MAX_ITEMS
+from bitebot.core.matcher import normalize_food_text
+from bitebot.services import (build_analysis_cache, build_catalogue, build_chat_context, build_chat_router,
+                              build_gemini_guard, build_metrics_exporter, build_model_registry, build_response_cache,
+                              build_session_store)
+
+MACROS = ("calories", "protein", "carbs", "fat")
+MAX_MESSAGE_CHARS = 4000
+MAX_SESSION_ID_CHARS = 128
+CONTEXT_KEY = "api_chat_context"  # session store key, separate from the app's own AI chat context
+ENDPOINTS = {"/analyze": "analyze", "/nutrition": "nutrition", "/chat": "chat", "/health": "health",
+             "/metrics": "metrics"}
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def analysis_payload(food: str, analysis: Dict, tips: Dict) -> Dict:
+    out = {"food": food, "status": analysis["status"], "score": analysis["score"], "message": analysis["message"]}
+    if "matched_as" in analysis:
+        out.update(matched_as=analysis["matched_as"], confidence=analysis["confidence"])
+    if "estimated_from" in analysis:
+        out["estimated_from"] = [name for name, _ in analysis["estimated_from"]]
+    out["nutrition"] = {m: tips[m] for m in MACROS}
+    return out
+
+
+def nutrition_payload(food: str, tips: Dict) -> Dict:
+    return {"food": food, **{m: tips[m] for m in MACROS}, "tips": tips["tips"], "alternatives": tips["alternatives"]}
+
+
+def _ndjson(obj: Dict) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode() + b"\n"
+
+
+class LatencyMiddleware:
+    """Per-endpoint latency (``api_<endpoint>``) and status-class counters for every request."""
+
+    def __init__(self, app, exporter: Optional[metrics.FileExporter] = None):
+        self.app = app
+        self.exporter = exporter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        name = ENDPOINTS.get(scope["path"], "other")
+        status = 500
+
+        async def send_and_note_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_and_note_status)
+        finally:
+            # Streamed replies are timed to their last chunk.
+            metrics.observe(f"api_{name}", time.perf_counter() - started)
+            metrics.inc(f"api_{name}_{status // 100}xx")
+            if self.exporter is not None:
+                self.exporter.maybe_export()
+
+
+class NutritionAPI:
+    def __init__(self):
+        env = os.environ.get
+        self.catalogue = build_catalogue()
+        self.analyzer = FoodAnalyzer(self.catalogue)
+        self.analysis_cache = build_analysis_cache(self.analyzer)
+        self.router = build_chat_router(self.catalogue, self.lookup)
+        self.response_cache = build_response_cache()
+        self.guard = build_gemini_guard()
+        self.sessions = build_session_store()
+        self.registry = build_model_registry(env("GEMINI_API_KEY"), env("BITEBOT_LLM_BACKEND"))
+        # Gemini calls block for seconds, so they get their own pool; analysis misses share one thread.
+        self.ai_pool = ThreadPoolExecutor(int(env("BITEBOT_AI_WORKERS", 8)), thread_name_prefix="bitebot-api-ai")
+        self.analysis_pool = ThreadPoolExecutor(1, thread_name_prefix="bitebot-api-analysis")
+        self.batcher = MicroBatcher(self._lookup_many, int(env("BITEBOT_API_BATCH", 64)),
+                                    float(env("BITEBOT_API_BATCH_DELAY", 0.002)), self.analysis_pool)
+
+    def lookup(self, food: str):
+        return self.analysis_cache.get(food, self.catalogue.version)
+
+    def _lookup_many(self, foods: List[str]):
+        return [self.lookup(food) for food in foods]
+
+    async def analyses(self, foods: List[str]):
+        """(analysis, tips) per food: cache hits right away, misses batched off the event loop."""
+        results = [self.analysis_cache.peek(food, self.catalogue.version) for food in foods]
+        missing = [i for i, r in enumerate(results) if r is None]
+        if missing:
+            computed = await self.batcher.submit_many([normalize_food_text(foods[i]) for i in missing])
+            for i, result in zip(missing, computed):
+                results[i] = result
+        return results
+
+    # ---- request parsing ----
+    @staticmethod
+    async def _body(request: Request) -> Dict:
+        try:
+            body = json.loads(await request.body() or b"{}")
+        except ValueError:
+            raise ApiError(400, "request body is not valid JSON")
+        if not isinstance(body, dict):
+            raise ApiError(400, "request body must be a JSON object")
+        return body
+
+    async def _foods(self, request: Request):
+        """(foods, batch?) from ``?food=`` (repeatable) or a ``food`` / ``foods`` JSON body."""
+        if request.method == "GET":
+            foods = request.query_params.getlist("food")
+            batch = len(foods) != 1
+        else:
+            body = await self._body(request)
+            batch = "foods" in body
+            foods = body["foods"] if batch else [body.get("food")]
+        if not isinstance(foods, list) or not foods or not all(isinstance(f, str) and f.strip() for f in foods):
+            raise ApiError(400, "give a non-empty 'food' string or a 'foods' list of them")
+        if len(foods) > MAX_ITEMS:
+            raise ApiError(413, f"at most {MAX_ITEMS} foods per request")
+        return [f.strip() for f in foods], batch
+
+    # ---- endpoints ----
+    async def analyze(self, request: Request):
+        foods, batch = await self._foods(request)
+        results = [analysis_payload(food, *r) for food, r in zip(foods, await self.analyses(foods))]
+        return JSONResponse({"results": results} if batch else results[0])
+
+    async def nutrition(self, request: Request):
+        foods, batch = await self._foods(request)
+        results = [nutrition_payload(food, tips) for food, (_, tips) in zip(foods, await self.analyses(foods))]
+        return JSONResponse({"results": results} if batch else results[0])
+
+    def _load_context(self, session_id: Optional[str]):
+        if session_id:
+            stored = self.sessions.load(session_id, [CONTEXT_KEY])
+            if CONTEXT_KEY in stored:
+                return build_chat_context(stored[CONTEXT_KEY][1])
+        return build_chat_context()
+
+    def _finish_turn(self, session_id: Optional[str], context, message: str, reply: str, cache: bool = False):
+        context.record(message, reply)
+        if session_id:
+            self.sessions.save(session_id, CONTEXT_KEY, context.to_dict())
+        if cache:
+            self.response_cache.put(message, reply)
+
+    def _route(self, message: str, session_id: Optional[str]) -> Dict:
+        # Blocking (model discovery, SQLite, first-use imports), so it runs on the AI pool.
+        model = self.registry.get_model()
+        provider, reply = self.router.route(message, model is not None and self.guard.available)
+        metrics.inc(f"ai_questions_{provider}")
+        context = self._load_context(session_id)
+        stateless = looks_stateless(message)
+        # Replies are shared with every client, so only cache one written without this session's earlier turns.
+        turn = {"provider": provider, "reply": reply, "cached": False, "model": model,
+                "cacheable": stateless and context.is_empty, "context": context}
+        if reply is None and stateless:
+            cached = self.response_cache.get(message)
+            if cached is not None:
+                turn.update(reply=cached, cached=True)
+        return turn
+
+    def _answer(self, turn: Dict, message: str, session_id: Optional[str]) -> Dict:
+        cache = False
+        if turn["reply"] is None:
+            try:
+                turn["reply"] = self.guard.call(GeminiProvider(turn["model"], turn["context"]).answer, message)
+                cache = turn["cacheable"]
+            except Exception:
+                metrics.inc("api_gemini_failures")
+            if not turn["reply"]:
+                turn.update(provider=self.router.local.name, reply=self.router.local.fallback(message))
+                cache = False
+        self._finish_turn(session_id, turn["context"], message, turn["reply"], cache)
+        return turn
+
+    def _stream(self, turn: Dict, message: str, session_id: Optional[str]):
+        # A plain generator: Starlette iterates it on a worker thread, one NDJSON line per chunk.
+        if turn["reply"] is None:
+            parts = []
+            try:
+                provider = GeminiProvider(turn["model"], turn["context"])
+                for text in self.guard.stream(GeminiProvider.open_and_stream, provider.turn_factory(message),
+                                              message):
+                    parts.append(text)
+                    yield _ndjson({"delta": text})
+            except Exception:
+                metrics.inc("api_gemini_failures")
+                if parts:
+                    yield _ndjson({"done": True, "provider": "gemini", "error": "Gemini stopped mid-reply"})
+                    return
+            reply = "".join(parts).strip()
+            if reply:
+                self._finish_turn(session_id, turn["context"], message, reply, turn["cacheable"])
+                yield _ndjson({"done": True, "provider": "gemini", "cached": False})
+                return
+            turn.update(provider=self.router.local.name, reply=self.router.local.fallback(message))
+        self._finish_turn(session_id, turn["context"], message, turn["reply"])
+        yield _ndjson({"delta": turn["reply"]})
+        yield _ndjson({"done": True, "provider": turn["provider"], "cached": turn["cached"]})
+
+    async def chat(self, request: Request):
+        body = await self._body(request)
+        message, session_id = body.get("message"), body.get("session_id")
+        if not isinstance(message, str) or not message.strip():
+            raise ApiError(400, "give a non-empty 'message' string")
+        if len(message) > MAX_MESSAGE_CHARS:
+            raise ApiError(413, f"messages are limited to {MAX_MESSAGE_CHARS} characters")
+        if session_id is not None and (not isinstance(session_id, str) or len(session_id) > MAX_SESSION_ID_CHARS):
+            raise ApiError(400, f"'session_id' must be a string of at most {MAX_SESSION_ID_CHARS} characters")
+        message = message.strip()
+        loop = asyncio.get_running_loop()
+        turn = await loop.run_in_executor(self.ai_pool, self._route, message, session_id)
+        if body.get("stream"):
+            return StreamingResponse(self._stream(turn, message, session_id), media_type="application/x-ndjson")
+        turn = await loop.run_in_executor(self.ai_pool, self._answer, turn, message, session_id)
+        return JSONResponse({"reply": turn["reply"], "provider": turn["provider"], "cached": turn["cached"]})
+
+    async def health(self, request: Request):
+        return JSONResponse({"status": "ok", "catalogue": {"version": self.catalogue.version,
+                                                           "foods": len(self.catalogue)},
+                             "gemini": self.guard.stats(), "analysis_cache": self.analysis_cache.stats(),
+                             "batching": self.batcher.stats(), "response_cache": self.response_cache.stats(),
+                             "chat_router": self.router.counts, "session_store": self.sessions.stats()})
+
+    async def metrics(self, request: Request):
+        return PlainTextResponse(metrics.REGISTRY.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+    def close(self):
+        self.ai_pool.shutdown(wait=False, cancel_futures=True)
+        self.analysis_pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def _api_error(request: Request, exc: ApiError):
+    return JSONResponse({"error": str(exc)}, status_code=exc.status)
+
+
+async def _http_error(request: Request, exc: HTTPException):
+    return JSONResponse({"error": exc.detail}, status_code=exc.status_code, headers=exc.headers)
+
+
+def create_app(api: Optional[NutritionAPI] = None) -> Starlette:
+    api = api or NutritionAPI()
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        api.close()
+
+    routes = [
+        Route("/analyze", api.analyze, methods=["GET", "POST"]),
+        Route("/nutrition", api.nutrition, methods=["GET", "POST"]),
+        Route("/chat", api.chat, methods=["POST"]),
+        Route("/health", api.health, methods=["GET"]),
+        Route("/metrics", api.metrics, methods=["GET"]),
+    ]
+    app = Starlette(routes=routes, lifespan=lifespan,
+                    middleware=[Middleware(LatencyMiddleware, exporter=build_metrics_exporter())],
+                    exception_handlers={ApiError: _api_error, HTTPException: _http_error})
+    app.state.api = api
+    return app
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(prog="python -m bitebot.api.server", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (one event loop each)")
+    parser.add_argument("--keep-alive", type=float, default=30.0, help="seconds an idle connection stays open")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args(argv)
+    uvicorn.run("bitebot.api.server:create_app", factory=True, host=args.host, port=args.port,
+                workers=args.workers, timeout_keep_alive=args.keep_alive, backlog=args.backlog,
+                log_level=args.log_level, access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Food analysis core: matching, catalogue lookups and scoring."""
@@ -0,0 +1,165 @@
+"""
+Single-food analysis as shown in the Live Chat.
+
+``FoodAnalyzer`` answers "how healthy is this food" and "what are its
+macros" from the catalogue first. Typo matches are annotated with the name
+they were read as. Unlabelled rows are classified by the health model, and
+foods outside the catalogue borrow from their nearest neighbours, or are
+treated as a typical (median) catalogue serving.
+
+The health model, the neighbour index and the median serving are built on
+first use. A session that only looks up catalogue foods never loads
+scikit-learn.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from bitebot import metrics
+from bitebot.core.batch import BatchResult
+from bitebot.core.catalogue import NUTRIENT_COLUMNS, STATUSES, FoodCatalogue
+from bitebot.core.estimator import NutritionEstimator
+from bitebot.core.model import FEATURES, HealthModel, load_model
+
+STATUS_STYLES = {
+    "HEALTHY": {"badge_class": "healthy-badge", "icon": "✅",
+                "message": "🥗 EXCELLENT! This is super nutritious!", "color": "#00ff88"},
+    "UNHEALTHY": {"badge_class": "unhealthy-badge", "icon": "⚠️",
+                  "message": "🔴 Enjoy occasionally in small portions.", "color": "#ff4444"},
+    "MODERATE": {"badge_class": "moderate-badge", "icon": "⚖️",
+                 "message": "🟡 Good in moderation with balanced diet.", "color": "#ffcc00"},
+}
+
+UNKNOWN_FOOD_MESSAGE = "🟡 Enjoy as part of balanced meals."
+
+DEFAULT_TIPS = {
+    "HEALTHY": {"tips": ["Great choice!", "Pair with protein", "Keep up the good work"],
+                "alternatives": ["Similar healthy option", "Another good choice", "Variety option"]},
+    "UNHEALTHY": {"tips": ["Enjoy as treat", "Watch portion size", "Balance with veggies"],
+                  "alternatives": ["Healthier version", "Better alternative", "Light option"]},
+    "MODERATE": {"tips": ["Good in moderation", "Balance your meal", "Enjoy mindfully"],
+                 "alternatives": ["Healthier twist", "Better choice", "Alternative option"]},
+}
+
+
+class FoodAnalyzer:
+    def __init__(self, catalogue: FoodCatalogue):
+        self.catalogue = catalogue
+        self._model: Optional[HealthModel] = None
+        self._estimator: Optional[NutritionEstimator] = None
+        self._typical: Optional[Dict[str, float]] = None
+        self._unknown_score: Optional[int] = None
+
+    @property
+    def model(self) -> HealthModel:
+        if self._model is None:
+            self._model = load_model(catalogue=self.catalogue)
+        return self._model
+
+    @property
+    def estimator(self) -> NutritionEstimator:
+        if self._estimator is None:
+            self._estimator = NutritionEstimator(self.catalogue)
+        return self._estimator
+
+    @property
+    def typical_nutrients(self) -> Dict[str, float]:
+        """Median catalogue serving, for foods nothing in the catalogue resembles."""
+        if self._typical is None:
+            typical = np.nanmedian(self.catalogue.nutrient_matrix(), axis=0)
+            self._typical = {col: round(float(v), 1) for col, v in zip(NUTRIENT_COLUMNS, typical)}
+        return self._typical
+
+    @property
+    def unknown_score(self) -> int:
+        """Foods outside the catalogue are scored as a typical (median) catalogue serving."""
+        if self._unknown_score is None:
+            typical = self.typical_nutrients
+            self._unknown_score = self.model.predict_one([typical[c] for c in FEATURES])[1]
+        return self._unknown_score
+
+    @metrics.timed("analyze_food")
+    def analyze(self, food_name: str) -> Dict:
+        catalogue = self.catalogue
+        match = catalogue.lookup_match(food_name)
+        if match is not None:
+            row, confidence = match
+            status, score = catalogue.status(row), catalogue.score(row)
+            if status is None or score is None:
+                # Unlabelled catalogue rows are classified from their macros.
+                nutrients = catalogue.nutrient_matrix([row], columns=FEATURES)[0]
+                if not np.isnan(nutrients).any():
+                    predicted_status, predicted_score = self.model.predict_one(nutrients)
+                    status = status or predicted_status
+                    score = score if score is not None else predicted_score
+            if status is not None and score is not None:
+                analysis = {"status": status, "score": score, **STATUS_STYLES[status]}
+                if confidence < 1:
+                    name = catalogue.name(row)
+                    analysis.update(message=f"{analysis['message']} (read as “{name}”, {confidence:.0%} match)",
+                                    matched_as=name, confidence=confidence)
+                return analysis
+        estimate = self.estimator.estimate(food_name)
+        if estimate is not None:
+            similar = ", ".join(name for name, _ in estimate.neighbours[:3])
+            return {"status": estimate.status, "score": estimate.score, **STATUS_STYLES[estimate.status],
+                    "message": f"{STATUS_STYLES[estimate.status]['message']} (estimated from {similar})",
+                    "estimated_from": estimate.neighbours}
+        return {"status": "MODERATE", "score": self.unknown_score, **STATUS_STYLES["MODERATE"],
+                "message": UNKNOWN_FOOD_MESSAGE}
+
+    @metrics.timed("get_nutrition_tips")
+    def tips(self, food: str, status: str) -> Dict:
+        defaults = DEFAULT_TIPS.get(status, DEFAULT_TIPS["MODERATE"])
+        row = self.catalogue.lookup(food)
+        if row is not None:
+            info = self.catalogue.nutrition(row)
+            if info["calories"] is not None:
+                return {"calories": round(info["calories"]), "protein": info["protein"],
+                        "carbs": info["carbs"], "fat": info["fat"],
+                        "tips": info["tips"] or defaults["tips"],
+                        "alternatives": info["alternatives"] or defaults["alternatives"]}
+
+        # Unknown foods: blend the nearest catalogue foods, else a typical catalogue serving.
+        estimate = self.estimator.estimate(food)
+        nutrients = estimate.nutrients if estimate is not None else self.typical_nutrients
+        return {"calories": round(nutrients["calories"]), "protein": nutrients["protein"],
+                "carbs": nutrients["carbs"], "fat": nutrients["fat"], **defaults}
+
+    def analyze_with_tips(self, food: str) -> Tuple[Dict, Dict]:
+        analysis = self.analyze(food)
+        return analysis, self.tips(food, analysis["status"])
+
+    def batch_analyses(self, result: BatchResult) -> List[Tuple[Dict, Dict]]:
+        """(analysis, tips) per item of an ``analyze_batch`` result, read from its rows, not looked up again."""
+        catalogue = self.catalogue
+        out = []
+        for i, item in enumerate(result.items):
+            status, score, row = STATUSES[int(result.status_codes[i])], int(result.scores[i]), int(result.rows[i])
+            analysis = {"status": status, "score": score, **STATUS_STYLES[status]}
+            neighbours = result.neighbours[i]
+            if row >= 0 and result.confidence[i] < 1:
+                name = catalogue.name(row)
+                analysis.update(message=f"{analysis['message']} (read as “{name}”, {result.confidence[i]:.0%} match)",
+                                matched_as=name, confidence=float(result.confidence[i]))
+            elif row < 0 and neighbours:
+                similar = ", ".join(name for name, _ in neighbours[:3])
+                analysis.update(message=f"{analysis['message']} (estimated from {similar})", estimated_from=neighbours)
+            elif row < 0:
+                analysis["message"] = UNKNOWN_FOOD_MESSAGE
+
+            values = result.nutrients[i]
+            if np.isnan(values[NUTRIENT_COLUMNS.index("calories")]):
+                nutrients = self.typical_nutrients
+            else:
+                nutrients = {col: round(float(v), 1) for col, v in zip(NUTRIENT_COLUMNS, values)}
+            defaults = DEFAULT_TIPS.get(status, DEFAULT_TIPS["MODERATE"])
+            tips = {"calories": round(nutrients["calories"]), "protein": nutrients["protein"],
+                    "carbs": nutrients["carbs"], "fat": nutrients["fat"], **defaults}
+            if row >= 0 and not result.estimated[i]:
+                info = catalogue.nutrition(row)
+                tips.update(protein=info["protein"], carbs=info["carbs"], fat=info["fat"],
+                            tips=info["tips"] or defaults["tips"],
+                            alternatives=info["alternatives"] or defaults["alternatives"])
+            out.append((analysis, tips))
+        return out
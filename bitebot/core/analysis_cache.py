@@ -0,0 +1,93 @@
+"""
+Process-wide memoisation of food analyses.
+
+Every analysis is a pure function of the food name and the catalogue (and
+model) it was computed from, so results are cached under the normalised
+name in a bounded LRU. The cache is tagged with the catalogue version and
+empties itself when a different version is passed in. ``warm`` precomputes
+entries up front (e.g. every catalogue food and Quick Foods button) so
+repeat lookups are a dict hit. Cached values are shared between sessions
+and must be treated as read-only.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from bitebot.core.matcher import normalize_food_text
+
+DEFAULT_MAX_ENTRIES = 2048
+
+
+class AnalysisCache:
+    def __init__(self, compute: Callable[[str], Any], max_entries: int = DEFAULT_MAX_ENTRIES,
+                 version: Optional[str] = None):
+        self.compute = compute
+        self.max_entries = max_entries
+        self.version = version
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def _check_version(self, version: Optional[str]):
+        if version is not None and version != self.version:
+            if self._entries:
+                self._counters["invalidations"] += 1
+            self._entries.clear()
+            self.version = version
+
+    def get(self, food: str, version: Optional[str] = None):
+        key = normalize_food_text(food)
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return self._entries[key]
+            self._counters["misses"] += 1
+        # Computed outside the lock; two racing misses just compute the same value twice.
+        value = self.compute(key)
+        self._store(key, value)
+        return value
+
+    def peek(self, food: str, version: Optional[str] = None):
+        """The cached value, or None (nothing is computed); a found value counts as a hit."""
+        key = normalize_food_text(food)
+        with self._lock:
+            self._check_version(version)
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return self._entries[key]
+
+    def _store(self, key: str, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def warm(self, foods: Iterable[str], version: Optional[str] = None) -> int:
+        """Precompute entries that are not cached yet; returns how many were added."""
+        added = 0
+        with self._lock:
+            self._check_version(version)
+        for food in foods:
+            key = normalize_food_text(food)
+            if key and key not in self._entries:
+                self._store(key, self.compute(key))
+                added += 1
+        return added
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+            self._counters["invalidations"] += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters, entries=len(self._entries), max_entries=self.max_entries)
@@ -0,0 +1,185 @@
+"""
+Batch analysis of whole menus, receipts and meal plans.
+
+``parse_menu`` splits pasted text into items (one per line, comma, semicolon
+or bullet; a comma between digits is a decimal comma, as in ``RM12,50``) and
+strips prices and quantities such as ``2x`` or ``x3``;
+``parse_menu_csv`` reads the same from an uploaded CSV. ``analyze_batch``
+resolves every distinct item against the catalogue once, then gathers
+statuses, scores and macros for all items with NumPy indexing; only rows
+without a label go through the classifier, in a single ``predict_batch``
+call, and anything still unknown is estimated from its nearest catalogue
+neighbours. The result carries per-item arrays plus meal totals.
+"""
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from bitebot.core.catalogue import NUTRIENT_COLUMNS, STATUSES, FoodCatalogue
+from bitebot.core.estimator import NutritionEstimator
+from bitebot.core.matcher import normalize_food_text
+from bitebot.core.model import FEATURES, HealthModel
+
+MAX_ITEMS = 200
+UNKNOWN_STATUS_CODE = STATUSES.index("MODERATE")
+ITEM_COLUMNS = ("food", "item", "dish", "name")
+QUANTITY_COLUMNS = ("quantity", "qty", "servings", "count")
+
+_ITEM_SPLIT = re.compile(r"(?:[\n;•·+]|(?<!\d),|,(?!\d))+")
+_PRICE = re.compile(r"(?:[$€£¥₹]|\b(?:rm|usd|eur|sgd))\s*\d+(?:[.,]\d+)?|\b\d+[.,]\d{2}\b", re.IGNORECASE)
+_LEADING_QTY = re.compile(r"^(?:[-*\d]+[.)]\s+)?(\d{1,2})\s*[x×]?\s+(?=\D)", re.IGNORECASE)
+_TRAILING_QTY = re.compile(r"\s+[x×]\s*(\d{1,2})$", re.IGNORECASE)
+_LIST_MARKER = re.compile(r"^(?:[-*]|\d+[.)])\s+")
+
+
+class MenuItem(NamedTuple):
+    text: str
+    quantity: int = 1
+
+
+def parse_item(raw: str) -> Optional[MenuItem]:
+    """One menu line to (normalised food text, quantity); None when nothing food-like is left."""
+    text = _PRICE.sub(" ", raw)
+    text = " ".join(text.split()).strip(" -:*")
+    quantity = 1
+    match = _LEADING_QTY.match(text)
+    if match:
+        quantity, text = int(match.group(1)), text[match.end():]
+    else:
+        text = _LIST_MARKER.sub("", text)
+        match = _TRAILING_QTY.search(text)
+        if match:
+            quantity, text = int(match.group(1)), text[:match.start()]
+    text = normalize_food_text(text.strip(" -:*"))
+    if not re.search(r"[^\W\d_]", text):
+        return None
+    return MenuItem(text, max(quantity, 1))
+
+
+def parse_menu(text: str, max_items: int = MAX_ITEMS) -> List[MenuItem]:
+    items = []
+    for raw in _ITEM_SPLIT.split(text or ""):
+        item = parse_item(raw)
+        if item is not None:
+            items.append(item)
+            if len(items) >= max_items:
+                break
+    return items
+
+
+def parse_menu_csv(source, max_items: int = MAX_ITEMS) -> List[MenuItem]:
+    """Items from a CSV: a food/item/dish/name column (else the first), optional quantity column."""
+    import pandas as pd
+
+    frame = pd.read_csv(source, nrows=max_items, dtype=str, keep_default_na=False)
+    if frame.empty:
+        return []
+    columns = {c.strip().lower(): c for c in frame.columns}
+    food_col = next((columns[c] for c in ITEM_COLUMNS if c in columns), frame.columns[0])
+    qty_col = next((columns[c] for c in QUANTITY_COLUMNS if c in columns), None)
+    quantities = (pd.to_numeric(frame[qty_col], errors="coerce").fillna(1).clip(1, 99).astype(int)
+                  if qty_col else pd.Series(1, index=frame.index))
+    items = []
+    for raw, quantity in zip(frame[food_col], quantities):
+        item = parse_item(raw)
+        if item is not None:
+            items.append(MenuItem(item.text, int(quantity) if qty_col else item.quantity))
+    return items
+
+
+class BatchResult:
+    def __init__(self, items: List[MenuItem], rows: np.ndarray, status_codes: np.ndarray,
+                 scores: np.ndarray, nutrients: np.ndarray, estimated: Optional[np.ndarray] = None,
+                 confidence: Optional[np.ndarray] = None,
+                 neighbours: Optional[List[Optional[List[Tuple[str, float]]]]] = None):
+        self.items = items
+        self.rows = rows                    # catalogue row per item, -1 when unmatched
+        self.status_codes = status_codes    # int8 index into STATUSES
+        self.scores = scores                # int8 1-10
+        self.nutrients = nutrients          # (n, len(NUTRIENT_COLUMNS)) per serving, NaN = unknown
+        self.estimated = np.zeros(len(items), dtype=bool) if estimated is None else estimated
+        self.confidence = np.ones(len(items)) if confidence is None else confidence  # < 1 for typo matches
+        self.neighbours = neighbours or [None] * len(items)  # catalogue foods an estimate was built from
+        self.quantities = np.array([item.quantity for item in items], dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def matched(self) -> np.ndarray:
+        return self.rows >= 0
+
+    def statuses(self) -> List[str]:
+        return [STATUSES[c] for c in self.status_codes.tolist()]
+
+    def totals(self) -> Dict:
+        """Meal totals: macros summed over known values (times quantity), servings and score summary."""
+        servings = int(self.quantities.sum())
+        weighted = self.nutrients * self.quantities[:, None]
+        known = ~np.isnan(self.nutrients)
+        totals = {col: round(float(np.nansum(weighted[:, i])), 1) for i, col in enumerate(NUTRIENT_COLUMNS)}
+        totals.update({
+            "items": len(self),
+            "servings": servings,
+            "matched": int(self.matched.sum()),
+            "with_macros": int(known[:, 0].sum()),
+            "estimated": int(self.estimated.sum()),
+            "mean_score": round(float(np.average(self.scores, weights=self.quantities)), 1) if len(self) else 0.0,
+            "status_counts": {s: int(self.quantities[self.status_codes == i].sum()) for i, s in enumerate(STATUSES)},
+        })
+        return totals
+
+
+def analyze_batch(items: Iterable[MenuItem], catalogue: FoodCatalogue, model: Optional[HealthModel] = None,
+                  unknown_score: int = 5, estimator: Optional[NutritionEstimator] = None) -> BatchResult:
+    items = list(items)
+    # Resolve each distinct text once; menus repeat items and quantities a lot.
+    resolved: Dict[str, Tuple[int, float]] = {}
+    for item in items:
+        if item.text not in resolved:
+            resolved[item.text] = catalogue.lookup_match(item.text) or (-1, 0.0)
+    rows = np.array([resolved[item.text][0] for item in items], dtype=np.int64)
+    confidence = np.array([resolved[item.text][1] for item in items], dtype=np.float64)
+    matched = rows >= 0
+    safe = np.where(matched, rows, 0)
+
+    codes = np.where(matched, np.asarray(catalogue.status_codes)[safe], -1).astype(np.int8)
+    scores = np.where(matched, np.asarray(catalogue.scores)[safe], -1).astype(np.int8)
+    nutrients = catalogue.nutrient_matrix(safe) if len(items) else np.empty((0, len(NUTRIENT_COLUMNS)))
+    nutrients[~matched] = np.nan
+
+    # Unlabelled catalogue rows with complete macros are classified in one call.
+    features = nutrients[:, [NUTRIENT_COLUMNS.index(c) for c in FEATURES]]
+    need = matched & ((codes < 0) | (scores < 0)) & ~np.isnan(features).any(axis=1)
+    if model is not None and need.any():
+        predicted_codes, predicted_scores = model.predict_batch(features[need])
+        codes[need] = np.where(codes[need] < 0, predicted_codes, codes[need])
+        scores[need] = np.where(scores[need] < 0, predicted_scores, scores[need])
+
+    unknown = (codes < 0) | (scores < 0)
+    no_macros = np.isnan(nutrients[:, NUTRIENT_COLUMNS.index("calories")])
+    estimated = np.zeros(len(items), dtype=bool)
+    neighbours: List[Optional[List[Tuple[str, float]]]] = [None] * len(items)
+    if estimator is not None:
+        # Still-unknown foods borrow from their nearest catalogue neighbours (once per distinct text).
+        estimates = {}
+        for i in np.flatnonzero(unknown | no_macros).tolist():
+            text = items[i].text
+            if text not in estimates:
+                estimates[text] = estimator.estimate(text)
+            estimate = estimates[text]
+            if estimate is None:
+                continue
+            if unknown[i]:
+                codes[i], scores[i] = STATUSES.index(estimate.status), estimate.score
+                unknown[i] = False
+            if no_macros[i]:
+                nutrients[i] = [np.nan if estimate.nutrients[c] is None else estimate.nutrients[c]
+                                for c in NUTRIENT_COLUMNS]
+            estimated[i] = True
+            neighbours[i] = estimate.neighbours
+
+    codes[unknown] = UNKNOWN_STATUS_CODE
+    scores[unknown] = unknown_score
+    return BatchResult(items, rows, codes, scores, nutrients, estimated, confidence, neighbours)
@@ -0,0 +1,350 @@
+"""
+Columnar, memory-mapped food catalogue.
+
+The source of truth is a CSV (``data/foods.csv``) compiled into a directory of
+NumPy ``.npy`` columns plus string tables (one UTF-8 blob and an offsets
+array per text column). Everything is opened with ``mmap_mode="r"``, so the
+OS page cache is shared by every Streamlit session and worker process and a
+session never copies the catalogue.
+
+Build from the command line (this also trains and saves the health classifier
+for the new catalogue, so serving processes only load it):
+
+    python -m bitebot.core.catalogue build data/foods.csv data/catalogue
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds are not serialised across processes
+    fcntl = None
+
+from bitebot.core.fuzzy import DEFAULT_MIN_CONFIDENCE, FuzzyIndex
+from bitebot.core.matcher import FoodMatcher, normalize_food_text
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_SOURCE = ROOT_DIR / "data" / "foods.csv"
+DEFAULT_DIR = ROOT_DIR / "data" / "catalogue"
+
+FORMAT_VERSION = 1
+STATUSES = ("HEALTHY", "MODERATE", "UNHEALTHY")
+CATEGORY_CODES = {"healthy": 0, "moderate": 1, "unhealthy": 2}
+NUTRIENT_COLUMNS = ("calories", "protein", "carbs", "fat", "sugar")
+LIST_SEPARATOR = "|"
+# Score bands of the labelled catalogue: HEALTHY foods score 8-10, UNHEALTHY ones 1-4 (MODERATE in between).
+HEALTHY_MIN_SCORE = 8
+UNHEALTHY_MAX_SCORE = 4
+
+
+def status_for_score(score: int) -> str:
+    """The status a 1-10 score falls in, using the catalogue's own bands."""
+    if score >= HEALTHY_MIN_SCORE:
+        return "HEALTHY"
+    if score <= UNHEALTHY_MAX_SCORE:
+        return "UNHEALTHY"
+    return "MODERATE"
+
+
+class CatalogueError(Exception):
+    pass
+
+
+class StringTable:
+    """Variable-length strings stored as one UTF-8 blob plus an offsets column."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start, end = int(self._offsets[i]), int(self._offsets[i + 1])
+        return self._blob[start:end].tobytes().decode("utf-8")
+
+    @staticmethod
+    def encode(values: List[str]):
+        encoded = [v.encode("utf-8") for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+        blob = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        return blob, offsets
+
+
+def _split_list(cell: str) -> List[str]:
+    return [part.strip() for part in (cell or "").split(LIST_SEPARATOR) if part.strip()]
+
+
+def _parse_float(cell: str) -> float:
+    cell = (cell or "").strip()
+    return float(cell) if cell else np.nan
+
+
+@contextmanager
+def build_lock(target):
+    """Exclusive lock shared by every process that builds into ``target``'s directory."""
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with open(target.parent / f".{target.name}.lock", "a") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        yield
+
+
+def build_catalogue(source, target) -> Dict:
+    """Compile a foods CSV into the columnar on-disk format. Returns the manifest."""
+    with build_lock(target):
+        return _build_catalogue(Path(source), Path(target))
+
+
+def _build_catalogue(source: Path, target: Path) -> Dict:
+    names: List[str] = []
+    tips: List[str] = []
+    alternatives: List[str] = []
+    status: List[int] = []
+    score: List[int] = []
+    nutrients: Dict[str, List[float]] = {c: [] for c in NUTRIENT_COLUMNS}
+    seen = set()
+
+    with open(source, newline="", encoding="utf-8") as fh:
+        for line_no, row in enumerate(csv.DictReader(fh), start=2):
+            name = normalize_food_text(row.get("name", ""))
+            if not name or name in seen:
+                continue
+            seen.add(name)
+            category = (row.get("category") or "").strip().lower()
+            if category and category not in CATEGORY_CODES:
+                raise CatalogueError(f"{source}:{line_no}: unknown category {category!r}")
+            names.append(name)
+            status.append(CATEGORY_CODES.get(category, -1))
+            raw_score = (row.get("score") or "").strip()
+            score.append(int(raw_score) if raw_score else -1)
+            for col in NUTRIENT_COLUMNS:
+                nutrients[col].append(_parse_float(row.get(col)))
+            tips.append("\n".join(_split_list(row.get("tips"))))
+            alternatives.append("\n".join(_split_list(row.get("alternatives"))))
+
+    if not names:
+        raise CatalogueError(f"{source}: no foods found")
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".catalogue-", dir=target.parent))
+    try:
+        staging.chmod(0o755)  # mkdtemp's 0700 would hide the catalogue from workers running as other users
+        for col, values in (("name", names), ("tips", tips), ("alternatives", alternatives)):
+            blob, offsets = StringTable.encode(values)
+            np.save(staging / f"{col}.blob.npy", blob)
+            np.save(staging / f"{col}.offsets.npy", offsets)
+
+        keys = np.array([n.encode("utf-8") for n in names])
+        order = np.argsort(keys, kind="stable").astype(np.int32)
+        np.save(staging / "name_sorted.npy", keys[order])
+        np.save(staging / "name_order.npy", order)
+
+        np.save(staging / "status.npy", np.array(status, dtype=np.int8))
+        np.save(staging / "score.npy", np.array(score, dtype=np.int8))
+        for col in NUTRIENT_COLUMNS:
+            np.save(staging / f"{col}.npy", np.array(nutrients[col], dtype=np.float32))
+
+        stat = source.stat()
+        digest = hashlib.sha1(source.read_bytes()).hexdigest()
+        manifest = {
+            "format": FORMAT_VERSION,
+            "rows": len(names),
+            "version": digest[:16],
+            "source": str(source),
+            "source_mtime": stat.st_mtime,
+            "source_size": stat.st_size,
+        }
+        (staging / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+        # Swap the finished directory in so readers never see a half-built catalogue.
+        if target.exists():
+            retired = Path(tempfile.mkdtemp(prefix=".retired-", dir=target.parent))
+            os.replace(target, retired / "catalogue")
+            os.replace(staging, target)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging, target)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return manifest
+
+
+class FoodCatalogue:
+    def __init__(self, path):
+        self.path = Path(path)
+        manifest_path = self.path / "manifest.json"
+        if not manifest_path.exists():
+            raise CatalogueError(f"No catalogue at {self.path}; run the builder first.")
+        self.manifest = json.loads(manifest_path.read_text())
+        if self.manifest.get("format") != FORMAT_VERSION:
+            raise CatalogueError(f"Unsupported catalogue format {self.manifest.get('format')!r}")
+
+        def load(name):
+            return np.load(self.path / f"{name}.npy", mmap_mode="r")
+
+        self._names = StringTable(load("name.blob"), load("name.offsets"))
+        self._tips = StringTable(load("tips.blob"), load("tips.offsets"))
+        self._alternatives = StringTable(load("alternatives.blob"), load("alternatives.offsets"))
+        self._sorted_keys = load("name_sorted")
+        self._order = load("name_order")
+        self.status_codes = load("status")
+        self.scores = load("score")
+        self.nutrients = {col: load(col) for col in NUTRIENT_COLUMNS}
+        self._matcher = None
+        self._fuzzy = None
+
+    def __len__(self) -> int:
+        return int(self.manifest["rows"])
+
+    @property
+    def version(self) -> str:
+        return self.manifest["version"]
+
+    @property
+    def matcher(self) -> FoodMatcher:
+        if self._matcher is None:
+            self._matcher = FoodMatcher(self.names())
+        return self._matcher
+
+    def names(self) -> Iterator[str]:
+        for i in range(len(self)):
+            yield self._names[i]
+
+    def name(self, row: int) -> str:
+        return self._names[row]
+
+    def find(self, name: str) -> Optional[int]:
+        """Row id for an exact (normalised) food name, via binary search."""
+        key = normalize_food_text(name).encode("utf-8")
+        if not key or len(key) > self._sorted_keys.dtype.itemsize:
+            return None
+        i = int(np.searchsorted(self._sorted_keys, key))
+        if i < len(self._sorted_keys) and self._sorted_keys[i] == key:
+            return int(self._order[i])
+        return None
+
+    @property
+    def fuzzy(self) -> FuzzyIndex:
+        if self._fuzzy is None:
+            self._fuzzy = FuzzyIndex(self.names())
+        return self._fuzzy
+
+    def lookup(self, text: str) -> Optional[int]:
+        """Row id for free text: exact name, else the most specific name it contains, else a typo match."""
+        match = self.lookup_match(text)
+        return match[0] if match else None
+
+    def lookup_match(self, text: str, min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> Optional[Tuple[int, float]]:
+        """(row id, confidence) as for ``lookup``; confidence is 1.0 unless typo correction was needed."""
+        row = self.find(text)
+        if row is not None:
+            return row, 1.0
+        match = self.matcher.best_match(text)
+        if match:
+            return self.find(match.name), 1.0
+        candidate = self.fuzzy.best(text, min_confidence)
+        return (self.find(candidate.name), candidate.confidence) if candidate else None
+
+    def suggest(self, text: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """Ranked (name, confidence) candidates for a possibly misspelt food name."""
+        return [(c.name, c.confidence) for c in self.fuzzy.candidates(text, limit)]
+
+    def status(self, row: int) -> Optional[str]:
+        code = int(self.status_codes[row])
+        return STATUSES[code] if code >= 0 else None
+
+    def score(self, row: int) -> Optional[int]:
+        value = int(self.scores[row])
+        return value if value >= 0 else None
+
+    def nutrient_matrix(self, rows=None, columns=NUTRIENT_COLUMNS) -> np.ndarray:
+        """``(n, len(columns))`` float matrix for ``rows`` (all rows by default); NaN = unknown."""
+        if rows is None:
+            return np.column_stack([np.asarray(self.nutrients[c]) for c in columns])
+        rows = np.asarray(rows, dtype=np.int64)
+        return np.column_stack([self.nutrients[c][rows] for c in columns])
+
+    def nutrition(self, row: int) -> Dict:
+        """Macros (None when unknown) plus tips and alternatives for one row."""
+        info = {}
+        for col in NUTRIENT_COLUMNS:
+            value = float(self.nutrients[col][row])
+            if np.isnan(value):
+                info[col] = None
+            else:
+                value = round(value, 1)
+                info[col] = int(value) if value.is_integer() else value
+        tips = self._tips[row]
+        alternatives = self._alternatives[row]
+        info["tips"] = tips.split("\n") if tips else []
+        info["alternatives"] = alternatives.split("\n") if alternatives else []
+        return info
+
+
+def _is_stale(path: Path, source: Path) -> bool:
+    manifest_path = path / "manifest.json"
+    if not manifest_path.exists():
+        return True
+    if not source.exists():
+        return False
+    manifest = json.loads(manifest_path.read_text())
+    stat = source.stat()
+    return (manifest.get("format") != FORMAT_VERSION
+            or manifest.get("source_size") != stat.st_size
+            or manifest.get("source_mtime") != stat.st_mtime)
+
+
+def load_catalogue(path=DEFAULT_DIR, source=DEFAULT_SOURCE) -> FoodCatalogue:
+    """Open the compiled catalogue, (re)building it first if the CSV changed."""
+    path, source = Path(path), Path(source)
+    if _is_stale(path, source):
+        with build_lock(path):
+            # Another process may have rebuilt it while we waited for the lock.
+            if _is_stale(path, source):
+                _build_catalogue(source, path)
+    return FoodCatalogue(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bitebot.core.catalogue",
+                                     description="BiteBot food catalogue tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="compile a foods CSV into the mmap catalogue")
+    build.add_argument("source", nargs="?", default=str(DEFAULT_SOURCE))
+    build.add_argument("target", nargs="?", default=str(DEFAULT_DIR))
+    build.add_argument("--model", help="where to save the health classifier (default: models/health_classifier.joblib)")
+    build.add_argument("--no-model", action="store_true", help="skip training the health classifier")
+    info = sub.add_parser("info", help="print a compiled catalogue's manifest")
+    info.add_argument("target", nargs="?", default=str(DEFAULT_DIR))
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        manifest = build_catalogue(args.source, args.target)
+        print(f"Built {manifest['rows']} foods into {args.target} (version {manifest['version']})")
+        if not args.no_model:
+            from bitebot.core.model import DEFAULT_MODEL_PATH, train
+
+            output = args.model or DEFAULT_MODEL_PATH
+            train(FoodCatalogue(args.target)).save(output)
+            print(f"Trained the health classifier into {output}")
+    else:
+        print(json.dumps(FoodCatalogue(args.target).manifest, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Deterministic nutrition estimates for foods outside the catalogue.
+
+Catalogue names are embedded once with character n-gram TF-IDF (2-4 grams
+within word boundaries, sublinear tf, smoothed IDF, L2-normalised; the same
+weighting as scikit-learn's ``TfidfVectorizer(analyzer="char_wb")``), so
+"chicken rice" lands next to "chicken" and "fried rice". The index is a
+plain n-gram -> (rows, weights) posting list in NumPy, which keeps
+scikit-learn and SciPy out of the app's import path. A query only touches
+the postings of its own n-grams; the ``k`` most similar rows are blended,
+weighted by cosine similarity, into macros and a 1-10 score; the status is
+the catalogue band that score falls in, so the two never disagree. Weak
+neighbours (below ``min_similarity``) are ignored, and a food with none
+left gets no estimate. The same name always gives the same estimate.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from bitebot.core.catalogue import NUTRIENT_COLUMNS, FoodCatalogue, status_for_score
+from bitebot.core.matcher import normalize_food_text
+
+DEFAULT_K = 5
+DEFAULT_MIN_SIMILARITY = 0.5  # below this, names share only stray n-grams ("hot dog" ~ "donut" at 0.36)
+NGRAM_RANGE = (2, 4)
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = NGRAM_RANGE) -> Iterable[str]:
+    """Character n-grams inside space-padded words (scikit-learn's ``char_wb`` analyzer)."""
+    low, high = ngram_range
+    for word in text.split():
+        word = f" {word} "
+        for n in range(low, high + 1):
+            if len(word) <= n:
+                yield word  # a short word counts once, however many sizes it is short for
+                break
+            for i in range(len(word) - n + 1):
+                yield word[i:i + n]
+
+
+class Estimate(NamedTuple):
+    status: str
+    score: int
+    nutrients: Dict[str, Optional[float]]
+    neighbours: List[Tuple[str, float]]  # (catalogue name, cosine similarity), most similar first
+
+    @property
+    def similarity(self) -> float:
+        return self.neighbours[0][1]
+
+
+class NutritionEstimator:
+    def __init__(self, catalogue: FoodCatalogue, k: int = DEFAULT_K,
+                 min_similarity: float = DEFAULT_MIN_SIMILARITY):
+        self.k = k
+        self.min_similarity = min_similarity
+        self.catalogue_version = catalogue.version
+        # Only rows with known calories are useful neighbours.
+        nutrients = catalogue.nutrient_matrix()
+        self.rows = np.flatnonzero(~np.isnan(nutrients[:, NUTRIENT_COLUMNS.index("calories")]))
+        self.names = [catalogue.name(int(r)) for r in self.rows]
+        self.nutrients = nutrients[self.rows]
+        self.scores = np.asarray(catalogue.scores)[self.rows].astype(np.float64)
+        self._fit([Counter(char_ngrams(name)) for name in self.names])
+
+    def _fit(self, docs: List[Counter]):
+        self.vocabulary: Dict[str, int] = {}
+        for doc in docs:
+            for gram in doc:
+                self.vocabulary.setdefault(gram, len(self.vocabulary))
+        df = np.zeros(len(self.vocabulary))
+        for doc in docs:
+            df[[self.vocabulary[g] for g in doc]] += 1
+        self.idf = np.log((1 + len(docs)) / (1 + df)) + 1
+
+        # Postings stored feature-major: the rows (and weights) of feature j are at indptr[j]:indptr[j+1].
+        features, rows, weights = [], [], []
+        for row, doc in enumerate(docs):
+            ids = np.fromiter((self.vocabulary[g] for g in doc), dtype=np.int64, count=len(doc))
+            w = (1 + np.log(np.fromiter(doc.values(), dtype=np.float64, count=len(doc)))) * self.idf[ids]
+            features.append(ids)
+            rows.append(np.full(len(ids), row))
+            weights.append(w / np.sqrt(w @ w))
+        features = np.concatenate(features) if docs else np.empty(0, dtype=np.int64)
+        order = np.argsort(features, kind="stable")
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(features, minlength=len(self.vocabulary)))])
+        self.posting_rows = np.concatenate(rows)[order] if docs else np.empty(0, dtype=np.int64)
+        self.posting_weights = np.concatenate(weights)[order] if docs else np.empty(0)
+
+    def _embed(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Sparse query vector (feature ids, weights) with the fitted vocabulary and IDF."""
+        counts: Dict[int, int] = {}
+        for gram in char_ngrams(text):
+            j = self.vocabulary.get(gram)
+            if j is not None:
+                counts[j] = counts.get(j, 0) + 1
+        ids = np.fromiter(counts, dtype=np.int64, count=len(counts))
+        weights = (1 + np.log(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)))) * self.idf[ids]
+        norm = np.sqrt(weights @ weights)
+        return ids, (weights / norm if norm else weights)
+
+    def neighbours(self, text: str, k: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(index into ``self.rows``, similarity) of the k most similar known foods."""
+        text = normalize_food_text(text)
+        if not self.names or not text:
+            return []
+        ids, weights = self._embed(text)
+        if not len(ids):
+            return []
+        sims = np.zeros(len(self.names))
+        for j, w in zip(ids, weights):
+            lo, hi = self.indptr[j], self.indptr[j + 1]
+            sims[self.posting_rows[lo:hi]] += self.posting_weights[lo:hi] * w
+        k = min(k or self.k, len(sims))
+        top = np.argpartition(-sims, k - 1)[:k]
+        # Stable order: similarity descending, then catalogue order, so ties never flip.
+        top = top[np.lexsort((top, -sims[top]))]
+        return [(int(i), float(sims[i])) for i in top if sims[i] >= self.min_similarity]
+
+    def estimate(self, text: str) -> Optional[Estimate]:
+        found = self.neighbours(text)
+        if not found:
+            return None
+        idx = np.array([i for i, _ in found])
+        weights = np.array([s for _, s in found])
+
+        values = self.nutrients[idx]
+        known = ~np.isnan(values)
+        totals = (np.nan_to_num(values) * weights[:, None]).sum(axis=0)
+        norms = (known * weights[:, None]).sum(axis=0)
+        nutrients = {col: (round(float(totals[i] / norms[i]), 1) if norms[i] else None)
+                     for i, col in enumerate(NUTRIENT_COLUMNS)}
+
+        scores = self.scores[idx]
+        scored = scores >= 0
+        score = int(np.clip(np.rint(np.average(scores[scored], weights=weights[scored])), 1, 10)) if scored.any() else 5
+        return Estimate(status_for_score(score), score, nutrients, [(self.names[i], round(s, 3)) for i, s in found])
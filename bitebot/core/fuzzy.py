@@ -0,0 +1,127 @@
+"""
+Typo-tolerant food name lookup.
+
+A SymSpell-style deletion dictionary is built once over the words that make
+up catalogue names: every word is stored under all strings reachable by
+deleting up to ``max_distance`` characters (one for short words). A query
+word is corrected by generating its own deletes and looking them up, so
+only a handful of real vocabulary words ever reach the exact edit-distance
+check, whatever the catalogue size.
+
+Names are then ranked by how cheaply their words can be found among the
+corrected query words: ``confidence`` is 1 minus the edit cost over the
+name's length, and names with missing words are penalised by those words'
+full length. "chiken breast" -> "chicken breast" (0.92), "brocoli" ->
+"broccoli" (0.88); extra query words ("nasi lemak ayam goreng") cost
+nothing, so the most complete name wins.
+"""
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from bitebot.core.matcher import normalize_food_text
+
+DEFAULT_MAX_DISTANCE = 2
+DEFAULT_MIN_CONFIDENCE = 0.75
+SHORT_WORD = 4  # words this long or shorter tolerate a single edit
+
+
+class FuzzyCandidate(NamedTuple):
+    name: str
+    confidence: float
+    distance: int
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent swaps count once); ``limit + 1`` when over ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                cur[j] = min(cur[j], prev2[j - 2] + 1)
+        if min(cur) > limit:
+            return limit + 1
+        prev2, prev = prev, cur
+    return prev[-1] if prev[-1] <= limit else limit + 1
+
+
+def _deletes(word: str, distance: int) -> Set[str]:
+    out = {word}
+    for d in range(1, min(distance, len(word) - 1) + 1):
+        for positions in combinations(range(len(word)), d):
+            out.add("".join(c for i, c in enumerate(word) if i not in positions))
+    return out
+
+
+class FuzzyIndex:
+    def __init__(self, names: Iterable[str], max_distance: int = DEFAULT_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.names: List[str] = []
+        self._name_words: List[Tuple[str, ...]] = []
+        self._names_by_word: Dict[str, List[int]] = defaultdict(list)
+        self._deletes: Dict[str, List[str]] = defaultdict(list)
+
+        seen = set()
+        for raw in names:
+            name = normalize_food_text(raw)
+            if not name or name in seen:
+                continue
+            seen.add(name)
+            words = tuple(name.split())
+            for word in set(words):
+                if word not in self._names_by_word:
+                    for key in _deletes(word, self._word_distance(word)):
+                        self._deletes[key].append(word)
+                self._names_by_word[word].append(len(self.names))
+            self.names.append(name)
+            self._name_words.append(words)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _word_distance(self, word: str) -> int:
+        return min(self.max_distance, 1 if len(word) <= SHORT_WORD else self.max_distance)
+
+    def correct_word(self, token: str) -> List[Tuple[str, int]]:
+        """Vocabulary words within edit distance of ``token``, closest first."""
+        if token in self._names_by_word:
+            return [(token, 0)]
+        limit = self._word_distance(token)
+        found: Dict[str, int] = {}
+        for key in _deletes(token, limit):
+            for word in self._deletes.get(key, ()):
+                if word not in found:
+                    found[word] = edit_distance(token, word, min(limit, self._word_distance(word)))
+        return sorted(((w, d) for w, d in found.items() if d <= min(limit, self._word_distance(w))),
+                      key=lambda wd: (wd[1], wd[0]))
+
+    def candidates(self, text: str, limit: int = 5) -> List[FuzzyCandidate]:
+        """Catalogue names ranked by confidence (then by more matched words, then catalogue order)."""
+        tokens = normalize_food_text(text).split()
+        best_cost: Dict[str, int] = {}  # vocabulary word -> cheapest query token reaching it
+        for token in tokens:
+            for word, distance in self.correct_word(token):
+                if distance < best_cost.get(word, distance + 1):
+                    best_cost[word] = distance
+        name_ids = {i for word in best_cost for i in self._names_by_word[word]}
+
+        ranked = []
+        for i in name_ids:
+            words = self._name_words[i]
+            cost = sum(best_cost.get(w, len(w)) for w in words)
+            length = sum(len(w) for w in words)
+            matched = sum(w in best_cost for w in words)
+            confidence = max(0.0, 1 - cost / length)
+            ranked.append((-confidence, -matched, i, FuzzyCandidate(self.names[i], round(confidence, 3), cost)))
+        ranked.sort()
+        return [c for *_, c in ranked[:limit]]
+
+    def best(self, text: str, min_confidence: float = DEFAULT_MIN_CONFIDENCE) -> Optional[FuzzyCandidate]:
+        found = self.candidates(text, limit=1)
+        return found[0] if found and found[0].confidence >= min_confidence else None
@@ -0,0 +1,127 @@
+"""
+Multi-pattern food name matcher.
+
+An Aho-Corasick automaton is compiled once over every known food name, so a
+query is a single left-to-right pass over the input no matter how many names
+the catalogue holds. Only whole words count: a name must start and end on
+a word boundary (a plural "s"/"es" may follow), so "apple" is not found in
+"pineapple" nor "cake" in "pancake". All occurrences are reported; callers
+normally want ``best_match`` (longest, then leftmost) so "dark chocolate"
+wins over "chocolate".
+"""
+from collections import deque
+from typing import Iterable, List, NamedTuple, Optional
+
+
+class FoodMatch(NamedTuple):
+    name: str
+    start: int
+    end: int
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+
+def _word_end(text: str, end: int) -> bool:
+    """True when ``end`` closes a word in ``text``, allowing a plural suffix ("apples", "peaches")."""
+    for suffix in ("", "s", "es"):
+        stop = end + len(suffix)
+        if text.startswith(suffix, end) and (stop == len(text) or not text[stop].isalnum()):
+            return True
+    return False
+
+
+def normalize_food_text(text: str) -> str:
+    """Lower-case and collapse whitespace so patterns and queries line up."""
+    return " ".join((text or "").lower().split())
+
+
+class FoodMatcher:
+    def __init__(self, names: Iterable[str]):
+        # Node tables are parallel lists indexed by node id (0 is the root).
+        self._goto: List[dict] = [{}]
+        self._fail: List[int] = [0]
+        self._word: List[int] = [-1]   # pattern id ending exactly at this node
+        self._dict: List[int] = [0]    # nearest proper suffix node that ends a pattern
+        self.names: List[str] = []
+
+        seen = set()
+        for raw in names:
+            name = normalize_food_text(raw)
+            if not name or name in seen:
+                continue
+            seen.add(name)
+            self._insert(name, len(self.names))
+            self.names.append(name)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _insert(self, name: str, pattern_id: int):
+        node = 0
+        for ch in name:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._word.append(-1)
+                self._dict.append(0)
+            node = nxt
+        self._word[node] = pattern_id
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                fail = self._fail[child]
+                self._dict[child] = fail if self._word[fail] >= 0 else self._dict[fail]
+
+    def find_all(self, text: str) -> List[FoodMatch]:
+        """Every catalogue name occurring as whole words in ``text``, in order of end position."""
+        text = normalize_food_text(text)
+        goto, fail, word, dict_link, names = self._goto, self._fail, self._word, self._dict, self.names
+        matches = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            out = node if word[node] >= 0 else dict_link[node]
+            while out:
+                name = names[word[out]]
+                start = i + 1 - len(name)
+                if (start == 0 or not text[start - 1].isalnum()) and _word_end(text, i + 1):
+                    matches.append(FoodMatch(name, start, i + 1))
+                out = dict_link[out]
+        return matches
+
+    def best_match(self, text: str) -> Optional[FoodMatch]:
+        """The most specific match: longest name, ties broken by earliest position."""
+        best = None
+        for m in self.find_all(text):
+            if best is None or m.length > best.length or (m.length == best.length and m.start < best.start):
+                best = m
+        return best
+
+    def resolve(self, text: str) -> List[FoodMatch]:
+        """Non-overlapping matches, preferring longer names, in reading order."""
+        chosen: List[FoodMatch] = []
+        taken = set()
+        for m in sorted(self.find_all(text), key=lambda m: (-m.length, m.start)):
+            span = range(m.start, m.end)
+            if any(i in taken for i in span):
+                continue
+            taken.update(span)
+            chosen.append(m)
+        return sorted(chosen, key=lambda m: m.start)
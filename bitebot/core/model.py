@@ -0,0 +1,141 @@
+"""
+Logistic Regression food health classifier.
+
+Trained on the labelled catalogue rows over calories, fat, sugar, carbs and
+protein. ``predict_batch`` scores a whole ``(n, 5)`` nutrient matrix in one
+vectorised call and returns status codes (indices into ``STATUSES``) plus a
+1-10 nutrition score derived from the class probabilities.
+
+The artifact is built offline next to the catalogue
+(``python -m bitebot.core.catalogue build``) or on its own:
+
+    python -m bitebot.core.model train
+
+scikit-learn and joblib are imported on first load or training only, so
+importing this module stays cheap.
+"""
+import argparse
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from bitebot.core.catalogue import ROOT_DIR, STATUSES, FoodCatalogue, load_catalogue
+
+DEFAULT_MODEL_PATH = ROOT_DIR / "models" / "health_classifier.joblib"
+FEATURES = ("calories", "fat", "sugar", "carbs", "protein")
+
+
+class HealthModel:
+    def __init__(self, pipeline, class_scores: np.ndarray, catalogue_version: str = ""):
+        self.pipeline = pipeline
+        # Mean labelled score of each status, used to turn probabilities into a 1-10 score.
+        self.class_scores = np.asarray(class_scores, dtype=np.float64)
+        self.catalogue_version = catalogue_version
+
+    def predict_batch(self, nutrient_matrix) -> Tuple[np.ndarray, np.ndarray]:
+        """Status codes and int8 scores for every row of a ``(n, len(FEATURES))`` matrix."""
+        X = np.nan_to_num(np.asarray(nutrient_matrix, dtype=np.float64).reshape(-1, len(FEATURES)))
+        if not len(X):
+            return np.empty(0, dtype=np.int8), np.empty(0, dtype=np.int8)
+        proba = self.pipeline.predict_proba(X)
+        codes = self.pipeline.classes_[proba.argmax(axis=1)].astype(np.int8)
+        expected = proba @ self.class_scores[self.pipeline.classes_]
+        scores = np.clip(np.rint(expected), 1, 10).astype(np.int8)
+        return codes, scores
+
+    def predict_one(self, nutrients) -> Tuple[str, int]:
+        codes, scores = self.predict_batch([nutrients])
+        return STATUSES[int(codes[0])], int(scores[0])
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        """Write the artifact to a temp file and rename it over ``path``, so readers never see half of it."""
+        import joblib
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.stem}-", suffix=path.suffix, dir=path.parent)
+        try:
+            os.chmod(tmp, 0o644)  # mkstemp's 0600 would hide the artifact from workers running as other users
+            with os.fdopen(fd, "wb") as fh:
+                joblib.dump({"pipeline": self.pipeline, "class_scores": self.class_scores,
+                             "features": FEATURES, "catalogue_version": self.catalogue_version}, fh)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+
+def train(catalogue: FoodCatalogue) -> HealthModel:
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import FunctionTransformer, StandardScaler
+
+    X = catalogue.nutrient_matrix(columns=FEATURES)
+    y = np.asarray(catalogue.status_codes)
+    scores = np.asarray(catalogue.scores)
+    labelled = (y >= 0) & ~np.isnan(X).any(axis=1)
+    X, y, scores = X[labelled], y[labelled], scores[labelled]
+    if len(np.unique(y)) < 2:
+        raise ValueError("Need at least two labelled health classes to train the classifier.")
+
+    pipeline = make_pipeline(FunctionTransformer(np.log1p), StandardScaler(),
+                             LogisticRegression(max_iter=1000))
+    pipeline.fit(X, y)
+
+    class_scores = np.full(len(STATUSES), 5.0)
+    for code in range(len(STATUSES)):
+        mask = (y == code) & (scores >= 0)
+        if mask.any():
+            class_scores[code] = scores[mask].mean()
+    return HealthModel(pipeline, class_scores, catalogue.version)
+
+
+def load_model(path=DEFAULT_MODEL_PATH, catalogue: Optional[FoodCatalogue] = None) -> HealthModel:
+    """Load the joblib artifact built offline with the catalogue.
+
+    When it is missing or was built from another catalogue, a model is trained in memory
+    instead and saved on a best-effort basis; read-only deployments just keep the in-memory one.
+    """
+    path = Path(path)
+    catalogue = catalogue or load_catalogue()
+    if path.exists():
+        try:
+            import joblib
+
+            artifact = joblib.load(path)
+            if (tuple(artifact.get("features", ())) == FEATURES
+                    and artifact.get("catalogue_version") == catalogue.version):
+                return HealthModel(artifact["pipeline"], artifact["class_scores"],
+                                   artifact["catalogue_version"])
+        except Exception:
+            pass  # unreadable or from an incompatible scikit-learn; retrain below
+    model = train(catalogue)
+    try:
+        model.save(path)
+    except OSError:
+        pass
+    return model
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bitebot.core.model",
+                                     description="BiteBot health classifier tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmd = sub.add_parser("train", help="train on the catalogue and save the joblib artifact")
+    cmd.add_argument("--output", default=str(DEFAULT_MODEL_PATH))
+    args = parser.parse_args(argv)
+
+    catalogue = load_catalogue()
+    model = train(catalogue)
+    model.save(args.output)
+    codes, _ = model.predict_batch(catalogue.nutrient_matrix(columns=FEATURES))
+    labelled = np.asarray(catalogue.status_codes) >= 0
+    accuracy = float((codes[labelled] == np.asarray(catalogue.status_codes)[labelled]).mean())
+    print(f"Trained on {int(labelled.sum())} foods, training accuracy {accuracy:.0%}, saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Process-wide timings and counters.
+
+Stages are timed with ``timer("name")`` (context manager) or ``@timed("name")``
+(decorator). Each stage keeps a count, a running sum, cumulative buckets in
+the Prometheus layout and a ring of recent samples for p50/p95/p99.
+Counters are plain monotonically increasing integers.
+
+``REGISTRY`` is shared by every session in the process. ``to_prometheus``
+renders the text exposition format; ``FileExporter`` periodically writes it
+(``*.prom``, replaced atomically) or appends a JSON snapshot per line
+(anything else) to a local file for offline comparison between runs.
+"""
+import functools
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Deque, Dict, Optional
+
+import numpy as np
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEFAULT_SAMPLES = 2048
+PREFIX = "bitebot"
+
+
+class Histogram:
+    def __init__(self, samples: int = DEFAULT_SAMPLES):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.recent: Deque[float] = deque(maxlen=samples)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+    def summary(self) -> Dict[str, float]:
+        p50 = p95 = p99 = 0.0
+        if self.recent:
+            p50, p95, p99 = np.percentile(np.fromiter(self.recent, dtype=np.float64), (50, 95, 99))
+        return {"count": self.count, "mean_ms": 1000 * self.total / self.count if self.count else 0.0,
+                "p50_ms": 1000 * float(p50), "p95_ms": 1000 * float(p95), "p99_ms": 1000 * float(p99),
+                "max_ms": 1000 * self.max}
+
+
+class MetricsRegistry:
+    def __init__(self, samples: int = DEFAULT_SAMPLES):
+        self.samples = samples
+        self.histograms: Dict[str, Histogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            hist = self.histograms.get(stage)
+            if hist is None:
+                hist = self.histograms[stage] = Histogram(self.samples)
+            hist.observe(seconds)
+
+    def inc(self, counter: str, amount: int = 1):
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    @contextmanager
+    def timer(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+
+    def timed(self, stage: Optional[str] = None) -> Callable:
+        def decorate(fn):
+            name = stage or fn.__name__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {"time": time.time(), "uptime_s": round(time.time() - self.started_at, 1),
+                    "stages": {name: {k: round(v, 3) for k, v in h.summary().items()}
+                               for name, h in sorted(self.histograms.items())},
+                    "counters": dict(sorted(self.counters.items()))}
+
+    def to_prometheus(self) -> str:
+        lines = [f"# HELP {PREFIX}_stage_seconds Time spent per instrumented stage.",
+                 f"# TYPE {PREFIX}_stage_seconds histogram"]
+        with self._lock:
+            for name, h in sorted(self.histograms.items()):
+                for bound, n in zip(BUCKETS, h.buckets):
+                    lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {n}')
+                lines.append(f'{PREFIX}_stage_seconds_bucket{{stage="{name}",le="+Inf"}} {h.count}')
+                lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{name}"}} {h.total:.6f}')
+                lines.append(f'{PREFIX}_stage_seconds_count{{stage="{name}"}} {h.count}')
+            for name, value in sorted(self.counters.items()):
+                metric = f"{PREFIX}_{name}_total"
+                lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.started_at = time.time()
+
+
+class FileExporter:
+    """Writes the registry to ``path`` at most once per ``interval`` seconds."""
+
+    def __init__(self, registry: MetricsRegistry, path, interval: float = 10.0):
+        self.registry = registry
+        self.path = Path(path)
+        self.interval = interval
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def maybe_export(self) -> bool:
+        now = time.monotonic()
+        if now - self._last < self.interval or not self._lock.acquire(blocking=False):
+            return False
+        try:
+            self._last = now
+            self.export()
+            return True
+        finally:
+            self._lock.release()
+
+    def export(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.suffix == ".prom":
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as fh:
+                fh.write(self.registry.to_prometheus())
+            os.replace(tmp, self.path)
+        else:
+            with open(self.path, "a") as fh:
+                fh.write(json.dumps(self.registry.snapshot()) + "\n")
+
+
+REGISTRY = MetricsRegistry()
+timer = REGISTRY.timer
+timed = REGISTRY.timed
+observe = REGISTRY.observe
+inc = REGISTRY.inc
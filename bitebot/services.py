@@ -0,0 +1,104 @@
+"""
+Builders for the process-wide services, configured from ``BITEBOT_*`` environment variables.
+
+The Streamlit app wraps each one in ``st.cache_resource``
+(``bitebot.ui.resources``); the HTTP API (``bitebot.api``) builds one of
+each per worker process. Either way every front end reads the same
+settings.
+"""
+import os
+from itertools import islice
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from bitebot import metrics
+from bitebot.ai.context import ChatContext
+from bitebot.ai.executor import RequestExecutor
+from bitebot.ai.llm import ModelRegistry, make_backend
+from bitebot.ai.providers import SYSTEM_PROMPT, ChatRouter, LocalProvider
+from bitebot.ai.resilience import CircuitBreaker, ResilientCaller, RetryPolicy, TokenBucket
+from bitebot.ai.response_cache import MemoryBackend, ResponseCache, SQLiteBackend
+from bitebot.core.analysis import FoodAnalyzer
+from bitebot.core.analysis_cache import AnalysisCache
+from bitebot.core.catalogue import FoodCatalogue, load_catalogue
+from bitebot.storage.food_log import DEFAULT_DB_PATH, SQLiteLogStore
+from bitebot.storage.session_store import MemorySessionBackend, SessionStore, SQLiteSessionBackend
+
+env = os.environ.get
+
+
+def build_log_store() -> Optional[SQLiteLogStore]:
+    # Food history persists in an append-only SQLite (WAL) file; set BITEBOT_FOOD_LOG_DB="" to keep it in memory.
+    path = env("BITEBOT_FOOD_LOG_DB", str(DEFAULT_DB_PATH))
+    return SQLiteLogStore(path) if path else None
+
+
+def build_session_store() -> SessionStore:
+    # Chat transcripts and AI context per user id; BITEBOT_SESSION_DB defaults to the food log database,
+    # so every worker sharing that file also shares session state. "" keeps it in this process.
+    path = env("BITEBOT_SESSION_DB", env("BITEBOT_FOOD_LOG_DB", str(DEFAULT_DB_PATH)))
+    return SessionStore(SQLiteSessionBackend(path) if path else MemorySessionBackend())
+
+
+def build_catalogue() -> FoodCatalogue:
+    # Opened once per process; the mmap'd columns are shared by every session.
+    catalogue = load_catalogue()
+    _ = catalogue.matcher  # compile the name automaton before the first query
+    _ = catalogue.fuzzy    # and the typo-tolerant deletion index
+    return catalogue
+
+
+def build_analysis_cache(analyzer: FoodAnalyzer, extra_foods: Iterable[str] = ()) -> AnalysisCache:
+    # Warmed with the extra names (e.g. Quick Foods) and the first BITEBOT_ANALYSIS_CACHE_WARM catalogue
+    # foods, never more than the cache holds, so startup cost doesn't grow with the catalogue.
+    catalogue = analyzer.catalogue
+    size = int(env("BITEBOT_ANALYSIS_CACHE_SIZE", 2048))
+    budget = min(size, int(env("BITEBOT_ANALYSIS_CACHE_WARM", 256)))
+    extra = list(extra_foods)[:budget]
+    cache = AnalysisCache(analyzer.analyze_with_tips, size)
+    # Extra names go last so they are the most recently used entries.
+    cache.warm(list(islice(catalogue.names(), budget - len(extra))) + extra, catalogue.version)
+    return cache
+
+
+def build_model_registry(api_key: Optional[str], backend_name: Optional[str] = None) -> ModelRegistry:
+    return ModelRegistry(make_backend(backend_name), api_key)
+
+
+def build_response_cache() -> ResponseCache:
+    # Point BITEBOT_RESPONSE_CACHE at a file to share answers across workers too.
+    path = env("BITEBOT_RESPONSE_CACHE")
+    return ResponseCache(SQLiteBackend(path) if path else MemoryBackend())
+
+
+def build_ai_executor() -> RequestExecutor:
+    return RequestExecutor(max_workers=int(env("BITEBOT_AI_WORKERS", 8)),
+                           max_queue=int(env("BITEBOT_AI_QUEUE", 64)),
+                           default_timeout=float(env("BITEBOT_AI_TIMEOUT", 60)))
+
+
+def build_gemini_guard() -> ResilientCaller:
+    # One rate limit and one circuit breaker for every Gemini call in the process.
+    return ResilientCaller(
+        RetryPolicy(attempts=int(env("BITEBOT_GEMINI_ATTEMPTS", 3))),
+        CircuitBreaker(failure_threshold=int(env("BITEBOT_BREAKER_FAILURES", 5)),
+                       reset_timeout=float(env("BITEBOT_BREAKER_RESET", 30))),
+        TokenBucket(rate=float(env("BITEBOT_GEMINI_RPS", 2)), capacity=int(env("BITEBOT_GEMINI_BURST", 10))))
+
+
+def build_chat_router(catalogue: FoodCatalogue, analyze: Callable[[str], Tuple[Dict, Dict]]) -> ChatRouter:
+    # Offline answers over the shared catalogue; BITEBOT_LOCAL_ROUTING=0 sends everything to Gemini.
+    return ChatRouter(LocalProvider(catalogue, analyze), enabled=env("BITEBOT_LOCAL_ROUTING", "1") != "0")
+
+
+def build_chat_context(data: Optional[Dict] = None) -> ChatContext:
+    """A fresh Gemini conversation context, or one restored from ``ChatContext.to_dict`` data."""
+    settings = {"token_budget": int(env("BITEBOT_CONTEXT_TOKENS", 2048))}
+    if data is not None:
+        return ChatContext.from_dict(data, SYSTEM_PROMPT, **settings)
+    return ChatContext(SYSTEM_PROMPT, **settings)
+
+
+def build_metrics_exporter() -> Optional[metrics.FileExporter]:
+    # BITEBOT_METRICS_FILE: *.prom is rewritten in Prometheus text format, anything else gets JSON lines.
+    path = env("BITEBOT_METRICS_FILE")
+    return metrics.FileExporter(metrics.REGISTRY, path, float(env("BITEBOT_METRICS_INTERVAL", 10))) if path else None
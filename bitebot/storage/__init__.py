@@ -0,0 +1 @@
+"""Per-user food history storage and the aggregates derived from it."""
@@ -0,0 +1,71 @@
+"""
+Running aggregates over a user's food history.
+
+``FoodLogStats`` is updated in O(1) (O(k) for the top-k list) as each food is
+logged, so the Quick Stats header and the dashboard read counters instead
+of re-scanning the log or rebuilding a DataFrame on every rerun.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Tuple
+
+DEFAULT_TOP_K = 10
+
+
+class FoodLogStats:
+    def __init__(self, top_k: int = DEFAULT_TOP_K):
+        self.top_k = top_k
+        self.total = 0
+        self.score_sum = 0
+        self.status_counts: Counter = Counter()
+        self.status_score_sums: Counter = Counter()
+        self.food_counts: Counter = Counter()
+        # Kept sorted by (-count, first_seen) so ties keep first-logged order.
+        self._top: List[str] = []
+        self._first_seen: Dict[str, int] = {}
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Mapping], top_k: int = DEFAULT_TOP_K) -> "FoodLogStats":
+        stats = cls(top_k)
+        for e in entries:
+            stats.add(e["food"], e["status"], e["score"])
+        return stats
+
+    def add(self, food: str, status: str, score: int):
+        self.total += 1
+        self.score_sum += score
+        self.status_counts[status] += 1
+        self.status_score_sums[status] += score
+        self.food_counts[food] += 1
+        self._first_seen.setdefault(food, self.total)
+        self._bump_top(food)
+
+    def _rank(self, food: str) -> Tuple[int, int]:
+        return -self.food_counts[food], self._first_seen[food]
+
+    def _bump_top(self, food: str):
+        top = self._top
+        if food not in top:
+            if len(top) < self.top_k:
+                top.append(food)
+            elif self._rank(food) < self._rank(top[-1]):
+                top[-1] = food
+            else:
+                return
+        # Counts only ever grow by one, so a single bubble towards the front restores order.
+        i = top.index(food)
+        while i > 0 and self._rank(top[i]) < self._rank(top[i - 1]):
+            top[i], top[i - 1] = top[i - 1], top[i]
+            i -= 1
+
+    def top_foods(self, k: int = None) -> List[Tuple[str, int]]:
+        return [(f, self.food_counts[f]) for f in self._top[:k or self.top_k]]
+
+    def count(self, status: str) -> int:
+        return self.status_counts[status]
+
+    @property
+    def mean_score(self) -> float:
+        return self.score_sum / self.total if self.total else 0.0
+
+    def mean_score_by_status(self) -> Dict[str, float]:
+        return {s: self.status_score_sums[s] / n for s, n in self.status_counts.items() if n}
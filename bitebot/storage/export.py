@@ -0,0 +1,130 @@
+"""
+Chunked exports of a ``FoodLog`` to CSV, NDJSON or Parquet.
+
+Rows are serialised ``chunk_rows`` at a time straight into a temporary
+file, so peak memory depends on the chunk size rather than the history
+length. ``ExportCache`` keeps the finished files keyed by the log's
+version, format and date range: an unchanged history is never serialised
+twice, and nothing is serialised until someone actually downloads.
+"""
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from bitebot.storage.food_log import FoodLog
+
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_MAX_FILES = 16
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def iter_frames(log: FoodLog, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """DataFrames of at most ``chunk_rows`` rows, newest entries first."""
+    rows = log.range_slice(start, end)
+    for hi in range(rows.stop, rows.start, -chunk_rows):
+        yield log.take(slice(max(rows.start, hi - chunk_rows), hi)).iloc[::-1]
+
+
+def iter_csv(log: FoodLog, start=None, end=None, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    header = True
+    for frame in iter_frames(log, start, end, chunk_rows):
+        yield frame.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+    if header:  # empty range: still emit the header row
+        yield log.take([]).to_csv(index=False).encode("utf-8")
+
+
+def iter_ndjson(log: FoodLog, start=None, end=None, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    for frame in iter_frames(log, start, end, chunk_rows):
+        yield frame.to_json(orient="records", lines=True, date_format="iso").encode("utf-8")
+
+
+def write_parquet(log: FoodLog, path, start=None, end=None, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    """One Parquet row group per chunk, written with pyarrow's streaming ParquetWriter."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for frame in iter_frames(log, start, end, chunk_rows):
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(str(path), table.schema)
+            writer.write_table(table)
+        if writer is None:
+            pq.write_table(pa.Table.from_pandas(log.take([]), preserve_index=False), str(path))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def export_to_file(log: FoodLog, fmt: str, path, start=None, end=None, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}; choose from {sorted(EXPORT_FORMATS)}")
+    if fmt == "parquet":
+        write_parquet(log, path, start, end, chunk_rows)
+        return
+    chunks = iter_csv if fmt == "csv" else iter_ndjson
+    with open(path, "wb") as fh:
+        for chunk in chunks(log, start, end, chunk_rows):
+            fh.write(chunk)
+
+
+class ExportCache:
+    """Finished export files keyed by (user, log version, format, range); oldest files are deleted."""
+
+    def __init__(self, directory=None, max_files: int = DEFAULT_MAX_FILES,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.directory = Path(directory or tempfile.mkdtemp(prefix="bitebot-exports-"))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_files = max_files
+        self.chunk_rows = chunk_rows
+        self.hits = 0
+        self.misses = 0
+        self._files: "OrderedDict[tuple, Path]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, log: FoodLog, fmt: str, start: Optional[datetime] = None,
+            end: Optional[datetime] = None) -> Path:
+        key = (log.user_id, log.version, fmt, start, end)
+        with self._lock:
+            path = self._files.get(key)
+            if path is not None and path.exists():
+                self._files.move_to_end(key)
+                self.hits += 1
+                return path
+            self.misses += 1
+        # Written outside the lock so one large export doesn't hold up everyone else's.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=f".{EXPORT_FORMATS[fmt][1]}")
+        os.close(fd)
+        path = Path(tmp)
+        try:
+            export_to_file(log, fmt, path, start, end, self.chunk_rows)
+        except BaseException:
+            path.unlink(missing_ok=True)
+            raise
+        with self._lock:
+            existing = self._files.get(key)
+            if existing is not None and existing.exists():
+                # Another session finished the same export first; keep theirs.
+                path.unlink(missing_ok=True)
+                return existing
+            self._files[key] = path
+            while len(self._files) > self.max_files:
+                _, old = self._files.popitem(last=False)
+                old.unlink(missing_ok=True)
+            return path
+
+    def read(self, log: FoodLog, fmt: str, start: Optional[datetime] = None,
+             end: Optional[datetime] = None) -> bytes:
+        """The export's contents, with the file closed again before returning."""
+        return self.get(log, fmt, start, end).read_bytes()
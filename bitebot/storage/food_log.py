@@ -0,0 +1,266 @@
+"""
+Columnar, typed food history with an append-only SQLite backend.
+
+A ``FoodLog`` keeps one entry as 14 bytes across four NumPy columns:
+int64 timestamps (microseconds, naive local time), int8 status codes, int8
+scores and int32 ids into an interned food-name table. Columns grow by
+doubling, so appends are amortised O(1); time-range queries are a binary
+search; ``to_pandas`` wraps the columns as datetime64/categorical Series
+without copying the underlying buffers.
+
+When a ``SQLiteLogStore`` is attached every append is written through to a
+WAL-mode database, and ``FoodLog.load`` rebuilds the columns after a
+restart. The store keeps a per-user version that every write bumps, so
+``FoodLog.refresh`` can cheaply notice (and reload) entries written by
+another session or worker process.
+"""
+import itertools
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from bitebot.core.catalogue import STATUSES
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parents[2] / "data" / "food_log.sqlite3"
+STATUS_CODES = {s: i for i, s in enumerate(STATUSES)}
+EPOCH = datetime(1970, 1, 1)
+_US = timedelta(microseconds=1)
+_INITIAL_CAPACITY = 64
+_versions = itertools.count(1)  # process-wide, so (user, version) never repeats across sessions
+
+
+def to_micros(when: datetime) -> int:
+    return (when.replace(tzinfo=None) - EPOCH) // _US
+
+
+def from_micros(ts: int) -> datetime:
+    return EPOCH + timedelta(microseconds=int(ts))
+
+
+class SQLiteLogStore:
+    """Append-only entries table shared by every session and worker on this machine."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS food_log ("
+                           "user_id TEXT NOT NULL, ts INTEGER NOT NULL, food TEXT NOT NULL, "
+                           "status INTEGER NOT NULL, score INTEGER NOT NULL)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS food_log_user_ts ON food_log(user_id, ts)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS food_log_versions ("
+                           "user_id TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+
+    def _bump(self, user_id: str) -> int:
+        return self._conn.execute("INSERT INTO food_log_versions VALUES (?, 1) ON CONFLICT (user_id) "
+                                  "DO UPDATE SET version = version + 1 RETURNING version", (user_id,)).fetchone()[0]
+
+    def version(self, user_id: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT version FROM food_log_versions WHERE user_id = ?", (user_id,)).fetchone()
+        return row[0] if row else 0
+
+    def append(self, user_id: str, ts: int, food: str, status: int, score: int) -> int:
+        return self.append_many(user_id, [(ts, food, status, score)])
+
+    def append_many(self, user_id: str, entries: List[Tuple[int, str, int, int]]) -> int:
+        """Insert the entries in one transaction; returns the user's new log version."""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("INSERT INTO food_log VALUES (?, ?, ?, ?, ?)",
+                                       [(user_id, *entry) for entry in entries])
+                return self._bump(user_id)
+
+    def rows(self, user_id: str) -> List[Tuple[int, str, int, int]]:
+        with self._lock:
+            return self._conn.execute("SELECT ts, food, status, score FROM food_log "
+                                      "WHERE user_id = ? ORDER BY ts, rowid", (user_id,)).fetchall()
+
+    def clear(self, user_id: str) -> int:
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.execute("DELETE FROM food_log WHERE user_id = ?", (user_id,))
+                return self._bump(user_id)
+
+
+class FoodLog:
+    def __init__(self, store: Optional[SQLiteLogStore] = None, user_id: str = "local"):
+        self.store = store
+        self.user_id = user_id
+        self.version = next(_versions)  # changes on every write; cache key for derived views
+        self.generation = 0              # bumped by clear()/refresh(), for views that follow appends incrementally
+        self.store_version = 0           # the store's version for this user that the columns reflect
+        self._reset()
+
+    def _reset(self):
+        self._n = 0
+        self._ts = np.empty(_INITIAL_CAPACITY, dtype=np.int64)
+        self._status = np.empty(_INITIAL_CAPACITY, dtype=np.int8)
+        self._score = np.empty(_INITIAL_CAPACITY, dtype=np.int8)
+        self._food_id = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self.foods: List[str] = []          # interned names, indexed by food id
+        self._food_ids: Dict[str, int] = {}
+        self._sorted = True
+
+    @classmethod
+    def load(cls, store: SQLiteLogStore, user_id: str) -> "FoodLog":
+        log = cls(store, user_id)
+        log._load_rows()
+        return log
+
+    def _load_rows(self):
+        self.store_version = self.store.version(self.user_id)
+        for ts, food, status, score in self.store.rows(self.user_id):
+            self._append(ts, food, status, score)
+
+    def _stored(self, version: int):
+        # Still in sync only if no other writer bumped the version since we last looked.
+        if version == self.store_version + 1:
+            self.store_version = version
+
+    def refresh(self) -> bool:
+        """Reload if another session or worker changed this user's entries; True when it did."""
+        if self.store is None or self.store.version(self.user_id) == self.store_version:
+            return False
+        self._reset()
+        self._load_rows()
+        self.generation += 1
+        self.version = next(_versions)
+        return True
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _grow(self):
+        capacity = len(self._ts) * 2
+        for name in ("_ts", "_status", "_score", "_food_id"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+    def intern(self, food: str) -> int:
+        food_id = self._food_ids.get(food)
+        if food_id is None:
+            food_id = self._food_ids[food] = len(self.foods)
+            self.foods.append(food)
+        return food_id
+
+    def _append(self, ts: int, food: str, status: int, score: int):
+        if self._n == len(self._ts):
+            self._grow()
+        i = self._n
+        if i and ts < self._ts[i - 1]:
+            self._sorted = False
+        self._ts[i] = ts
+        self._status[i] = status
+        self._score[i] = score
+        self._food_id[i] = self.intern(food)
+        self._n += 1
+        self.version = next(_versions)
+
+    def append(self, food: str, status: str, score: int, when: Optional[datetime] = None):
+        ts = to_micros(when or datetime.now())
+        code = STATUS_CODES[status]
+        self._append(ts, food, code, score)
+        if self.store is not None:
+            self._stored(self.store.append(self.user_id, ts, food, code, int(score)))
+
+    def extend(self, foods: List[str], statuses: List[str], scores: List[int], when: Optional[datetime] = None):
+        """Append many entries with one timestamp and a single store transaction."""
+        ts = to_micros(when or datetime.now())
+        entries = [(ts, food, STATUS_CODES[status], int(score)) for food, status, score in zip(foods, statuses, scores)]
+        for entry in entries:
+            self._append(*entry)
+        if self.store is not None and entries:
+            self._stored(self.store.append_many(self.user_id, entries))
+
+    def clear(self):
+        if self.store is not None:
+            self._stored(self.store.clear(self.user_id))
+        self._reset()
+        self.generation += 1
+        self.version = next(_versions)
+
+    # ---- columns & queries ----
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._ts[:self._n]
+
+    @property
+    def status_codes(self) -> np.ndarray:
+        return self._status[:self._n]
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self._score[:self._n]
+
+    @property
+    def food_ids(self) -> np.ndarray:
+        return self._food_id[:self._n]
+
+    def range_slice(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> slice:
+        """Row slice for entries with start <= time < end (binary search on the time column)."""
+        if not self._sorted:
+            order = np.argsort(self.timestamps, kind="stable")
+            for name in ("_ts", "_status", "_score", "_food_id"):
+                col = getattr(self, name)
+                col[:self._n] = col[:self._n][order]
+            self._sorted = True
+        ts = self.timestamps
+        lo = int(np.searchsorted(ts, to_micros(start), "left")) if start else 0
+        hi = int(np.searchsorted(ts, to_micros(end), "left")) if end else self._n
+        return slice(lo, hi)
+
+    def entries(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[Dict]:
+        """Rows as plain dicts (food, status, score, time), oldest first."""
+        rows = self.range_slice(start, end)
+        for ts, code, score, food_id in zip(self.timestamps[rows].tolist(), self.status_codes[rows].tolist(),
+                                            self.scores[rows].tolist(), self.food_ids[rows].tolist()):
+            yield {"food": self.foods[food_id], "status": STATUSES[code], "score": score,
+                   "time": from_micros(ts)}
+
+    def select(self, statuses=None, start: Optional[datetime] = None, end: Optional[datetime] = None,
+               food_query: str = "") -> np.ndarray:
+        """Row positions (oldest first) matching every given filter, computed with column masks."""
+        rows = self.range_slice(start, end)
+        positions = np.arange(rows.start, rows.stop)
+        mask = np.ones(len(positions), dtype=bool)
+        if statuses:
+            mask &= np.isin(self.status_codes[rows], [STATUS_CODES[s] for s in statuses])
+        query = (food_query or "").lower().strip()
+        if query:
+            # Match against the (small) interned name table, then filter the id column once.
+            matching = [i for i, food in enumerate(self.foods) if query in food]
+            mask &= np.isin(self.food_ids[rows], matching)
+        return positions[mask]
+
+    def _frame(self, rows):
+        import pandas as pd
+        return pd.DataFrame({
+            "food": pd.Categorical.from_codes(self.food_ids[rows], categories=pd.Index(self.foods, dtype=object)),
+            "status": pd.Categorical.from_codes(self.status_codes[rows], categories=list(STATUSES)),
+            "score": self.scores[rows],
+            "time": self.timestamps[rows].view("datetime64[us]"),
+        }, copy=False)
+
+    def to_pandas(self, start: Optional[datetime] = None, end: Optional[datetime] = None):
+        """DataFrame view (food, status, score, time) over the typed columns; no per-row objects."""
+        return self._frame(self.range_slice(start, end))
+
+    def take(self, positions):
+        """DataFrame for the given row positions or slice (e.g. one page of ``select`` results)."""
+        if isinstance(positions, slice):
+            return self._frame(positions)
+        return self._frame(np.asarray(positions, dtype=np.int64))
+
+    def nbytes(self) -> int:
+        return self._n * (self._ts.itemsize + self._status.itemsize + self._score.itemsize + self._food_id.itemsize)
@@ -0,0 +1,96 @@
+"""
+Daily rollups of a food history for the dashboard's time-series charts.
+
+``TimeRollups`` keeps one dense row per calendar day (entries, score sum,
+per-status counts and macro sums). ``sync`` folds in only the log rows added
+since the previous call, with ``np.add.at`` over the day index, so keeping
+it current costs O(new rows) and every chart reads a table whose size is
+the number of days (or weeks), never the number of entries. Macros come
+from a per-food lookup cached by interned food id.
+"""
+from typing import Callable, List, Mapping, Optional
+
+import numpy as np
+
+from bitebot.core.catalogue import STATUSES
+from bitebot.storage.food_log import FoodLog
+
+DAY_US = 86_400 * 1_000_000
+MACROS = ("calories", "protein", "carbs", "fat")
+COLUMNS = ("count", "score_sum") + tuple(s.lower() for s in STATUSES) + MACROS
+FREQUENCIES = {"daily": "D", "weekly": "W-MON"}
+
+MacroLookup = Callable[[str], Mapping[str, Optional[float]]]
+
+
+class TimeRollups:
+    def __init__(self, macros: MacroLookup):
+        self.macros = macros
+        self.rows_seen = 0
+        self.log_key = None  # (id, generation) of the log the rows came from
+        self.start_day = 0
+        self._data = np.zeros((0, len(COLUMNS)), dtype=np.float64)
+        self._food_macros = np.zeros((0, len(MACROS)), dtype=np.float64)  # by FoodLog food id
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _macro_table(self, foods: List[str]) -> np.ndarray:
+        known = len(self._food_macros)
+        if len(foods) > known:
+            new = [[self.macros(food).get(m) or 0.0 for m in MACROS] for food in foods[known:]]
+            self._food_macros = np.vstack([self._food_macros, np.asarray(new, dtype=np.float64)])
+        return self._food_macros
+
+    def _ensure_days(self, first: int, last: int):
+        if not len(self._data):
+            self.start_day = first
+            self._data = np.zeros((last - first + 1, len(COLUMNS)))
+            return
+        if first < self.start_day:
+            self._data = np.vstack([np.zeros((self.start_day - first, len(COLUMNS))), self._data])
+            self.start_day = first
+        end = self.start_day + len(self._data) - 1
+        if last > end:
+            self._data = np.vstack([self._data, np.zeros((last - end, len(COLUMNS)))])
+
+    def reset(self):
+        self.rows_seen = 0
+        self.start_day = 0
+        self._data = np.zeros((0, len(COLUMNS)))
+        self._food_macros = np.zeros((0, len(MACROS)))
+
+    def sync(self, log: FoodLog) -> int:
+        """Fold in rows appended since the last sync; rebuilds if the log was cleared or replaced."""
+        if self.log_key != (id(log), log.generation) or len(log) < self.rows_seen:
+            self.reset()
+            self.log_key = (id(log), log.generation)
+        n = len(log)
+        if n == self.rows_seen:
+            return 0
+        new = slice(self.rows_seen, n)
+        days = log.timestamps[new] // DAY_US
+        self._ensure_days(int(days.min()), int(days.max()))
+        idx = days - self.start_day
+
+        values = np.zeros((len(idx), len(COLUMNS)))
+        values[:, 0] = 1
+        values[:, 1] = log.scores[new]
+        values[np.arange(len(idx)), 2 + log.status_codes[new].astype(np.int64)] = 1
+        values[:, 2 + len(STATUSES):] = self._macro_table(log.foods)[log.food_ids[new]]
+        np.add.at(self._data, idx, values)
+
+        added = n - self.rows_seen
+        self.rows_seen = n
+        return added
+
+    def frame(self, granularity: str = "daily"):
+        """Rollup table indexed by period start: counts, mean score, status counts and macro sums."""
+        import pandas as pd
+
+        index = pd.to_datetime((self.start_day + np.arange(len(self._data))) * DAY_US, unit="us")
+        df = pd.DataFrame(self._data, index=index, columns=COLUMNS)
+        if granularity != "daily":
+            df = df.resample(FREQUENCIES[granularity], label="left", closed="left").sum()
+        df["mean_score"] = (df["score_sum"] / df["count"].where(df["count"] > 0)).round(2)
+        return df.drop(columns="score_sum")
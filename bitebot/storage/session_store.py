@@ -0,0 +1,207 @@
+"""
+Per-user session state (chat transcripts, AI context) kept outside the Streamlit process.
+
+A ``SessionStore`` maps (user id, key) to a versioned blob. Values are
+plain JSON-able data, written as compact JSON and zlib-compressed once they
+are large enough to benefit. Every save bumps the key's version, so a
+session can check with one cheap query whether another worker wrote newer
+state and reload only the keys that changed.
+
+Transcripts only ever grow (or are cleared), so they can be stored as one
+row per item with ``append``: a save then writes just the new messages
+instead of re-encoding the whole conversation.
+
+Storage is pluggable: ``MemorySessionBackend`` for one process,
+``SQLiteSessionBackend`` to share state between worker processes through a
+local file (e.g. the food log database).
+"""
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
+
+DEFAULT_MAX_USERS = 10_000
+COMPRESS_MIN_BYTES = 512
+_RAW, _ZLIB = b"j", b"z"
+_ITEMS = b"l"  # marker blob: the value is a list stored one item per row
+
+
+def encode(value: Any) -> bytes:
+    data = json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+    if len(data) >= COMPRESS_MIN_BYTES:
+        return _ZLIB + zlib.compress(data)
+    return _RAW + data
+
+
+def decode(blob: bytes) -> Any:
+    tag, data = blob[:1], blob[1:]
+    return json.loads(zlib.decompress(data) if tag == _ZLIB else data)
+
+
+class MemorySessionBackend:
+    """In-process store: user -> {key: (version, blob)}, least recently used users evicted first."""
+
+    def __init__(self, max_users: int = DEFAULT_MAX_USERS):
+        self.max_users = max_users
+        self._users: "OrderedDict[str, Dict[str, Tuple[int, bytes]]]" = OrderedDict()
+        self._items: Dict[str, Dict[str, List[bytes]]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, user_id: str, keys: Iterable[str]) -> Dict[str, Tuple[int, bytes]]:
+        with self._lock:
+            data = self._users.get(user_id, {})
+            if user_id in self._users:
+                self._users.move_to_end(user_id)
+            return {k: data[k] for k in keys if k in data}
+
+    def versions(self, user_id: str, keys: Iterable[str]) -> Dict[str, int]:
+        with self._lock:
+            data = self._users.get(user_id, {})
+            return {k: data[k][0] for k in keys if k in data}
+
+    def load_items(self, user_id: str, key: str) -> List[bytes]:
+        with self._lock:
+            return list(self._items.get(user_id, {}).get(key, ()))
+
+    def _save(self, user_id: str, key: str, blob: bytes) -> int:
+        data = self._users.setdefault(user_id, {})
+        self._users.move_to_end(user_id)
+        version = data[key][0] + 1 if key in data else 1
+        data[key] = (version, blob)
+        while len(self._users) > self.max_users:
+            evicted, _ = self._users.popitem(last=False)
+            self._items.pop(evicted, None)
+        return version
+
+    def save(self, user_id: str, key: str, blob: bytes) -> int:
+        with self._lock:
+            return self._save(user_id, key, blob)
+
+    def append(self, user_id: str, key: str, blobs: List[bytes], start: int) -> int:
+        with self._lock:
+            items = self._items.setdefault(user_id, {}).setdefault(key, [])
+            del items[start:]
+            items.extend(blobs)
+            return self._save(user_id, key, _ITEMS)
+
+    def clear(self, user_id: str):
+        with self._lock:
+            self._users.pop(user_id, None)
+            self._items.pop(user_id, None)
+
+
+class SQLiteSessionBackend:
+    """On-disk store shared by every process pointing at the same file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS session_state ("
+                           "user_id TEXT NOT NULL, key TEXT NOT NULL, version INTEGER NOT NULL, "
+                           "data BLOB NOT NULL, updated_at REAL NOT NULL, PRIMARY KEY (user_id, key))")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS session_items ("
+                           "user_id TEXT NOT NULL, key TEXT NOT NULL, seq INTEGER NOT NULL, "
+                           "data BLOB NOT NULL, PRIMARY KEY (user_id, key, seq))")
+
+    def _select(self, columns: str, user_id: str, keys: Iterable[str]):
+        keys = list(keys)
+        marks = ",".join("?" * len(keys))
+        with self._lock:
+            return self._conn.execute(f"SELECT key, {columns} FROM session_state "
+                                      f"WHERE user_id = ? AND key IN ({marks})", (user_id, *keys)).fetchall()
+
+    def load(self, user_id: str, keys: Iterable[str]) -> Dict[str, Tuple[int, bytes]]:
+        return {key: (version, data) for key, version, data in self._select("version, data", user_id, keys)}
+
+    def versions(self, user_id: str, keys: Iterable[str]) -> Dict[str, int]:
+        return dict(self._select("version", user_id, keys))
+
+    def load_items(self, user_id: str, key: str) -> List[bytes]:
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT data FROM session_items WHERE user_id = ? AND key = ? "
+                                                     "ORDER BY seq", (user_id, key))]
+
+    def _save(self, user_id: str, key: str, blob: bytes) -> int:
+        return self._conn.execute(
+            "INSERT INTO session_state VALUES (?, ?, 1, ?, ?) ON CONFLICT (user_id, key) DO UPDATE SET "
+            "version = version + 1, data = excluded.data, updated_at = excluded.updated_at RETURNING version",
+            (user_id, key, blob, time.time())).fetchone()[0]
+
+    def save(self, user_id: str, key: str, blob: bytes) -> int:
+        with self._lock:
+            return self._save(user_id, key, blob)
+
+    def append(self, user_id: str, key: str, blobs: List[bytes], start: int) -> int:
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.execute("DELETE FROM session_items WHERE user_id = ? AND key = ? AND seq >= ?",
+                                   (user_id, key, start))
+                self._conn.executemany("INSERT INTO session_items VALUES (?, ?, ?, ?)",
+                                       [(user_id, key, start + i, blob) for i, blob in enumerate(blobs)])
+                return self._save(user_id, key, _ITEMS)
+
+    def clear(self, user_id: str):
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.execute("DELETE FROM session_state WHERE user_id = ?", (user_id,))
+                self._conn.execute("DELETE FROM session_items WHERE user_id = ?", (user_id,))
+
+
+class SessionStore:
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else MemorySessionBackend()
+        self._lock = threading.Lock()
+        self._counters = {"loads": 0, "saves": 0, "bytes_loaded": 0, "bytes_saved": 0}
+
+    def _count(self, **amounts):
+        with self._lock:
+            for name, amount in amounts.items():
+                self._counters[name] += amount
+
+    def load(self, user_id: str, keys: Iterable[str]) -> Dict[str, Tuple[int, Any]]:
+        """(version, value) for each stored key; missing keys are left out."""
+        blobs = self.backend.load(user_id, keys)
+        values = {}
+        for key, (version, blob) in blobs.items():
+            if blob == _ITEMS:
+                items = self.backend.load_items(user_id, key)
+                self._count(bytes_loaded=sum(len(b) for b in items))
+                values[key] = (version, [decode(b) for b in items])
+            else:
+                self._count(bytes_loaded=len(blob))
+                values[key] = (version, decode(blob))
+        self._count(loads=len(blobs))
+        return values
+
+    def versions(self, user_id: str, keys: Iterable[str]) -> Dict[str, int]:
+        return self.backend.versions(user_id, keys)
+
+    def save(self, user_id: str, key: str, value: Any) -> int:
+        """Store ``value`` under ``key`` and return its new version."""
+        blob = encode(value)
+        self._count(saves=1, bytes_saved=len(blob))
+        return self.backend.save(user_id, key, blob)
+
+    def append(self, user_id: str, key: str, items: List[Any], start: int) -> int:
+        """Store list ``items`` from position ``start`` on, dropping any stored beyond it; return the new version.
+
+        ``append(user_id, key, value, 0)`` replaces the whole list.
+        """
+        blobs = [encode(item) for item in items]
+        self._count(saves=1, bytes_saved=sum(len(b) for b in blobs))
+        return self.backend.append(user_id, key, blobs, start)
+
+    def clear(self, user_id: str):
+        self.backend.clear(user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counters, backend=type(self.backend).__name__)
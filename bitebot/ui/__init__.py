@@ -0,0 +1 @@
+"""Streamlit UI: shared resources, session state and one module per tab, assembled by app.py."""
@@ -0,0 +1,157 @@
+"""
+🤖 AI Chat tab: Gemini status, quick questions, the transcript and the in-flight answer.
+"""
+import time
+
+import streamlit as st
+
+from bitebot.ui.gemini import ask_question, finish_pending_ai, init_gemini
+from bitebot.ui.resources import get_ai_executor, get_gemini_guard
+from bitebot.ui.state import clear_ai_chat
+
+STATE_KEYS = ("ai_chat_history", "gemini_chat_context")
+
+QUICK_QUESTIONS = [
+    ("🥗 Healthy Meal Ideas", "Give me some healthy meal ideas for weight loss"),
+    ("💪 Protein Sources", "What are the best protein sources for muscle building?"),
+    ("🔥 Calorie Counting", "How can I count calories effectively?"),
+    ("🍎 Food Myths", "What are common nutrition myths I should know?"),
+    ("💧 Hydration Tips", "How much water should I drink daily and why?"),
+    ("📊 Diet Planning", "How to create a balanced diet plan?"),
+]
+
+
+@st.fragment(run_every=0.5)
+def render_pending_ai():
+    # Polls the in-flight request without rerunning (or blocking) the rest of the page.
+    pending = st.session_state.get("ai_pending")
+    if not pending:
+        return
+    handle = pending["handle"]
+    handle.check_deadline()
+    if handle.done() or handle.status == "timed_out":
+        finish_pending_ai()
+        st.rerun()
+
+    st.markdown(f"""
+    <div class='user-message'>
+        <div style='font-weight:bold; color:#00ffcc; margin-bottom:5px;'>👤 YOU</div>
+        <div style='font-size:1.1rem;'>{pending['question']}</div>
+    </div>
+    """, unsafe_allow_html=True)
+    st.markdown("<div style='font-weight:bold;' class='gemini-title'>🤖 BiteBot AI</div>", unsafe_allow_html=True)
+    st.markdown(handle.partial or "_Thinking…_")
+    c1, c2 = st.columns([4, 1])
+    with c1:
+        stats = get_ai_executor().stats()
+        st.caption(f"⏳ {handle.status} · {time.monotonic() - handle.submitted_at:.1f}s · "
+                   f"{stats['in_flight']} in flight, {stats['queued']} queued")
+    with c2:
+        if st.button("⏹️ Cancel", key="cancel_ai_request", use_container_width=True):
+            handle.cancel()
+            finish_pending_ai()
+            st.rerun()
+
+
+def ask_ai(user_msg: str):
+    if st.session_state.get("ai_pending"):
+        st.toast("⏳ Still answering your last question…")
+        return
+    ask_question(user_msg)
+    st.rerun()
+
+
+def render_status():
+    # ✅ If no key in secrets/env, allow user to paste it (so Gemini can initialize)
+    with st.expander("🔑 Gemini Setup (only if status stays False)"):
+        st.text_input("Paste GEMINI_API_KEY here", type="password", key="temp_gemini_key")
+        st.caption("If you’re using Streamlit Cloud: set it in App → Settings → Secrets as GEMINI_API_KEY.")
+
+    st.caption(f"Gemini status: {st.session_state.get('gemini_initialized', False)}")
+    if st.session_state.get("gemini_error"):
+        st.warning(f"Gemini error: {st.session_state.gemini_error}")
+    gs = get_gemini_guard().stats()
+    if gs["calls"]:
+        st.caption(f"🛡️ Gemini calls: {gs['successes']}/{gs['calls']} ok · {gs['retries']} retries · "
+                   f"breaker {gs['breaker_state'].replace('_', '-')} (tripped {gs['breaker_opened']}×) · "
+                   f"{gs['short_circuited']} short-circuited · {gs['rate_limited']} rate-limited")
+    context = st.session_state.get("gemini_chat_context")
+    if context is not None and context.prompt_tokens:
+        cs = context.stats()
+        st.caption(f"🧮 Context: {cs['turns']} recent turns + summary · last prompt ≈ {cs['last_prompt_tokens']} "
+                   f"tokens (budget {context.token_budget}, avg {cs['avg_prompt_tokens']}) · "
+                   f"{cs['compactions']} older turns summarised")
+
+    if not st.session_state.get("gemini_initialized", False):
+        with st.spinner("🔧 Setting up AI assistant..."):
+            init_gemini()
+
+        if st.session_state.get("gemini_initialized", False):
+            st.success("✅ Gemini AI initialized successfully!")
+        else:
+            st.warning("⚠️ Gemini is not initialized. Answering offline from the food catalogue.")
+
+
+def render_transcript():
+    if not st.session_state.ai_chat_history:
+        st.info("💭 Ask something or click a quick question!")
+        return
+    for msg in st.session_state.ai_chat_history:
+        if msg["sender"] == "user":
+            st.markdown(f"""
+            <div class='user-message'>
+                <div style='display:flex; justify-content:space-between; align-items:center; margin-bottom:5px;'>
+                    <div style='font-weight:bold; color:#00ffcc;'>👤 YOU</div>
+                    <div style='font-size:0.8rem; color:#aaa;'>{msg.get('time','')}</div>
+                </div>
+                <div style='font-size:1.1rem;'>{msg['message']}</div>
+            </div>
+            """, unsafe_allow_html=True)
+        else:
+            st.markdown(f"""
+            <div class='gemini-message'>
+                <div style='display:flex; justify-content:space-between; align-items:center; margin-bottom:10px;'>
+                    <div style='font-weight:bold;' class='gemini-title'>🤖 BiteBot AI{' ⚡ offline' if msg.get('provider') == 'local' else ''}</div>
+                    <div style='font-size:0.8rem; color:#aaa;'>{msg.get('time','')}</div>
+                </div>
+                <div style='font-size:1.1rem;'>{msg['message']}</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+
+def render():
+    st.markdown("### 🤖 Chat with AI Nutritionist")
+    render_status()
+
+    st.markdown("### 💡 Quick Questions")
+    columns = st.columns(2)
+    half = len(QUICK_QUESTIONS) // 2
+    for i, (label, question) in enumerate(QUICK_QUESTIONS):
+        with columns[i // half]:
+            if st.button(label, use_container_width=True):
+                ask_ai(question)
+
+    st.divider()
+    st.markdown("### 💬 Chat History")
+    render_transcript()
+    if st.session_state.get("ai_pending"):
+        render_pending_ai()
+
+    st.divider()
+    st.markdown("### 💭 Ask Your Question")
+    i1, i2 = st.columns([4, 1])
+    with i1:
+        ai_question = st.text_input("", placeholder="e.g., Good snacks for weight loss?", key="ai_question_input")
+    with i2:
+        ask_btn = st.button("🚀 Ask AI", use_container_width=True, type="primary")
+
+    if ask_btn and ai_question:
+        if st.session_state.get("ai_pending"):
+            st.toast("⏳ Still answering your last question…")
+        else:
+            ask_question(ai_question)
+            st.rerun()
+
+    if st.button("🗑️ Clear AI Chat", use_container_width=True):
+        clear_ai_chat()
+        st.rerun()
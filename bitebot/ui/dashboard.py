@@ -0,0 +1,79 @@
+"""
+📈 Dashboard tab: health mix, top foods and daily/weekly trends.
+
+Plotly is imported when the first figure is built, not at startup.
+"""
+import streamlit as st
+
+from bitebot import metrics
+
+STATE_KEYS = ()
+DASHBOARD_LAYOUT = dict(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font_color='white')
+STATUS_COLORS = {"HEALTHY": "#00ff88", "MODERATE": "#ffcc00", "UNHEALTHY": "#ff4444"}
+
+
+@metrics.timed("dashboard_figures")
+def build_dashboard_figures(stats, periods, granularity: str):
+    # Inputs are the running stats and the day/week rollups, so cost scales with periods, not entries.
+    import plotly.express as px
+
+    label = "Day" if granularity == "daily" else "Week"
+
+    status_counts = stats.status_counts.most_common()
+    pie = px.pie(values=[n for _, n in status_counts], names=[s for s, _ in status_counts],
+                 title="Food Health Distribution", hole=0.4, color=[s for s, _ in status_counts],
+                 color_discrete_map=STATUS_COLORS)
+    pie.update_layout(**DASHBOARD_LAYOUT)
+
+    top_foods = stats.top_foods(10)
+    top = px.bar(x=[n for _, n in top_foods], y=[f for f, _ in top_foods], orientation="h",
+                 title="Top 10 Foods Analyzed")
+    top.update_layout(**DASHBOARD_LAYOUT, xaxis_title="Count", yaxis_title="Food")
+
+    trend = px.bar(periods, x=periods.index, y=["healthy", "moderate", "unhealthy"],
+                   title=f"Foods Logged per {label}",
+                   color_discrete_sequence=[STATUS_COLORS[s] for s in ("HEALTHY", "MODERATE", "UNHEALTHY")])
+    trend.update_layout(**DASHBOARD_LAYOUT, xaxis_title=label, yaxis_title="Foods", legend_title="")
+
+    scored = periods.dropna(subset=["mean_score"])
+    score = px.line(scored, x=scored.index, y="mean_score", markers=True,
+                    title=f"Average Nutrition Score per {label}")
+    score.update_layout(**DASHBOARD_LAYOUT, xaxis_title=label, yaxis_title="Score", yaxis_range=[0, 10])
+
+    macros = px.bar(periods, x=periods.index, y=["protein", "carbs", "fat"], title=f"Macros Logged per {label} (g)",
+                    hover_data={"calories": ":.0f"})
+    macros.update_layout(**DASHBOARD_LAYOUT, xaxis_title=label, yaxis_title="Grams", legend_title="")
+    return {"status": pie, "top": top, "trend": trend, "score": score, "macros": macros}
+
+
+def get_dashboard_figures(granularity: str):
+    # Figures are rebuilt only when the food log changes (or the granularity does), not on every rerun.
+    key = (st.session_state.food_log.version, granularity)
+    cached = st.session_state.get("dashboard_figures")
+    if cached is None or cached[0] != key:
+        rollups = st.session_state.food_rollups
+        rollups.sync(st.session_state.food_log)
+        figures = build_dashboard_figures(st.session_state.food_stats, rollups.frame(granularity), granularity)
+        cached = st.session_state.dashboard_figures = (key, figures)
+    return cached[1]
+
+
+def render():
+    st.markdown("### 📈 Nutrition Dashboard")
+    if not st.session_state.food_stats.total:
+        st.info("📈 Analyze some foods to see your nutrition dashboard!")
+        return
+    granularity = st.radio("Trend", ["daily", "weekly"], format_func=str.title, horizontal=True,
+                           key="dashboard_granularity", label_visibility="collapsed")
+    figures = get_dashboard_figures(granularity)
+    c1, c2 = st.columns(2)
+    with c1:
+        st.plotly_chart(figures["status"], use_container_width=True)
+    with c2:
+        st.plotly_chart(figures["top"], use_container_width=True)
+    c3, c4 = st.columns(2)
+    with c3:
+        st.plotly_chart(figures["trend"], use_container_width=True)
+    with c4:
+        st.plotly_chart(figures["score"], use_container_width=True)
+    st.plotly_chart(figures["macros"], use_container_width=True)
@@ -0,0 +1,40 @@
+"""
+🛠️ Performance panel (``BITEBOT_DEBUG=1``): stage timings, counters and cache stats.
+
+The metrics are process-wide, so the panel is read-only and only the
+operator can turn it on; a URL parameter would show it to anyone.
+"""
+import json
+import os
+
+import streamlit as st
+
+from bitebot import metrics
+from bitebot.ui.resources import (get_ai_executor, get_analysis_cache, get_chat_router, get_gemini_guard,
+                                  get_response_cache, get_session_store)
+
+
+def debug_enabled() -> bool:
+    return os.environ.get("BITEBOT_DEBUG") == "1"
+
+
+def render_debug_panel():
+    with st.expander("🛠️ Performance metrics", expanded=False):
+        snap = metrics.REGISTRY.snapshot()
+        if snap["stages"]:
+            import pandas as pd
+
+            st.dataframe(pd.DataFrame.from_dict(snap["stages"], orient="index"), use_container_width=True)
+        if snap["counters"]:
+            st.json(snap["counters"], expanded=False)
+        st.json({"ai_executor": get_ai_executor().stats(), "gemini": get_gemini_guard().stats(),
+                 "response_cache": get_response_cache().stats(), "analysis_cache": get_analysis_cache().stats(),
+                 "chat_router": get_chat_router().counts, "session_store": get_session_store().stats()},
+                expanded=False)
+        d1, d2 = st.columns(2)
+        with d1:
+            st.download_button("Prometheus text", metrics.REGISTRY.to_prometheus, "bitebot_metrics.prom",
+                               "text/plain", use_container_width=True)
+        with d2:
+            st.download_button("JSON snapshot", lambda: json.dumps(metrics.REGISTRY.snapshot(), indent=2),
+                               "bitebot_metrics.json", "application/json", use_container_width=True)
@@ -0,0 +1,191 @@
+"""
+Gemini wiring for a session: API key, model pick-up and the question flow.
+
+Model discovery (list_models + validation ping) runs once per process and
+API key in the shared ``ModelRegistry``; a session only picks up the ready
+model. Questions go through the ``ChatRouter``: factual ones are answered
+locally at once, cacheable ones may come from the shared response cache and
+the rest are streamed from Gemini on the background executor behind the
+process-wide rate limit and circuit breaker. ``BITEBOT_LLM_BACKEND=fake``
+swaps in an offline backend.
+"""
+import os
+import time
+from datetime import datetime
+
+import streamlit as st
+from dotenv import load_dotenv
+
+from bitebot import metrics
+from bitebot.ai.executor import ExecutorBusy
+from bitebot.ai.providers import GeminiProvider
+from bitebot.ai.resilience import CircuitOpen, RateLimited, is_transient
+from bitebot.ai.response_cache import looks_stateless
+from bitebot.services import build_chat_context
+from bitebot.ui.resources import (get_ai_executor, get_chat_router, get_gemini_guard, get_model_registry,
+                                  get_response_cache)
+from bitebot.ui.state import persist
+
+
+def _get_api_key():
+    load_dotenv()
+    # 1) Streamlit secrets (Streamlit Cloud); st.secrets raises when no secrets.toml exists
+    try:
+        if "GEMINI_API_KEY" in st.secrets:
+            return st.secrets["GEMINI_API_KEY"]
+    except Exception:
+        pass
+    # 2) Environment variable
+    if os.environ.get("GEMINI_API_KEY"):
+        return os.environ.get("GEMINI_API_KEY")
+    # 3) Manual input (works on any deployment)
+    if st.session_state.get("temp_gemini_key"):
+        return st.session_state.temp_gemini_key
+    return None
+
+
+@metrics.timed("gemini_init")
+def init_gemini():
+    try:
+        registry = get_model_registry(_get_api_key(), os.environ.get("BITEBOT_LLM_BACKEND", "gemini"))
+        model = registry.get_model()
+        if not model:
+            st.session_state.gemini_initialized = False
+            st.session_state.gemini_error = registry.error
+            st.session_state.gemini_model = None
+            return None
+
+        st.session_state.gemini_initialized = True
+        st.session_state.gemini_error = None
+        st.session_state.gemini_model = model
+        return model
+
+    except Exception as e:
+        st.session_state.gemini_initialized = False
+        st.session_state.gemini_error = str(e)
+        st.session_state.gemini_model = None
+        return None
+
+
+def note_gemini_failure(error: Exception):
+    """Record an error; only non-transient ones (bad key, missing model) force re-initialisation."""
+    st.session_state.gemini_error = str(error)
+    if not isinstance(error, (CircuitOpen, RateLimited)) and not is_transient(error):
+        st.session_state.gemini_initialized = False
+
+
+class GeminiNutritionAI:
+    """Binds the session's model and bounded context; created only when a question goes to Gemini."""
+
+    def __init__(self):
+        self.model = None
+        self.context = None
+        self.provider = None
+
+    def start_chat(self):
+        if not st.session_state.get("gemini_initialized", False) or st.session_state.get("gemini_model") is None:
+            self.model = init_gemini()
+        else:
+            self.model = st.session_state.get("gemini_model")
+
+        if not self.model:
+            return False
+
+        # The context (system prompt + rolling summary + recent turns) outlives any one
+        # ChatSession, so a model re-init after an error keeps the conversation.
+        if st.session_state.get("gemini_chat_context") is None:
+            st.session_state.gemini_chat_context = build_chat_context()
+        self.context = st.session_state.gemini_chat_context
+        self.provider = GeminiProvider(self.model, self.context)
+        return True
+
+
+def _stream_into_handle(handle, new_session, user_message):
+    # Runs on the executor: publish partial text for the UI and honour cancellation.
+    # Transient errors before the first chunk are retried on a fresh session.
+    started = time.perf_counter()
+    for text in get_gemini_guard().stream(GeminiProvider.open_and_stream, new_session, user_message,
+                                          sleep=handle.sleep):
+        handle.raise_if_cancelled()
+        if not handle.partial:
+            metrics.observe("gemini_first_chunk", time.perf_counter() - started)
+        handle.partial += text
+    metrics.observe("gemini_chat", time.perf_counter() - started)
+    return handle.partial.strip()
+
+
+def add_ai_chat_message(user_message, ai_response, provider="gemini"):
+    t = datetime.now().strftime("%H:%M")
+    st.session_state.ai_chat_history.append({"sender": "user", "message": user_message, "time": t})
+    st.session_state.ai_chat_history.append({"sender": "ai", "message": ai_response, "time": t,
+                                             "provider": provider})
+    persist("ai_chat_history", "gemini_chat_context")
+
+
+def ask_question(user_message: str):
+    """Answer factual questions locally right away; queue open-ended ones for Gemini."""
+    router = get_chat_router()
+    remote = st.session_state.get("gemini_initialized", False) and get_gemini_guard().available
+    provider, reply = router.route(user_message, remote)
+    metrics.inc(f"ai_questions_{provider}")
+    if reply is None:
+        submit_ai_question(user_message, router.local.fallback(user_message))
+        return
+    if st.session_state.get("gemini_chat_context") is not None:
+        st.session_state.gemini_chat_context.record(user_message, reply)
+    add_ai_chat_message(user_message, reply, provider)
+
+
+def submit_ai_question(user_message: str, fallback: str):
+    """Answer from the shared cache, or queue a background Gemini request for this session."""
+    stateless = looks_stateless(user_message)
+    if stateless:
+        cached = get_response_cache().get(user_message)
+        if cached is not None:
+            if st.session_state.get("gemini_chat_context") is not None:
+                st.session_state.gemini_chat_context.record(user_message, cached)
+            add_ai_chat_message(user_message, cached)
+            return
+    gemini_ai = GeminiNutritionAI()
+    if not gemini_ai.start_chat():
+        add_ai_chat_message(user_message, fallback, "local")
+        return
+    # The reply is shared with every user, so only cache one written without this session's earlier turns.
+    cacheable = stateless and gemini_ai.context.is_empty
+    try:
+        handle = get_ai_executor().submit(_stream_into_handle, gemini_ai.provider.turn_factory(user_message),
+                                          user_message)
+    except ExecutorBusy as e:
+        add_ai_chat_message(user_message, f"⚠️ {e}")
+        return
+    st.session_state.ai_pending = {"handle": handle, "question": user_message,
+                                   "fallback": fallback, "cacheable": cacheable}
+
+
+def finish_pending_ai():
+    pending = st.session_state.ai_pending
+    handle = pending["handle"]
+    reply, provider = None, "gemini"
+    status = handle.status
+    if status == "done":
+        reply = handle.result() or None
+    elif status == "failed":
+        try:
+            handle.result()
+        except Exception as e:
+            note_gemini_failure(e)
+
+    if reply is None:
+        if status == "timed_out":
+            reply = "⚠️ Gemini took too long to answer. Please try again."
+        elif status == "cancelled":
+            reply = "⚠️ Request cancelled."
+        else:
+            reply, provider = pending["fallback"], "local"
+    else:
+        if st.session_state.get("gemini_chat_context") is not None:
+            st.session_state.gemini_chat_context.record(pending["question"], reply)
+        if pending["cacheable"]:
+            get_response_cache().put(pending["question"], reply)
+    add_ai_chat_message(pending["question"], reply, provider)
+    st.session_state.ai_pending = None
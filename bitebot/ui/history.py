@@ -0,0 +1,94 @@
+"""
+📊 Food History tab: filtered, paginated history table and chunked exports.
+"""
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from bitebot import metrics
+from bitebot.storage.export import EXPORT_FORMATS
+from bitebot.ui.resources import get_export_cache
+
+STATE_KEYS = ()
+HISTORY_PAGE_SIZES = (25, 50, 100)
+STATUS_LABELS = ["✅ HEALTHY", "⚖️ MODERATE", "⚠️ UNHEALTHY"]
+
+
+def _date_bounds(date_range):
+    start = end = None
+    if len(date_range) >= 1:
+        start = datetime.combine(date_range[0], datetime.min.time())
+    if len(date_range) == 2:
+        end = datetime.combine(date_range[1], datetime.min.time()) + timedelta(days=1)
+    return start, end
+
+
+def page_frame(log, positions):
+    """Display frame for one page of history rows (``positions`` into the log)."""
+    df = log.take(positions)
+    df["status"] = df["status"].cat.rename_categories(STATUS_LABELS)
+    df["food"] = df["food"].astype(str).str.title()
+    return df
+
+
+@st.fragment
+def render_food_history():
+    # Filters run as column masks on the FoodLog; only the current page becomes a DataFrame.
+    log = st.session_state.food_log
+    f1, f2, f3 = st.columns(3)
+    with f1:
+        statuses = st.multiselect("Status", ["HEALTHY", "MODERATE", "UNHEALTHY"], key="history_status")
+    with f2:
+        date_range = st.date_input("Date range", value=(), key="history_dates")
+    with f3:
+        food_query = st.text_input("Food contains", key="history_food")
+
+    start, end = _date_bounds(date_range)
+    positions = log.select(statuses, start, end, food_query)[::-1]  # newest first
+
+    p1, p2 = st.columns(2)
+    with p2:
+        page_size = st.selectbox("Rows per page", HISTORY_PAGE_SIZES, key="history_page_size")
+    pages = max(1, -(-len(positions) // page_size))
+    if st.session_state.get("history_page", 1) > pages:
+        st.session_state.history_page = pages
+    with p1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key="history_page")
+
+    first = (page - 1) * page_size
+    with metrics.timer("history_frame"):
+        df = page_frame(log, positions[first:first + page_size])
+    st.dataframe(
+        df[["food", "status", "score", "time"]], hide_index=True, use_container_width=True,
+        column_config={
+            "food": st.column_config.TextColumn("Food"),
+            "status": st.column_config.TextColumn("Status"),
+            "score": st.column_config.ProgressColumn("Score", min_value=0, max_value=10, format="%d/10"),
+            "time": st.column_config.DatetimeColumn("Time", format="YYYY-MM-DD HH:mm"),
+        })
+    shown = f"{first + 1}–{first + len(df)}" if len(df) else "0"
+    st.caption(f"Showing {shown} of {len(positions)} matching entries ({len(log)} total)")
+
+
+def render_export():
+    # Nothing is serialised on rerun: the file is written in chunks (or reused) only on click.
+    with st.expander("📥 Export History"):
+        e1, e2 = st.columns(2)
+        with e1:
+            fmt = st.selectbox("Format", list(EXPORT_FORMATS), format_func=str.upper, key="export_format")
+        with e2:
+            date_range = st.date_input("Date range", value=(), key="export_dates")
+        start, end = _date_bounds(date_range)
+        log = st.session_state.food_log
+        mime, ext = EXPORT_FORMATS[fmt]
+        st.download_button(f"Download {fmt.upper()}", lambda: get_export_cache().read(log, fmt, start, end),
+                           f"bitebot_history.{ext}", mime, key="download_export", use_container_width=True)
+
+
+def render():
+    st.markdown("### 📊 Food History")
+    if st.session_state.food_log:
+        render_food_history()
+        render_export()
+    else:
+        st.info("📝 No foods analyzed yet. Start by typing a food above!")
@@ -0,0 +1,196 @@
+"""
+💬 Live Chat tab: analyse a food (or a whole menu) and show the answer as a chat transcript.
+"""
+import html
+from datetime import datetime
+
+import streamlit as st
+
+from bitebot import metrics
+from bitebot.core.batch import analyze_batch, parse_menu, parse_menu_csv
+from bitebot.ui.resources import QUICK_FOODS, get_analyzer, get_catalogue, lookup_analysis
+from bitebot.ui.state import CHAT_PAGE_SIZE, persist
+
+STATE_KEYS = ("chat_history",)
+
+
+def add_food_to_chat(food: str):
+    analysis, tips = lookup_analysis(food)
+    st.session_state.chat_history.append({"type": "user", "content": food, "time": datetime.now().strftime("%H:%M")})
+    st.session_state.chat_history.append({"type": "ai", "food": food, "analysis": analysis, "tips": tips, "time": datetime.now().strftime("%H:%M")})
+    st.session_state.food_log.append(food, analysis["status"], analysis["score"])
+    st.session_state.food_stats.add(food, analysis["status"], analysis["score"])
+    persist("chat_history")
+
+
+def analyze_menu(items):
+    # Whole menu in one pass: items are resolved and scored together, then the chat,
+    # log and stats are updated once, so the caller needs a single rerun.
+    analyzer = get_analyzer()
+    result = analyze_batch(items, get_catalogue(), analyzer.model, analyzer.unknown_score,
+                           estimator=analyzer.estimator)
+    now = datetime.now()
+    time_str = now.strftime("%H:%M")
+    statuses, scores = result.statuses(), result.scores.tolist()
+    messages = []
+    for item, (analysis, tips) in zip(result.items, analyzer.batch_analyses(result)):
+        content = item.text if item.quantity == 1 else f"{item.text} ×{item.quantity}"
+        messages.append({"type": "user", "content": content, "time": time_str})
+        messages.append({"type": "ai", "food": item.text, "analysis": analysis, "tips": tips, "time": time_str})
+    messages.append({"type": "meal", "totals": result.totals(), "time": time_str})
+    st.session_state.chat_history.extend(messages)
+    foods = [item.text for item in result.items]
+    st.session_state.food_log.extend(foods, statuses, scores, when=now)
+    for food, status, score in zip(foods, statuses, scores):
+        st.session_state.food_stats.add(food, status, score)
+    persist("chat_history")
+    return result
+
+
+def user_food_html(content, time_str):
+    return f"""
+    <div class='user-message'>
+        <div style='display:flex; justify-content:space-between; align-items:center; margin-bottom:5px;'>
+            <div style='font-weight:bold; color:#00ffcc;'>👤 YOU</div>
+            <div style='font-size:0.8rem; color:#aaa;'>{time_str}</div>
+        </div>
+        <div style='font-size:1.1rem;'>🍽️ <b>{html.escape(content.upper())}</b></div>
+    </div>"""
+
+
+@metrics.timed("render_ai_response")
+def ai_response_html(food, analysis, tips, time_str):
+    # One self-contained HTML block per analysis (instead of ~15 Streamlit elements).
+    facts = "".join(f"""
+            <div class='nutri-cell'>
+                <div style='font-size:1.5rem;'>{icon}</div>
+                <div style='font-size:1.8rem; font-weight:bold; color:#00ffcc; margin:5px 0;'>{value}</div>
+                <div style='font-size:0.9rem; color:#aaa;'>{label}</div>
+            </div>""" for label, value, icon in [("Calories", f"{tips['calories']}", "🔥"),
+                                                 ("Protein", f"{tips['protein']}g", "💪"),
+                                                 ("Carbs", f"{tips['carbs']}g", "🌾"),
+                                                 ("Fat", f"{tips['fat']}g", "🛢️")])
+    tip_items = "".join(f"<li>{html.escape(t)}</li>" for t in tips["tips"])
+    alternatives = "".join(f"<div class='alt-chip'>{html.escape(a)}</div>" for a in tips["alternatives"])
+    return f"""
+    <div class='ai-message'>
+        <div style='display:flex; justify-content:space-between; align-items:center; margin-bottom:10px;'>
+            <div style='font-weight:bold; color:#0088ff;'>🤖 BiteBot AI</div>
+            <div style='font-size:0.8rem; color:#aaa;'>{time_str}</div>
+        </div>
+        <div style='display:flex; justify-content:space-between; align-items:center; flex-wrap:wrap;'>
+            <h3 style='margin:0;'>🍽️ {html.escape(food.upper())}</h3>
+            <span class='{analysis['badge_class']}'>{analysis['icon']} {analysis['status']}</span>
+        </div>
+        <p style="color:{analysis['color']}; font-weight:bold; font-size:1.1rem;">{analysis['message']}</p>
+        <div style='background:rgba(255,255,255,0.1); padding:8px 15px; border-radius:15px; display:inline-block; margin:10px 0;'>
+            📊 <b>Nutrition Score:</b> {analysis['score']}/10
+        </div>
+        <hr class='chat-divider'>
+        <h4>📊 Nutrition Facts (per serving)</h4>
+        <div class='nutri-grid'>{facts}</div>
+        <hr class='chat-divider'>
+        <h4>💡 Smart Eating Tips</h4>
+        <ul>{tip_items}</ul>
+        <hr class='chat-divider'>
+        <h4>🔄 Healthier Alternatives</h4>
+        <div class='alt-grid'>{alternatives}</div>
+        <hr class='chat-divider'>
+        <div class='pro-advice'>🎯 <b>Pro Advice:</b> Eat mindfully • Stay hydrated • Enjoy your food • Listen to your body</div>
+    </div>"""
+
+
+def meal_summary_html(totals, time_str):
+    facts = "".join(f"""
+            <div class='nutri-cell'>
+                <div style='font-size:1.5rem;'>{icon}</div>
+                <div style='font-size:1.8rem; font-weight:bold; color:#00ffcc; margin:5px 0;'>{value}</div>
+                <div style='font-size:0.9rem; color:#aaa;'>{label}</div>
+            </div>""" for label, value, icon in [("Calories", f"{totals['calories']:g}", "🔥"),
+                                                 ("Protein", f"{totals['protein']:g}g", "💪"),
+                                                 ("Carbs", f"{totals['carbs']:g}g", "🌾"),
+                                                 ("Fat", f"{totals['fat']:g}g", "🛢️")])
+    counts = totals["status_counts"]
+    return f"""
+    <div class='ai-message'>
+        <div style='display:flex; justify-content:space-between; align-items:center; margin-bottom:10px;'>
+            <div style='font-weight:bold; color:#0088ff;'>🤖 BiteBot AI</div>
+            <div style='font-size:0.8rem; color:#aaa;'>{time_str}</div>
+        </div>
+        <h3 style='margin:0;'>🧾 MEAL SUMMARY</h3>
+        <p>{totals['items']} items, {totals['servings']} servings •
+           ✅ {counts['HEALTHY']} • ⚖️ {counts['MODERATE']} • ⚠️ {counts['UNHEALTHY']}</p>
+        <div style='background:rgba(255,255,255,0.1); padding:8px 15px; border-radius:15px; display:inline-block; margin:10px 0;'>
+            📊 <b>Average Score:</b> {totals['mean_score']:g}/10
+        </div>
+        <hr class='chat-divider'>
+        <h4>📊 Meal Totals</h4>
+        <div class='nutri-grid'>{facts}</div>
+        <p style='font-size:0.8rem; color:#aaa;'>Totals cover the {totals['with_macros']} of {totals['items']} items with nutrition data ({totals['estimated']} estimated from similar foods).</p>
+    </div>"""
+
+
+def chat_message_html(msg):
+    # Rendered once when first shown, then reused from the message dict on every rerun.
+    if "html" not in msg:
+        if msg["type"] == "user":
+            msg["html"] = user_food_html(msg["content"], msg.get("time", ""))
+        elif msg["type"] == "meal":
+            msg["html"] = meal_summary_html(msg["totals"], msg.get("time", ""))
+        else:
+            if "analysis" not in msg:  # restored from the session store
+                msg["analysis"], msg["tips"] = lookup_analysis(msg["food"])
+            msg["html"] = ai_response_html(msg["food"], msg["analysis"], msg["tips"], msg.get("time", ""))
+    return msg["html"]
+
+
+@st.fragment
+@metrics.timed("render_live_chat")
+def render_live_chat():
+    # Only the newest page is painted; "show older" reruns just this fragment.
+    history = st.session_state.chat_history
+    visible = st.session_state.get("chat_visible", CHAT_PAGE_SIZE)
+    hidden = max(0, len(history) - visible)
+    if hidden:
+        st.button(f"⬆️ Show older messages ({hidden} hidden)", key="chat_show_older", use_container_width=True,
+                  on_click=lambda: st.session_state.update(chat_visible=visible + CHAT_PAGE_SIZE))
+    st.markdown("".join(chat_message_html(m) for m in history[hidden:]), unsafe_allow_html=True)
+
+
+def render():
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        st.markdown("### 💬 Live Chat")
+        if not st.session_state.chat_history:
+            st.info("💬 Start by typing a food or clicking a quick food button!")
+        else:
+            render_live_chat()
+
+    with col2:
+        st.markdown("### 🍎 Quick Foods")
+        for emoji, food in QUICK_FOODS:
+            if st.button(f"{emoji} {food.title()}", key=f"quick_{food}", use_container_width=True):
+                add_food_to_chat(food)
+                st.rerun()
+
+    st.markdown("---")
+    a, b = st.columns([4, 1])
+    with a:
+        user_input = st.text_input("", placeholder="e.g., pizza, nasi lemak, burger...", key="food_input")
+    with b:
+        analyze_btn = st.button("🚀 ANALYZE", use_container_width=True, type="primary")
+    if analyze_btn and user_input:
+        add_food_to_chat(user_input.lower())
+        st.rerun()
+
+    with st.expander("🧾 Analyze a whole menu or meal"):
+        menu_text = st.text_area("Paste a menu, receipt or meal plan (one item per line or comma-separated)",
+                                 placeholder="2x nasi lemak\nteh tarik\nchicken salad $8.90", key="menu_input")
+        menu_file = st.file_uploader("...or upload a CSV with a food column", type=["csv"], key="menu_csv")
+        if st.button("🚀 ANALYZE ALL", use_container_width=True, type="primary", key="analyze_menu"):
+            items = parse_menu(menu_text) + (parse_menu_csv(menu_file) if menu_file else [])
+            if items:
+                analyze_menu(items)
+                st.rerun()
+            st.warning("No food items found in that menu.")
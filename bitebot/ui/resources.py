@@ -0,0 +1,98 @@
+"""
+Process-wide resources, built once with ``st.cache_resource`` and shared by every session.
+
+Everything here is read-only or internally locked: the food catalogue and
+its analyzer, the memoised analyses, the AI executor, cache, guard and
+router, the history and session stores and the export and metrics
+writers. Most are built by ``bitebot.services`` from ``BITEBOT_*``
+environment variables.
+"""
+import os
+
+import streamlit as st
+
+from bitebot import metrics, services
+from bitebot.core.analysis import FoodAnalyzer
+from bitebot.storage.export import ExportCache
+
+QUICK_FOODS = [
+    ("🍕", "pizza"), ("🥗", "salad"), ("🍔", "burger"), ("🍣", "sushi"),
+    ("🍝", "pasta"), ("🍫", "chocolate"), ("🍦", "ice cream"), ("🍎", "apple"),
+    ("🥤", "soda"), ("🍗", "chicken"), ("🐟", "fish"), ("🥑", "avocado"),
+    ("🍚", "nasi lemak"), ("🍜", "ramen"), ("🥪", "sandwich")
+]
+
+
+@st.cache_resource
+def get_log_store():
+    return services.build_log_store()
+
+
+@st.cache_resource
+def get_session_store():
+    return services.build_session_store()
+
+
+@st.cache_resource
+def get_catalogue():
+    return services.build_catalogue()
+
+
+@st.cache_resource
+def get_analyzer():
+    # The health model (scikit-learn) and neighbour index inside are loaded on first need.
+    return FoodAnalyzer(get_catalogue())
+
+
+@st.cache_resource
+def get_analysis_cache():
+    # Shared by all sessions; the Quick Foods and the first catalogue foods are warmed on first use.
+    return services.build_analysis_cache(get_analyzer(), [food for _, food in QUICK_FOODS])
+
+
+@metrics.timed("lookup_analysis")
+def lookup_analysis(food: str):
+    """(analysis, tips) for a food, memoised by normalised name; treat both dicts as read-only."""
+    return get_analysis_cache().get(food, get_catalogue().version)
+
+
+def food_macros(food: str):
+    # Per-serving macros as shown in the Live Chat (catalogue, else estimated).
+    return lookup_analysis(food)[1]
+
+
+@st.cache_resource(show_spinner=False)
+def get_model_registry(api_key, backend_name):
+    return services.build_model_registry(api_key, backend_name)
+
+
+@st.cache_resource
+def get_response_cache():
+    return services.build_response_cache()
+
+
+@st.cache_resource
+def get_ai_executor():
+    # One bounded pool per process, shared by every session.
+    return services.build_ai_executor()
+
+
+@st.cache_resource
+def get_gemini_guard():
+    return services.build_gemini_guard()
+
+
+@st.cache_resource
+def get_chat_router():
+    return services.build_chat_router(get_catalogue(), lookup_analysis)
+
+
+@st.cache_resource
+def get_export_cache():
+    # Finished export files shared by all sessions, keyed by log version, format and date range.
+    return ExportCache(os.environ.get("BITEBOT_EXPORT_DIR") or None)
+
+
+@st.cache_resource
+def get_metrics_exporter():
+    return services.build_metrics_exporter()
@@ -0,0 +1,157 @@
+"""
+Per-session state: defaults on the first run of a session, persistence and Clear All.
+
+Each key is created once per browser session. The food log is loaded from
+the shared store for the session's user id (see ``get_user_id``), and
+reloaded when another session or worker has written to it since. The chat
+transcripts and AI context (``PERSISTED_KEYS``) live in the shared session
+store: a tab ``hydrate``s only the keys it shows, and every change is
+``persist``ed, so a reload, or landing on another worker, picks the
+conversation up where it was. Transcripts (``APPEND_ONLY_KEYS``) are saved
+one message per row, and a persist writes only the messages added since
+the last one.
+"""
+import hashlib
+import os
+import re
+import secrets
+
+import streamlit as st
+
+from bitebot import metrics
+from bitebot.services import build_chat_context
+from bitebot.storage.aggregates import FoodLogStats
+from bitebot.storage.food_log import FoodLog
+from bitebot.storage.rollups import TimeRollups
+from bitebot.ui.resources import food_macros, get_log_store, get_session_store
+
+CHAT_PAGE_SIZE = 20  # Live Chat messages (10 analysed foods) painted per page
+_URL_TOKEN = re.compile(r"[A-Za-z0-9_-]{16,64}")
+
+
+def _encode_chat(history):
+    # Analyses, tips and rendered HTML are rebuilt from the food name when shown; only the transcript is stored.
+    return [{k: v for k, v in msg.items() if k not in ("analysis", "tips", "html")} for msg in history]
+
+
+def _decode_context(data):
+    return build_chat_context(data) if data is not None else None
+
+
+# key -> (default, encode, decode) between session values and the JSON-able data in the store
+PERSISTED_KEYS = {
+    "chat_history": (list, _encode_chat, list),
+    "ai_chat_history": (list, list, list),
+    "gemini_chat_context": (lambda: None, lambda c: c.to_dict() if c is not None else None, _decode_context),
+}
+# Lists that only grow or are cleared: their encode takes the slice of new messages.
+APPEND_ONLY_KEYS = frozenset({"chat_history", "ai_chat_history"})
+
+
+def get_user_id():
+    """Key for this user's stored food history and chats.
+
+    Users signed in with ``st.login`` are keyed by their identity provider's
+    subject, so nothing in the URL grants access. Otherwise a random token
+    kept in the URL (``?uid=...``) lets a reload or restart find the same
+    data. That link works like a password: anyone who has it can read and
+    change the history, so it must not be shared. Set
+    ``BITEBOT_REQUIRE_LOGIN=1`` to turn anonymous tokens off.
+    """
+    if st.user.get("is_logged_in"):
+        subject = f"{st.user.get('iss', '')}|{st.user.get('sub') or st.user.get('email')}"
+        return "login-" + hashlib.sha256(subject.encode()).hexdigest()[:32]
+    if os.environ.get("BITEBOT_REQUIRE_LOGIN") == "1":
+        st.info("🔒 Log in to see your food history and chats.")
+        st.button("Log in", on_click=st.login)
+        st.stop()
+    uid = st.query_params.get("uid")
+    if not uid or not _URL_TOKEN.fullmatch(uid):
+        # Unguessable (128 random bits); short or hand-picked ids such as ?uid=alice are replaced.
+        uid = secrets.token_urlsafe(16)
+        st.query_params["uid"] = uid
+    return uid
+
+
+def init_session():
+    state = st.session_state
+    if "user_id" not in state: state.user_id = get_user_id()
+    if "session_versions" not in state: state.session_versions = {}  # persisted key -> version this session holds
+    if "session_lengths" not in state: state.session_lengths = {}  # append-only key -> messages already stored
+    if "food_log" not in state:
+        store = get_log_store()
+        state.food_log = FoodLog.load(store, state.user_id) if store else FoodLog()
+    elif state.food_log.refresh():  # another tab or worker logged foods for this user
+        state.pop("food_stats", None)
+    if "food_stats" not in state: state.food_stats = FoodLogStats.from_entries(state.food_log.entries())
+    if "food_rollups" not in state: state.food_rollups = TimeRollups(food_macros)
+
+    if "gemini_initialized" not in state: state.gemini_initialized = False
+    if "gemini_error" not in state: state.gemini_error = None
+    if "gemini_model" not in state: state.gemini_model = None
+    if "temp_gemini_key" not in state: state.temp_gemini_key = ""
+    if "ai_pending" not in state: state.ai_pending = None
+
+
+@metrics.timed("session_hydrate")
+def hydrate(keys):
+    """Load persisted ``keys`` into this session, or reload any another session or worker has saved since."""
+    state = st.session_state
+    keys = [k for k in keys if k in PERSISTED_KEYS]
+    if not keys:
+        return
+    store = get_session_store()
+    known = state.session_versions
+    stored = store.versions(state.user_id, keys)
+    stale = [k for k in keys if k not in state or stored.get(k, 0) > known.get(k, 0)]
+    if not stale:
+        return
+    loaded = store.load(state.user_id, stale)
+    for key in stale:
+        default, _, decode = PERSISTED_KEYS[key]
+        if key in loaded:
+            known[key], value = loaded[key]
+            state[key] = decode(value)
+            state.session_lengths.pop(key, None)  # written elsewhere: the next persist rewrites it in full
+        elif key not in state:
+            state[key] = default()
+
+
+@metrics.timed("session_persist")
+def persist(*keys):
+    """Save this session's current value of each persisted key (last writer wins).
+
+    An append-only key is rewritten in full on its first persist in a session, after another
+    worker saved it, and after it shrinks; otherwise only its new messages are written.
+    """
+    state = st.session_state
+    store = get_session_store()
+    for key in keys:
+        _, encode, _ = PERSISTED_KEYS[key]
+        value = state[key]
+        if key in APPEND_ONLY_KEYS:
+            start = state.session_lengths.get(key, 0)
+            if start > len(value):
+                start = 0
+            state.session_versions[key] = store.append(state.user_id, key, encode(value[start:]), start)
+            state.session_lengths[key] = len(value)
+        else:
+            state.session_versions[key] = store.save(state.user_id, key, encode(value))
+
+
+def clear_ai_chat():
+    if st.session_state.get("ai_pending"):
+        st.session_state.ai_pending["handle"].cancel()
+        st.session_state.ai_pending = None
+    st.session_state.ai_chat_history = []
+    st.session_state.gemini_chat_context = None
+    persist("ai_chat_history", "gemini_chat_context")
+
+
+def clear_all():
+    st.session_state.chat_history = []
+    persist("chat_history")
+    st.session_state.chat_visible = CHAT_PAGE_SIZE
+    st.session_state.food_log.clear()
+    st.session_state.food_stats = FoodLogStats()
+    clear_ai_chat()
@@ -0,0 +1,143 @@
+"""
+Page styling: the app's CSS, header and footer markup.
+"""
+import streamlit as st
+
+APP_CSS = """
+<style>
+    .stApp {
+        background: linear-gradient(135deg, #0a0a0a 0%, #1a1a2e 50%, #16213e 100%);
+        color: white;
+    }
+    .main-title {
+        font-size: 3.5rem;
+        font-weight: 900;
+        text-align: center;
+        background: linear-gradient(90deg, #ff0080, #ff8c00, #ffff00, #00ff00, #00ffff, #0000ff, #8b00ff);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        margin: 20px 0;
+    }
+    .healthy-badge {
+        background: linear-gradient(45deg, #00ff88, #00cc66);
+        color: #000 !important;
+        padding: 8px 16px;
+        border-radius: 20px;
+        font-weight: bold;
+        display: inline-block;
+        margin: 5px;
+    }
+    .unhealthy-badge {
+        background: linear-gradient(45deg, #ff4444, #ff0066);
+        color: #000 !important;
+        padding: 8px 16px;
+        border-radius: 20px;
+        font-weight: bold;
+        display: inline-block;
+        margin: 5px;
+    }
+    .moderate-badge {
+        background: linear-gradient(45deg, #ffcc00, #ffaa00);
+        color: #000 !important;
+        padding: 8px 16px;
+        border-radius: 20px;
+        font-weight: bold;
+        display: inline-block;
+        margin: 5px;
+    }
+    .user-message {
+        background: linear-gradient(90deg, rgba(0, 255, 200, 0.15), transparent);
+        border-left: 4px solid #00ffcc;
+        padding: 12px 15px;
+        border-radius: 10px;
+        margin: 10px 0;
+    }
+    .ai-message {
+        background: linear-gradient(90deg, rgba(0, 100, 255, 0.15), transparent);
+        border-left: 4px solid #0088ff;
+        padding: 15px;
+        border-radius: 10px;
+        margin: 10px 0;
+    }
+    .metric-card {
+        background: rgba(255, 255, 255, 0.05);
+        border-radius: 15px;
+        padding: 20px;
+        border: 1px solid rgba(255, 255, 255, 0.1);
+        text-align: center;
+    }
+    .stButton>button {
+        background: linear-gradient(45deg, #ff0080, #00ccff);
+        color: white;
+        font-weight: bold;
+        border: none;
+        padding: 10px 20px;
+        border-radius: 20px;
+        width: 100%;
+    }
+    .gemini-message {
+        background: linear-gradient(90deg, rgba(147, 51, 234, 0.15), transparent);
+        border-left: 4px solid #9333ea;
+        padding: 15px;
+        border-radius: 10px;
+        margin: 10px 0;
+    }
+    .gemini-title {
+        background: linear-gradient(90deg, #9333ea, #3b82f6);
+        -webkit-background-clip: text;
+        -webkit-text-fill-color: transparent;
+        font-weight: bold;
+    }
+    .chat-divider {
+        border: none;
+        border-top: 1px solid rgba(255, 255, 255, 0.15);
+        margin: 15px 0;
+    }
+    .nutri-grid, .alt-grid {
+        display: grid;
+        grid-template-columns: repeat(4, 1fr);
+        gap: 10px;
+    }
+    .alt-grid {
+        grid-template-columns: repeat(3, 1fr);
+    }
+    .nutri-cell {
+        text-align: center;
+        background: rgba(255, 255, 255, 0.05);
+        padding: 15px;
+        border-radius: 8px;
+    }
+    .alt-chip {
+        background: rgba(28, 131, 225, 0.1);
+        color: #c7e3ff;
+        padding: 12px 15px;
+        border-radius: 8px;
+    }
+    .pro-advice {
+        background: rgba(33, 195, 84, 0.1);
+        color: #b6f2c8;
+        padding: 12px 15px;
+        border-radius: 8px;
+    }
+    #MainMenu {visibility: hidden;}
+    footer {visibility: hidden;}
+    header {visibility: hidden;}
+</style>
+"""
+
+HEADER_HTML = (
+    '<h1 class="main-title">🍎 BiteBot AI Nutritionist</h1>'
+    '<p style="text-align:center;color:#00ffcc;font-size:1.2rem;margin-bottom:30px;">'
+    'Instant Food Analysis • Smart Nutrition Tips • AI-Powered Chat</p>'
+)
+
+FOOTER_HTML = """
+<div style="text-align:center;color:#888;padding:20px;">
+    <p>🍎 <b>BiteBot AI Nutritionist</b> • Smart Food Analysis • Real-time Chat • Powered by AI</p>
+    <p style="font-size:0.9rem;">Instant food analysis + AI-powered nutrition advice</p>
+</div>
+"""
+
+
+def apply_styles():
+    st.markdown(APP_CSS, unsafe_allow_html=True)
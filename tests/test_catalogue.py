@@ -0,0 +1,24 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from bitebot.core import catalogue
+from bitebot.core.catalogue import load_catalogue
+
+
+def _load(paths):
+    target, source = paths
+    return len(load_catalogue(target, source))
+
+
+def test_concurrent_stale_loads_share_one_build(tmp_path, monkeypatch):
+    source = tmp_path / "foods.csv"
+    source.write_text("name,category,score\napple,healthy,10\nfries,unhealthy,2\n")
+    target = tmp_path / "catalogue"
+
+    with ProcessPoolExecutor(4) as pool:
+        assert list(pool.map(_load, [(target, source)] * 8)) == [2] * 8
+    assert sorted(p.name for p in tmp_path.iterdir()) == [".catalogue.lock", "catalogue", "foods.csv"]
+
+    builds = []
+    monkeypatch.setattr(catalogue, "_build_catalogue", lambda *a: builds.append(a))
+    load_catalogue(target, source)
+    assert builds == []
@@ -0,0 +1,25 @@
+import pytest
+
+from bitebot.ai.providers import ChatRouter, LocalProvider
+from bitebot.core.analysis import FoodAnalyzer
+from bitebot.core.catalogue import load_catalogue
+
+
+@pytest.fixture(scope="module")
+def router():
+    catalogue = load_catalogue()
+    return ChatRouter(LocalProvider(catalogue, FoodAnalyzer(catalogue).analyze_with_tips))
+
+
+@pytest.mark.parametrize("question", ["Is pineapple healthy?", "is a watermelon healthy",
+                                      "How many calories in a pancake?"])
+def test_foods_inside_other_words_go_to_gemini(router, question):
+    assert router.local.foods_in(question) == []
+    assert router.route(question, remote_available=True) == ("gemini", None)
+
+
+def test_whole_word_foods_are_answered_locally(router):
+    provider, reply = router.route("Is apple healthy?", remote_available=True)
+    assert provider == "local" and "Apple" in reply
+    provider, reply = router.route("How many calories in a cake?", remote_available=True)
+    assert provider == "local" and "cake" in reply
@@ -0,0 +1,27 @@
+import pytest
+
+from bitebot.core.catalogue import load_catalogue, status_for_score
+from bitebot.core.estimator import NutritionEstimator
+
+
+@pytest.fixture(scope="module")
+def estimator():
+    return NutritionEstimator(load_catalogue())
+
+
+@pytest.mark.parametrize("food", ["chicken rice", "chicken", "pancake", "apple juice", "banana smoothie",
+                                  "caesar salad", "chocolate muffin", "veggie wrap"])
+def test_status_agrees_with_score(estimator, food):
+    estimate = estimator.estimate(food)
+    assert estimate is not None
+    assert estimate.status == status_for_score(estimate.score)
+
+
+def test_weak_neighbours_give_no_estimate(estimator):
+    assert estimator.estimate("hot dog") is None  # only "donut" shares a few n-grams
+    assert estimator.estimate("zzqx blorp") is None
+
+
+def test_score_bands():
+    assert [status_for_score(s) for s in (1, 4, 5, 7, 8, 10)] == [
+        "UNHEALTHY", "UNHEALTHY", "MODERATE", "MODERATE", "HEALTHY", "HEALTHY"]
@@ -0,0 +1,24 @@
+import pytest
+
+from bitebot.core.matcher import FoodMatcher
+
+MATCHER = FoodMatcher(["apple", "cake", "cheesecake", "water", "dark chocolate", "chocolate", "pan", "peach"])
+
+
+@pytest.mark.parametrize("text", ["pineapple", "pancake", "watermelon", "crabapple juice"])
+def test_names_embedded_in_other_words_are_not_matched(text):
+    names = [m.name for m in MATCHER.find_all(text)]
+    assert "apple" not in names and "cake" not in names and "water" not in names
+
+
+def test_whole_words_and_plurals_match():
+    assert MATCHER.best_match("is a pineapple healthy") is None
+    assert MATCHER.best_match("two apples, please").name == "apple"
+    assert MATCHER.best_match("peaches").name == "peach"
+    assert MATCHER.best_match("a glass of water").name == "water"
+    assert MATCHER.best_match("cheesecake").name == "cheesecake"
+    assert MATCHER.best_match("dark chocolate bar").name == "dark chocolate"
+
+
+def test_resolve_keeps_whole_word_matches_only():
+    assert [m.name for m in MATCHER.resolve("pancake with apple and water")] == ["apple", "water"]
@@ -0,0 +1,26 @@
+import pytest
+
+from bitebot.core.catalogue import load_catalogue
+from bitebot.core.model import load_model, train
+
+
+@pytest.fixture(scope="module")
+def catalogue():
+    return load_catalogue()
+
+
+def test_save_replaces_the_artifact_in_one_step(tmp_path, catalogue):
+    path = tmp_path / "health_classifier.joblib"
+    path.write_bytes(b"half-written")
+    train(catalogue).save(path)
+
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
+    assert load_model(path, catalogue).catalogue_version == catalogue.version
+
+
+def test_load_model_without_a_writable_models_dir(tmp_path, catalogue):
+    blocker = tmp_path / "models"
+    blocker.write_text("not a directory")
+
+    model = load_model(blocker / "health_classifier.joblib", catalogue)
+    assert model.catalogue_version == catalogue.version
@@ -0,0 +1,80 @@
+import pytest
+
+from bitebot.ai.resilience import CircuitBreaker, CircuitOpen, ResilientCaller, RetryPolicy, TokenBucket
+
+
+class Cancelled(Exception):
+    pass
+
+
+def failing():
+    raise ConnectionError("503 service unavailable")
+
+
+def bad_request():
+    raise ValueError("400 invalid argument")
+
+
+def chunks():
+    yield "a"
+    yield "b"
+
+
+def half_open_caller(limiter=None):
+    caller = ResilientCaller(RetryPolicy(attempts=1), CircuitBreaker(failure_threshold=1, reset_timeout=0),
+                             limiter or TokenBucket(rate=1000, capacity=1000))
+    with pytest.raises(ConnectionError):
+        caller.call(failing)
+    assert caller.breaker.state == "half_open"
+    return caller
+
+
+def test_closed_stream_releases_half_open_trial():
+    caller = half_open_caller()
+    stream = caller.stream(chunks)
+    assert next(stream) == "a"
+    stream.close()  # consumer gave up mid-trial (user cancel, timeout, client disconnect)
+
+    assert list(caller.stream(chunks)) == ["a", "b"]
+    assert caller.breaker.state == "closed"
+
+
+def test_cancelled_rate_limit_wait_releases_half_open_trial():
+    caller = half_open_caller(TokenBucket(rate=0.01, capacity=1))
+    caller.limiter.try_acquire()  # empty the bucket so the next call has to wait
+
+    def cancel(seconds):
+        raise Cancelled()
+
+    caller.acquire_timeout = 1000
+    with pytest.raises(Cancelled):
+        caller.call(lambda: "ok", sleep=cancel)
+
+    caller.limiter = TokenBucket(rate=1000, capacity=1000)
+    assert caller.call(lambda: "ok") == "ok"
+
+
+def test_open_breaker_still_short_circuits():
+    caller = ResilientCaller(RetryPolicy(attempts=1), CircuitBreaker(failure_threshold=1, reset_timeout=60))
+    with pytest.raises(ConnectionError):
+        caller.call(failing)
+    with pytest.raises(CircuitOpen):
+        caller.call(lambda: "ok")
+
+
+def test_non_transient_errors_leave_the_breaker_closed():
+    caller = ResilientCaller(RetryPolicy(attempts=3), CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            caller.call(bad_request)
+    assert caller.breaker.state == "closed"
+    assert caller.stats()["retries"] == 0
+    assert caller.call(lambda: "ok") == "ok"
+
+
+def test_transient_errors_still_open_the_breaker():
+    caller = ResilientCaller(RetryPolicy(attempts=1), CircuitBreaker(failure_threshold=2, reset_timeout=60))
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            caller.call(failing)
+    assert caller.breaker.state == "open"
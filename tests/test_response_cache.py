@@ -0,0 +1,74 @@
+import pytest
+
+from bitebot.ai.response_cache import ResponseCache, SQLiteBackend
+
+
+def test_similar_lookup_with_only_stop_word_keys():
+    cache = ResponseCache()
+    cache.put("Why?", "Because.")
+
+    assert cache.get("why") == "Because."
+    assert cache.get("what are good snacks for weight loss") is None
+
+    cache.put("good snacks for weight loss?", "Nuts and fruit.")
+    assert cache.get("what are good snacks for weight-loss") == "Nuts and fruit."
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("Are raw eggs safe during pregnancy?", "Are raw eggs safe after pregnancy?"),
+    ("Should diabetics avoid fruit?", "Should diabetics not avoid fruit?"),
+    ("good snacks for weight loss", "not good snacks for weight loss"),
+    ("good snacks for weight loss", "good snacks for weight gain"),
+    ("what should I eat for dinner", "what should I eat for lunch"),
+    ("best foods to eat before a workout", "best foods to eat after a workout"),
+])
+def test_near_miss_questions_are_not_shared(cached, asked):
+    cache = ResponseCache()
+    cache.put(cached, "cached answer")
+
+    assert cache.get(asked) is None
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("how many calories in an apple", "How many calories are in an apple?"),
+    ("how much protein is in chicken?", "how much protein in chicken"),
+])
+def test_rephrasings_are_shared(cached, asked):
+    cache = ResponseCache()
+    cache.put(cached, "cached answer")
+
+    assert cache.get(asked) == "cached answer"
+
+
+def test_index_grows_without_rebuilding():
+    cache = ResponseCache()
+    cache.put("good snacks for weight loss", "Nuts and fruit.")
+    assert cache.get("is pizza healthy") is None
+    index = cache._index
+
+    cache.put("is pizza healthy?", "In moderation.")
+    assert cache.get("pizza is healthy") == "In moderation."
+    assert cache._index is index and index.size == 2
+
+
+def test_evicted_keys_are_not_matched():
+    cache = ResponseCache(max_entries=1)
+    cache.put("good snacks for weight loss", "Nuts and fruit.")
+    assert cache.get("anything else") is None
+    cache.put("is pizza healthy", "In moderation.")
+
+    assert cache.get("what are good snacks for weight loss") is None
+    assert cache.get("pizza is healthy") == "In moderation."
+
+
+def test_keys_cached_by_another_process_are_matched(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    ours, theirs = ResponseCache(SQLiteBackend(path)), ResponseCache(SQLiteBackend(path))
+    ours.put("is pizza healthy", "In moderation.")
+    assert ours.get("good snacks for weight loss") is None
+
+    theirs.put("good snacks for weight loss", "Nuts and fruit.")
+    theirs.backend.delete("is pizza healthy")
+
+    assert ours.get("what are good snacks for weight loss") == "Nuts and fruit."
+    assert ours._index.size == 1
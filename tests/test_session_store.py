@@ -0,0 +1,42 @@
+import pytest
+
+from bitebot.storage.session_store import MemorySessionBackend, SessionStore, SQLiteSessionBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return SessionStore(MemorySessionBackend())
+    return SessionStore(SQLiteSessionBackend(str(tmp_path / "session.sqlite3")))
+
+
+def test_append_writes_only_new_messages(store):
+    history = [{"type": "user", "content": f"food {i}"} for i in range(50)]
+    store.append("u", "chat_history", history, 0)
+    saved = store.stats()["bytes_saved"]
+
+    message = {"type": "user", "content": "apple"}
+    version = store.append("u", "chat_history", [message], len(history))
+
+    assert store.stats()["bytes_saved"] - saved < 40
+    assert store.load("u", ["chat_history"]) == {"chat_history": (version, history + [message])}
+    assert store.versions("u", ["chat_history"]) == {"chat_history": 2}
+
+
+def test_append_from_an_earlier_position_drops_the_tail(store):
+    store.append("u", "chat_history", ["a", "b", "c"], 0)
+    store.append("u", "chat_history", ["x"], 1)
+    assert store.load("u", ["chat_history"])["chat_history"][1] == ["a", "x"]
+
+    store.append("u", "chat_history", [], 0)
+    assert store.load("u", ["chat_history"])["chat_history"][1] == []
+
+
+def test_clear_removes_appended_messages(store):
+    store.append("u", "chat_history", ["a"], 0)
+    store.save("u", "context", {"turns": 1})
+    store.clear("u")
+
+    assert store.load("u", ["chat_history", "context"]) == {}
+    store.append("u", "chat_history", ["b"], 0)
+    assert store.load("u", ["chat_history"])["chat_history"] == (1, ["b"])